@@ -138,6 +138,17 @@ class Operation(object):
         forms = self.parameters.get('task', {}).get('forms', {})
         return forms.get('display_schema', {}).get('value') in (1, '1')
 
+    @property
+    def defer_sample(self):
+        """
+        Sample is not emitted when the task is executed, it is retrieved only
+        if a client requests it (deliver message). Defined in
+        juicer.transpiler.deferred_sample.
+        """
+        return self.parameters.get('configuration', {}).get(
+            'juicer', {}).get('transpiler', {}).get(
+            'deferred_sample') in (True, 1, '1', 'true')
+
     def contains_results(self):
         return self.contains_sample or self.contains_schema
 
@@ -148,6 +159,14 @@ class Operation(object):
         return (((self.has_code or ignore_has_code) and is_satisfied and
                  consider_degree) or info_or_data)
 
+    # noinspection PyMethodMayBeStatic
+    def get_used_attributes(self):
+        """
+        Attributes of the input data used by the operation. Data sources may
+        read only them (projection). None means all attributes (default).
+        """
+        return None
+
     # noinspection PyMethodMayBeStatic
     def attribute_traceability(self):
         """
@@ -13,6 +13,8 @@ class StateControlRedis:
     SCRIPT_QUEUE_NAME = 'queue_script'
 
     QUEUE_APP = 'queue_app_{}'
+    QUEUE_POOL = 'queue_minion_pool_{}'
+    KEY_POOL = 'key_minion_pool_{}'
 
     def __init__(self, redis_conn):
         self.redis_conn = redis_conn
@@ -37,8 +39,8 @@ class StateControlRedis:
         if ttl > 0:
             self.redis_conn.expire(queue, ttl)
 
-    def pop_start_queue(self, block=True):
-        return self.pop_queue(self.START_QUEUE_NAME, block)
+    def pop_start_queue(self, block=True, timeout=0):
+        return self.pop_queue(self.START_QUEUE_NAME, block, timeout)
 
     def push_start_queue(self, data):
         self.push_queue(self.START_QUEUE_NAME, data)
@@ -79,6 +81,23 @@ class StateControlRedis:
         key = 'key_minion_app_{}'.format(app_id)
         return self.redis_conn.delete(key)
 
+    def pop_pool_queue(self, pool_id, block=True, timeout=0):
+        return self.pop_queue(self.QUEUE_POOL.format(pool_id), block, timeout)
+
+    def push_pool_queue(self, pool_id, data):
+        self.push_queue(self.QUEUE_POOL.format(pool_id), data)
+
+    def get_pool_minion_status(self, pool_id):
+        result = self.redis_conn.get(self.KEY_POOL.format(pool_id))
+        return result if result else None
+
+    def set_pool_minion_status(self, pool_id, status, ex=15):
+        return self.redis_conn.set(self.KEY_POOL.format(pool_id), value=status,
+                                   ex=ex)
+
+    def unset_pool_minion_status(self, pool_id):
+        return self.redis_conn.delete(self.KEY_POOL.format(pool_id))
+
     def pop_app_output_queue(self, app_id, block=True):
         key = 'queue_output_app_{app_id}'.format(app_id=app_id)
         if block:
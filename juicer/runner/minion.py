@@ -3,26 +3,46 @@
 
 import argparse
 import gettext
+import importlib
 import logging.config
 import os
 
-import matplotlib
 import redis
 import yaml
 from future.moves.urllib.parse import urlparse
-from juicer.compss.compss_minion import COMPSsMinion
-from juicer.keras.keras_minion import KerasMinion
-from juicer.scikit_learn.scikit_learn_minion import ScikitLearnMinion
-from juicer.jobs.script_minion import ScriptMinion
-from juicer.spark.spark_minion import SparkMinion
+from juicer.runner import minion_pool
+from juicer.runner.control import StateControlRedis
+from juicer.runner.startup_profile import StartupProfile
 
-# Important!
+# Important! Charts must use a non interactive backend. Using the environment
+# variable avoids importing matplotlib for platforms that do not use it.
 # See https://stackoverflow.com/a/29172195/1646932
-matplotlib.use('Agg', force=True, warn=True)
+os.environ['MPLBACKEND'] = 'Agg'
 
 logging.config.fileConfig('logging_config.ini')
 log = logging.getLogger(__name__)
 
+# Minion implementation for each platform. Modules are imported only when
+# the platform is used, because each one brings its own stack (PySpark,
+# pandas/scikit-learn, Keras/TensorFlow, etc).
+MINION_BACKENDS = {
+    'spark': 'juicer.spark.spark_minion.SparkMinion',
+    'compss': 'juicer.compss.compss_minion.COMPSsMinion',
+    'scikit-learn':
+        'juicer.scikit_learn.scikit_learn_minion.ScikitLearnMinion',
+    'keras': 'juicer.keras.keras_minion.KerasMinion',
+    'script': 'juicer.jobs.script_minion.ScriptMinion',
+}
+
+
+def get_minion_class(platform):
+    if platform not in MINION_BACKENDS:
+        raise ValueError(
+            _("{type} is not supported (yet!)").format(type=platform))
+    module_name, class_name = MINION_BACKENDS[platform].rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
 # locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
 locales_path = os.path.join(os.path.dirname(__file__), '..', 'i18n', 'locales')
 
@@ -31,7 +51,7 @@ if __name__ == '__main__':
 
     parser.add_argument("-c", "--config", help="Config file.", required=True)
     parser.add_argument("-w", "--workflow_id", help="Workflow id.", type=str,
-                        required=True)
+                        required=False)
     parser.add_argument("-a", "--app_id", help="Job id", type=str,
                         required=False)
     parser.add_argument("-t", "--type", help="Execution engine.",
@@ -40,11 +60,19 @@ if __name__ == '__main__':
                         required=False, default="en_US")
     parser.add_argument("--jars", help="Add Java JAR files to class path.",
                         required=False)
+    parser.add_argument("--profile-imports", action="store_true",
+                        help="Logs the time spent in startup (imports).",
+                        required=False)
+    parser.add_argument("--pool", help="Starts an idle minion (identified "
+                                       "by this id), waiting for an app.",
+                        required=False)
 
     args = parser.parse_args()
     t = gettext.translation('messages', locales_path, [args.lang],
                             fallback=True)
     t.install()
+    if not args.workflow_id and not args.pool:
+        parser.error(_('Workflow id is required.'))
 
     log.info(_("Starting minion"))
     log.debug(_('(c) Lemonade - DCC UFMG'))
@@ -52,50 +80,57 @@ if __name__ == '__main__':
         with open(args.config) as config_file:
             juicer_config = yaml.load(config_file.read(),
                                       Loader=yaml.FullLoader)
+        minion_config = juicer_config['juicer'].get('minion', {})
+        profile = StartupProfile(args.profile_imports or
+                                 minion_config.get('profile_imports', False))
+
+        with profile.stage('backend ({})'.format(args.type)):
+            minion_class = get_minion_class(args.type)
 
         parsed_url = urlparse(
             juicer_config['juicer']['servers']['redis_url'])
         redis_conn = redis.StrictRedis(host=parsed_url.hostname,
                                        port=parsed_url.port,
                                        decode_responses=True)
-        if args.type == 'spark':
-            # log.info('Starting Juicer Spark Minion')
-            minion = SparkMinion(redis_conn,
-                                 args.workflow_id,
-                                 args.app_id or args.workflow_id,
-                                 juicer_config,
-                                 args.lang, args.jars)
-        elif args.type == 'compss':
-            # log.info('Starting COMPSs Minion')
-            minion = COMPSsMinion(redis_conn,
-                                  args.workflow_id,
-                                  args.app_id or args.workflow_id,
-                                  juicer_config,
-                                  args.lang)
-        elif args.type == 'scikit-learn':
-            # log.info('Starting Scikit-learn Minion')
-            minion = ScikitLearnMinion(redis_conn,
-                                       args.workflow_id,
-                                       args.app_id or args.workflow_id,
-                                       juicer_config,
-                                       args.lang)
-        elif args.type == 'keras':
-            log.info('Starting Keras Minion')
-            minion = KerasMinion(redis_conn,
-                                 args.workflow_id,
-                                 args.app_id or args.workflow_id,
-                                 juicer_config,
-                                 args.lang)
-        elif args.type == 'script':
-            log.info('Starting Script Minion')
-            minion = ScriptMinion(redis_conn,
-                                  workflow_id=0,
-                                  app_id=0,
-                                  config=juicer_config,
-                                  lang=args.lang)
-        else:
-            raise ValueError(
-                _("{type} is not supported (yet!)").format(type=args.type))
+        if args.pool:
+            # Idle minion (see JuicerServer pool): libraries are imported
+            # before it is assigned to an application.
+            with profile.stage('preload ({})'.format(args.type)):
+                minion_pool.preload(args.type)
+            for line in profile.report():
+                log.info(_('Startup profile: %s'), line)
+
+            assignment = minion_pool.wait_for_assignment(
+                StateControlRedis(redis_conn), args.pool, args.type,
+                minion_config.get('pool', {}).get('check_interval', 5))
+            args.workflow_id = assignment['workflow_id']
+            args.app_id = assignment['app_id']
+            log.info(_('Idle minion %s assigned to app %s'), args.pool,
+                     args.app_id)
+
+        log.info(_('Starting %s minion'), args.type)
+        with profile.stage('minion setup'):
+            if args.type == 'script':
+                minion = minion_class(redis_conn,
+                                      workflow_id=0,
+                                      app_id=0,
+                                      config=juicer_config,
+                                      lang=args.lang)
+            elif args.type == 'spark':
+                minion = minion_class(redis_conn,
+                                      args.workflow_id,
+                                      args.app_id or args.workflow_id,
+                                      juicer_config,
+                                      args.lang, args.jars)
+            else:
+                minion = minion_class(redis_conn,
+                                      args.workflow_id,
+                                      args.app_id or args.workflow_id,
+                                      juicer_config,
+                                      args.lang)
+        if not args.pool:
+            for line in profile.report():
+                log.info(_('Startup profile: %s'), line)
         minion.process()
     except Exception as ex:
         log.exception(_("Error running minion"), exc_info=ex)
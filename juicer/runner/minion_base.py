@@ -59,6 +59,13 @@ class Minion:
         self.app_id = app_id
         self.config = config
 
+        # Jobs of the same app may run concurrently, sharing the minion
+        # session/process. Default is one job at a time (sequential).
+        self.max_concurrent_jobs = max(1, config['juicer'].get(
+            'minion', {}).get('max_concurrent_jobs', 1))
+        # Futures of jobs submitted for execution, by job id
+        self.job_futures = {}
+
         # Errors and messages
         self.MNN000 = ('MNN000', _('Success.'))
         self.MNN001 = ('MNN001', _('Port output format not supported.'))
@@ -84,6 +91,13 @@ class Minion:
     def process(self):
         raise NotImplementedError()
 
+    def _track_job_future(self, job_id, future):
+        """ Keeps the future of a job (finished ones are discarded) """
+        self.job_futures = {k: f for k, f in self.job_futures.items()
+                            if not f.done()}
+        self.job_futures[str(job_id)] = future
+        return future
+
     def _generate_output(self, message, status=None, code=None):
         """
         Sends feedback about execution of this minion.
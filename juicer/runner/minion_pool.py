@@ -0,0 +1,161 @@
+# coding=utf-8
+"""
+Pool of warm (idle) minions.
+
+Starting a minion requires a new Python interpreter and the import of the
+libraries used by its platform (PySpark, pandas, scikit-learn, etc). In order
+to reduce the latency of the first execution of an application, JuicerServer
+keeps a pool of minions that were already started and are waiting to be
+assigned to an application (see juicer.minion.pool in configuration).
+
+Idle minions inform they are alive (and ready) using a key with expiration
+in Redis. Minions are not returned to the pool after use, because they keep
+the application state; the pool is replenished by starting new ones.
+"""
+import importlib
+import json
+import logging
+import os
+import signal
+import time
+import uuid
+from collections import defaultdict
+
+log = logging.getLogger(__name__)
+
+# Modules imported by an idle minion, besides the minion implementation
+PRELOAD_MODULES = {
+    'spark': ['pyspark.sql', 'pyspark.ml', 'pyspark.sql.functions'],
+    'scikit-learn': ['numpy', 'pandas', 'sklearn.linear_model',
+                     'sklearn.ensemble', 'sklearn.model_selection'],
+    'keras': ['numpy', 'pandas', 'keras'],
+    'compss': ['numpy', 'pandas'],
+}
+
+
+def preload(platform):
+    """ Imports the libraries used by a platform. Missing ones are ignored """
+    for name in PRELOAD_MODULES.get(platform, []):
+        try:
+            importlib.import_module(name)
+        except ImportError as ie:
+            log.warn(_('Unable to preload module %s: %s'), name, ie)
+
+
+def wait_for_assignment(state_control, pool_id, platform, interval=5):
+    """
+    Blocks an idle minion until it is assigned to an application.
+    Returns the assignment (a dict with workflow_id and app_id).
+    """
+    status = json.dumps({'status': 'IDLE', 'pid': os.getpid(),
+                         'platform': platform})
+    while True:
+        state_control.set_pool_minion_status(pool_id, status,
+                                             ex=3 * interval)
+        msg = state_control.pop_pool_queue(pool_id, timeout=interval)
+        if msg is not None:
+            state_control.unset_pool_minion_status(pool_id)
+            return json.loads(msg)
+
+
+class MinionPool(object):
+    """
+    Keeps track of idle minions, by platform, in the JuicerServer side.
+    Each entry is a dict with pool_id, platform, process, pid, port and
+    created (timestamp).
+    """
+
+    def __init__(self, config):
+        config = config or {}
+        self.sizes = config.get('size', {}) or {}
+        # Limit for the number of idle minions (all platforms)
+        self.max_size = config.get('max_size', 4)
+        # Idle minions are recycled after this time (seconds)
+        self.max_idle_time = config.get('max_idle_time', 3600)
+        # Time (seconds) a minion has to become ready (libraries imported)
+        self.startup_timeout = config.get('startup_timeout', 120)
+        self.check_interval = config.get('check_interval', 5)
+        self.idle = defaultdict(list)
+
+    @property
+    def enabled(self):
+        return self.max_size > 0 and any(
+            size > 0 for size in self.sizes.values())
+
+    def ports(self):
+        return [entry['port'] for entries in self.idle.values()
+                for entry in entries]
+
+    def size(self):
+        return sum(len(entries) for entries in self.idle.values())
+
+    @staticmethod
+    def _is_alive(entry):
+        return entry['process'].poll() is None
+
+    @staticmethod
+    def _is_ready(state_control, entry):
+        return state_control.get_pool_minion_status(
+            entry['pool_id']) is not None
+
+    @staticmethod
+    def _terminate(entry):
+        try:
+            os.kill(entry['pid'], signal.SIGTERM)
+        except OSError:
+            pass
+
+    def add(self, entry):
+        entry['created'] = time.time()
+        self.idle[entry['platform']].append(entry)
+
+    def acquire(self, state_control, platform):
+        """
+        Removes from the pool and returns a healthy and ready minion for the
+        platform, or None if there is not one available.
+        """
+        entries = self.idle.get(platform, [])
+        for entry in list(entries):
+            if not self._is_alive(entry):
+                entries.remove(entry)
+            elif self._is_ready(state_control, entry):
+                entries.remove(entry)
+                return entry
+        return None
+
+    def maintain(self, state_control, start_minion):
+        """
+        Removes dead, stuck (not ready after startup timeout) and expired
+        minions and starts new ones (using start_minion(platform)) in order
+        to keep the configured pool size.
+        """
+        now = time.time()
+        for platform, entries in list(self.idle.items()):
+            for entry in list(entries):
+                age = now - entry['created']
+                if not self._is_alive(entry):
+                    log.warn(_('Idle minion %s (pid=%s) is not running.'),
+                             entry['pool_id'], entry['pid'])
+                    entries.remove(entry)
+                elif age > self.max_idle_time or (
+                        age > self.startup_timeout and
+                        not self._is_ready(state_control, entry)):
+                    log.info(_('Recycling idle minion %s (pid=%s).'),
+                             entry['pool_id'], entry['pid'])
+                    self._terminate(entry)
+                    entries.remove(entry)
+
+        for platform, size in self.sizes.items():
+            while (len(self.idle[platform]) < size and
+                   self.size() < self.max_size):
+                self.add(start_minion(platform))
+
+    def terminate_all(self):
+        for entries in self.idle.values():
+            for entry in entries:
+                self._terminate(entry)
+        self.idle.clear()
+
+    @staticmethod
+    def new_id():
+        return uuid.uuid4().hex
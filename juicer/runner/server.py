@@ -21,6 +21,7 @@ from juicer.kb8s import delete_kb8s_job
 from juicer.runner import configuration
 from juicer.runner import protocol as juicer_protocol
 from juicer.runner.control import StateControlRedis
+from juicer.runner.minion_pool import MinionPool
 from redis.exceptions import ConnectionError
 
 locales_path = os.path.join(os.path.dirname(__file__), '..', 'i18n', 'locales')
@@ -84,6 +85,10 @@ class JuicerServer:
         self.port_offset = config['juicer'].get('minion', {}).get(
             'port_offset', 100)
 
+        # Idle minions, already started, waiting for an application
+        self.minion_pool = MinionPool(
+            config['juicer'].get('minion', {}).get('pool', {}))
+
         self.mgr = socketio.RedisManager(
             config['juicer']['servers']['redis_url'],
             'job_output')
@@ -127,8 +132,18 @@ class JuicerServer:
                 log.warn(_("Pending queue is empty"))
 
         while True:
+            self._maintain_minion_pool()
             self.read_start_queue(redis_conn)
 
+    def _maintain_minion_pool(self):
+        if not self.minion_pool.enabled:
+            return
+        try:
+            self.minion_pool.maintain(self.state_control,
+                                      self._start_pooled_minion)
+        except Exception as ex:
+            log.exception(ex)
+
     # noinspection PyMethodMayBeStatic
     def read_start_queue(self, redis_conn):
         app_id = None
@@ -136,7 +151,14 @@ class JuicerServer:
             self.state_control = StateControlRedis(redis_conn)
             # Process next message
             log.info(_('Reading "start" queue.'))
-            msg = self.state_control.pop_start_queue()
+            # When there is a pool of minions, it must be checked periodically
+            if self.minion_pool.enabled:
+                msg = self.state_control.pop_start_queue(
+                    timeout=self.minion_pool.check_interval)
+                if msg is None:
+                    return
+            else:
+                msg = self.state_control.pop_start_queue()
             log.info(_('Forwarding message to minion.'))
             msg_info = json.loads(msg)
 
@@ -204,12 +226,16 @@ class JuicerServer:
             minion_process = self._start_minion(
                 workflow_id, app_id, job_id, self.state_control, platform,
                 cluster=cluster)
+            # Port may have been reserved by a minion in the pool
+            minion_status = json.loads(
+                self.state_control.get_minion_status(app_id) or '{}')
             # FIXME Kubernetes
             self.active_minions[(workflow_id, app_id)] = {
                 'pid': minion_process.pid if minion_process else 0,
                 'process': minion_process,
                 'cluster': cluster,
-                'port': self._get_next_available_port()}
+                'port': (minion_status.get('port') or
+                         self._get_next_available_port())}
 
         # Forward the message to the minion, which can be an execute or a
         # deliver command
@@ -276,6 +302,14 @@ class JuicerServer:
                                  cluster=None):
         if cluster is None:
             cluster = {}
+
+        pooled = None
+        if not restart and self.minion_pool.enabled:
+            pooled = self.minion_pool.acquire(state_control, platform)
+        if pooled is not None:
+            return self._assign_pooled_minion(pooled, workflow_id, app_id,
+                                              state_control)
+
         minion_id = 'minion_{}_{}'.format(workflow_id, app_id)
         stdout_log = os.path.join(self.log_dir, minion_id + '_out.log')
         stderr_log = os.path.join(self.log_dir, minion_id + '_err.log')
@@ -293,6 +327,19 @@ class JuicerServer:
                       self.config_file_path, ]
         log.info(_('Minion command: %s'), json.dumps(minion_cmd))
 
+        proc = subprocess.Popen(minion_cmd,
+                                stdout=open(stdout_log, 'a'),
+                                stderr=open(stderr_log, 'a'),
+                                env=self._get_minion_env(port))
+
+        # Expires in 30 seconds and sets only if it doesn't exist
+        proc_id = int(proc.pid)
+        state_control.set_minion_status(
+            app_id, json.dumps({'pid': proc_id, 'port': port}), ex=30,
+            nx=False)
+        return proc
+
+    def _get_minion_env(self, port):
         # Mesos / libprocess configuration. See:
         # http://mesos.apache.org/documentation/latest/configuration/libprocess/
         cloned_env = os.environ.copy()
@@ -303,18 +350,41 @@ class JuicerServer:
 
         if self.advertise_ip is not None:
             cloned_env['LIBPROCESS_ADVERTISE_IP'] = self.advertise_ip
+        return cloned_env
+
+    def _start_pooled_minion(self, platform):
+        """
+        Starts an idle minion for the pool. It imports the platform libraries
+        and waits until it is assigned to an application.
+        """
+        pool_id = MinionPool.new_id()
+        port = self._get_next_available_port()
+        minion_id = 'minion_pool_{}'.format(pool_id)
+        stdout_log = os.path.join(self.log_dir, minion_id + '_out.log')
+        stderr_log = os.path.join(self.log_dir, minion_id + '_err.log')
 
+        minion_cmd = ['nohup', sys.executable, self.minion_executable,
+                      '--pool', pool_id, '-t', platform, '-c',
+                      self.config_file_path, ]
+        log.info(_('Starting idle minion %s for %s.'), minion_id, platform)
         proc = subprocess.Popen(minion_cmd,
                                 stdout=open(stdout_log, 'a'),
                                 stderr=open(stderr_log, 'a'),
-                                env=cloned_env)
-
-        # Expires in 30 seconds and sets only if it doesn't exist
-        proc_id = int(proc.pid)
+                                env=self._get_minion_env(port))
+        return {'pool_id': pool_id, 'platform': platform, 'process': proc,
+                'pid': int(proc.pid), 'port': port}
+
+    def _assign_pooled_minion(self, pooled, workflow_id, app_id,
+                              state_control):
+        log.info(_('Assigning idle minion %s (pid=%s) to '
+                   '(workflow_id=%s,app_id=%s).'), pooled['pool_id'],
+                 pooled['pid'], workflow_id, app_id)
+        state_control.push_pool_queue(pooled['pool_id'], json.dumps(
+            {'workflow_id': str(workflow_id), 'app_id': str(app_id)}))
         state_control.set_minion_status(
-            app_id, json.dumps({'pid': proc_id, 'port': port}), ex=30,
-            nx=False)
-        return proc
+            app_id, json.dumps({'pid': pooled['pid'], 'port': pooled['port']}),
+            ex=30, nx=False)
+        return pooled['process']
 
     def _terminate_minion(self, workflow_id, app_id):
         # In this case we got a request for terminating this workflow
@@ -392,6 +462,7 @@ class JuicerServer:
     def _get_next_available_port(self):
         used_ports = set(
             [minion['port'] for minion in list(self.active_minions.values())])
+        used_ports.update(self.minion_pool.ports())
         for i in self.port_range:
             if i not in used_ports:
                 return i
@@ -485,6 +556,7 @@ class JuicerServer:
         minions = [m for m in self.active_minions]
         for (wid, aid) in minions:
             self._terminate_minion(wid, aid)
+        self.minion_pool.terminate_all()
         sys.exit(0)
 
     # noinspection PyUnusedLocal
@@ -0,0 +1,71 @@
+# coding=utf-8
+"""
+Measures where the startup time of a minion goes: time of each startup
+stage (configuration, backend import, etc) and time spent importing modules,
+grouped by top level package. For a detailed (per module) report, run the
+minion using python -X importtime.
+"""
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from six.moves import builtins
+
+
+class StartupProfile(object):
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = []
+        # Time spent importing modules (excluding nested imports of other
+        # packages), by top level package
+        self.import_times = defaultdict(float)
+        self._stack = []
+        self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0:
+            package = name.split('.')[0]
+        else:
+            package = ((globals or {}).get('__package__') or '').split('.')[0]
+        self._stack.append(0.0)
+        start = time.time()
+        try:
+            return self._original_import(name, globals, locals, fromlist,
+                                         level)
+        finally:
+            elapsed = time.time() - start
+            nested = self._stack.pop()
+            self.import_times[package] += elapsed - nested
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    @contextmanager
+    def stage(self, name):
+        """ Measures a startup stage (time and number of modules loaded) """
+        if not self.enabled:
+            yield
+            return
+        installed = self._original_import is None
+        if installed:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+        modules = len(sys.modules)
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.stages.append(
+                (name, time.time() - start, len(sys.modules) - modules))
+            if installed:
+                builtins.__import__ = self._original_import
+                self._original_import = None
+
+    def report(self, top=15):
+        """ Returns the profile as a list of lines """
+        lines = ['{:<30} {:>8.3f}s {:>6} modules'.format(name, elapsed, count)
+                 for name, elapsed, count in self.stages]
+        packages = sorted(self.import_times.items(), key=lambda x: -x[1])
+        lines.extend('  import {:<23} {:>8.3f}s'.format(package, elapsed)
+                     for package, elapsed in packages[:top] if package)
+        return lines
@@ -67,7 +67,7 @@ class ClassificationModelOperation(Operation):
             code += """
             {OUT} = {IN}
             
-            {OUT}['{predCol}'] = {model}.predict(X).tolist()
+            {OUT}['{predCol}'] = {model}.predict(X)
             """.format(predCol=self.prediction, OUT=self.output,
                        model=self.model,
                        IN=self.named_inputs['train input data'])
@@ -198,7 +198,7 @@ class DecisionTreeClassifierOperation(Operation):
                 min_impurity_decrease={min_impurity_decrease}, 
                 class_weight={class_weight}, presort={presort})
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """.format(output_data=self.output,
                        prediction=self.prediction,
                        columns=self.features,
@@ -361,7 +361,7 @@ class GBTClassifierOperation(Operation):
                 presort='{presort}', validation_fraction={validation_fraction}, 
                 n_iter_no_change={n_iter_no_change}, tol={tol})
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """.format(output_data=self.output,
                        prediction=self.prediction,
                        columns=self.features,
@@ -471,7 +471,7 @@ class KNNClassifierOperation(Operation):
                 leaf_size={leaf_size}, p={p}, metric='{metric}', 
                 metric_params={metric_params}, n_jobs={n_jobs})
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """.format(n_neighbors=self.n_neighbors,
                        output_data=self.output,
                        model=self.model,
@@ -660,7 +660,7 @@ class LogisticRegressionOperation(Operation):
             {model}.fit(X_train, y)
 
             {output} = {input}.copy()
-            {output}['{prediction_column}'] = {model}.predict(X_train).tolist()
+            {output}['{prediction_column}'] = {model}.predict(X_train)
             """.format(tol=self.tol, C=self.regularization,
                        max_iter=self.max_iter, seed=self.seed,
                        solver=self.solver, penalty=self.penalty,
@@ -922,7 +922,7 @@ class MLPClassifierOperation(Operation):
             y = get_label_data({input_data}, {label})
             {model} = MLPClassifier({add_functions_required})
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """.format(output_data=self.output,
                        prediction=self.prediction,
                        columns=self.features,
@@ -1023,7 +1023,7 @@ class NaiveBayesClassifierOperation(Operation):
                 {model} = MultinomialNB(alpha={alpha}, 
                     class_prior={class_prior}, fit_prior={fit_prior})
                 {model}.fit(X_train, y)          
-                {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+                {output_data}['{prediction}'] = {model}.predict(X_train)
                 """.format(output_data=self.output,
                            model=self.model,
                            input_data=self.input_port,
@@ -1042,7 +1042,7 @@ class NaiveBayesClassifierOperation(Operation):
                     class_prior={class_prior}, fit_prior={fit_prior}, 
                     binarize={binarize})
                 {model}.fit(X_train, y)          
-                {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+                {output_data}['{prediction}'] = {model}.predict(X_train)
                 """.format(output_data=self.output,
                            model=self.model,
                            input_data=self.input_port,
@@ -1061,7 +1061,7 @@ class NaiveBayesClassifierOperation(Operation):
                 {model} = GaussianNB(priors={priors}, 
                     var_smoothing={var_smoothing})  
                 {model}.fit(X_train, y)          
-                {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+                {output_data}['{prediction}'] = {model}.predict(X_train)
                 """.format(output_data=self.output,
                            model=self.model,
                            input_data=self.input_port,
@@ -1188,7 +1188,7 @@ class PerceptronClassifierOperation(Operation):
                                       n_iter_no_change={n_iter_no_change}, class_weight={class_weight}, 
                                       warm_start=False)
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """.format(tol=self.tol,
                        alpha=self.alpha,
                        max_iter=self.max_iter,
@@ -1369,7 +1369,7 @@ class RandomForestClassifierOperation(Operation):
         {model}.fit(X_train, y)
 
         {output} = {input}.copy()
-        {output}['{prediction_column}'] = {model}.predict(X_train).tolist()
+        {output}['{prediction_column}'] = {model}.predict(X_train)
         """.format(output=self.output, model=self.model, input=self.input_port,
                    n_estimators=self.n_estimators, max_depth=self.max_depth,
                    min_split=self.min_split, min_leaf=self.min_leaf, seed=self.seed,
@@ -1496,7 +1496,7 @@ class SvmClassifierOperation(Operation):
         {model}.fit(X_train, y)
 
         {output} = {input}.copy()
-        {output}['{prediction_column}'] = {model}.predict(X_train).tolist()
+        {output}['{prediction_column}'] = {model}.predict(X_train)
         
         """.format(tol=self.tol, c=self.c, max_iter=self.max_iter,
                    degree=self.degree, kernel=self.kernel, seed=self.seed,
@@ -537,8 +537,8 @@ class LdaClusteringOperation(Operation):
 
         if self.contains_results() or 'output data' in self.named_outputs:
             code += """
-            {output} = {input}
-            {output}['{pred_col}'] = {model}.transform(X_train).tolist()
+            {output} = {input}.copy()
+            {output}['{pred_col}'] = VectorArray({model}.transform(X_train))
             """.format(output=self.output, model=self.model,
                        pred_col=self.prediction, input_col=self.features[0],
                        input=self.named_inputs['train input data'])
@@ -32,6 +32,9 @@ class DataReaderOperation(Operation):
 
     OPT_MODE_FAILFAST = 'FAILFAST'
 
+    ENGINE_PANDAS = 'pandas'
+    ENGINE_PYARROW = 'pyarrow'
+
     SEPARATORS = {
         '{tab}': '\\t',
         '{new_line}': '\\n',
@@ -70,6 +73,17 @@ class DataReaderOperation(Operation):
             [len(self.named_outputs) > 0, self.contains_results()])
 
         self.header = False
+        # Attributes used by the operations reading the data source (set by
+        # transpiler). If None, all attributes are read.
+        self.used_attributes = None
+
+        reader_config = parameters.get('configuration', {}).get(
+            'juicer', {}).get('scikit_learn', {}).get('data_reader', {})
+        self.engine = reader_config.get('engine', self.ENGINE_PYARROW)
+        self.compact_dtypes = reader_config.get('compact_dtypes', True)
+        self.categorical = reader_config.get('categorical', False)
+        self.chunk_size_mb = reader_config.get('chunk_size_mb', 0)
+
         if self.has_code:
             if self.DATA_SOURCE_ID_PARAM in parameters:
                 self._set_data_source_parameters(parameters)
@@ -92,6 +106,27 @@ class DataReaderOperation(Operation):
 
             self.output = named_outputs.get('output data',
                                             'out_task_{}'.format(self.order))
+            if self._use_arrow():
+                self.has_import = (
+                    'from juicer.scikit_learn.library.arrow_reader '
+                    'import read_csv, read_parquet\n')
+
+    @property
+    def supports_projection(self):
+        return self.has_code
+
+    def _use_arrow(self):
+        """
+        Apache Arrow is used for CSV (if schema is not all strings) and
+        Parquet formats.
+        """
+        if self.engine != self.ENGINE_PYARROW:
+            return False
+        if self.metadata['format'] == 'CSV':
+            # Arrow supports only single character separators
+            return self.infer_schema != self.DO_NOT_INFER and (
+                len(self.sep) == 1 or self.sep in self.SEPARATORS.values())
+        return self.metadata['format'] == 'PARQUET'
 
     def _set_data_source_parameters(self, parameters):
 
@@ -143,7 +178,11 @@ class DataReaderOperation(Operation):
         if self.has_code:
             if infer_from_limonero:
                 self.header = self.metadata.get('is_first_line_header')
-                if 'attributes' in self.metadata:
+                if 'attributes' not in self.metadata:
+                    raise ValueError(
+                        _("Metadata do not include attributes information"))
+                elif not self._use_arrow():
+                    # Schema for pandas (Arrow reader receives attributes)
                     code.append('columns = {}')
                     parse_dates = []
                     converters = {}
@@ -168,9 +207,6 @@ class DataReaderOperation(Operation):
                     code.append('converters = {}'.format(custom_repr(
                         converters)))
                     code.append("")
-                else:
-                    raise ValueError(
-                        _("Metadata do not include attributes information"))
             elif infer_from_data:
                 code.append('columns = None')
                 code.append('parse_dates = None')
@@ -210,7 +246,9 @@ class DataReaderOperation(Operation):
             else:
                 raise ValueError(_('Not supported'))
 
-            if self.metadata['format'] in ['CSV', 'TEXT']:
+            if self._use_arrow():
+                self._generate_code_for_arrow(code)
+            elif self.metadata['format'] in ['CSV', 'TEXT']:
                 encoding = self.metadata.get('encoding', 'utf-8') or 'utf-8'
                 if self.metadata['format'] == 'CSV':
                     code_csv = dedent("""
@@ -275,6 +313,48 @@ class DataReaderOperation(Operation):
 
         return '\n'.join(code)
 
+    def _generate_code_for_arrow(self, code):
+        if self.metadata['format'] == 'CSV':
+            attributes = None
+            if self.infer_schema == self.INFER_FROM_LIMONERO:
+                attributes = dict(
+                    (attr['name'], attr['type'])
+                    for attr in self.metadata.get('attributes', []))
+            code.append(dedent("""
+                {output} = read_csv(f, sep='{sep}', quote='{quote}',
+                                    header={header},
+                                    encoding='{encoding}',
+                                    null_values={na_values},
+                                    attributes={attributes},
+                                    columns={columns},
+                                    fail_fast={mode},
+                                    compact={compact},
+                                    categorical={categorical},
+                                    chunk_size_mb={chunk_size_mb})
+                f.close()
+            """).format(output=self.output,
+                        sep=self.sep, quote=self.quote or '"',
+                        header=bool(self.header),
+                        encoding=self.metadata.get('encoding') or 'utf-8',
+                        na_values=repr(self.null_values or None),
+                        attributes=repr(attributes or None),
+                        columns=repr(self.used_attributes),
+                        mode=self.mode == self.OPT_MODE_FAILFAST,
+                        compact=bool(self.compact_dtypes),
+                        categorical=bool(self.categorical),
+                        chunk_size_mb=self.chunk_size_mb))
+        else:
+            code.append(dedent("""
+                {output} = read_parquet(f, columns={columns},
+                                        chunked={chunked})
+                f.close()
+            """).format(output=self.output,
+                        columns=repr(self.used_attributes),
+                        chunked=bool(self.chunk_size_mb)))
+        # Same implementation of data frame used by the platform (modin)
+        code.append('{output} = pd.DataFrame({output})'.format(
+            output=self.output))
+
     def _generate_code_for_jdbc(self, code):
 
         parsed = urlparse(self.metadata['url'])
@@ -252,7 +252,7 @@ class CleanMissingOperation(Operation):
             code = """
                 min_missing_ratio = {min_thresh}
                 max_missing_ratio = {max_thresh}
-                {output} = {input}
+                {output} = {input}.copy()
                 to_remove = []
                 for col in {columns}:
                     ratio = {input}[col].isnull().sum() / len({input})
@@ -290,7 +290,7 @@ class CleanMissingOperation(Operation):
             code = """
                     min_missing_ratio = {min_thresh}
                     max_missing_ratio = {max_thresh}
-                    {output} = {input}
+                    {output} = {input}.copy()
                     for col in {columns}:
                         ratio = {input}[col].isnull().sum() / len({input})
                         ratio_mask = (ratio > min_missing_ratio) & (ratio <= max_missing_ratio)
@@ -580,8 +580,8 @@ class FilterOperation(Operation):
                                              'out_{}'.format(self.order))
 
     def generate_code(self):
-        input_data = self.named_inputs['input data']
-        params = {'input': input_data}
+        # Expressions are evaluated over the output (a reference to input)
+        params = {'input': self.output}
 
         filters = [
             "({0} {1} {2})".format(f['attribute'], f['f'],
@@ -595,13 +595,17 @@ class FilterOperation(Operation):
         expressions = []
         for i, expr in enumerate(self.advanced_filter):
             expression = Expression(expr['tree'], params)
-            expressions.append(expression.parsed_expression)
+            # Column-wise evaluation is preferred, row by row is much slower
+            if expression.vectorized_expression:
+                expressions.append(expression.vectorized_expression)
+            else:
+                expressions.append('{}.apply({}, axis=1)'.format(
+                    self.output, expression.parsed_expression))
 
         if len(expressions) > 0:
             for e in expressions:
                 code += """
-        {out} = {out}[{out}.apply({expr}, axis=1)]""".format(out=self.output,
-                                                             expr=e)
+        {out} = {out}[{expr}]""".format(out=self.output, expr=e)
 
         indentation = " and "
         if len(filters) > 0:
@@ -794,7 +798,7 @@ class ReplaceValuesOperation(Operation):
 
     def generate_code(self):
         code = """
-        {out} = {in1}
+        {out} = {in1}.copy()
         replacement = {replaces}
         for col in replacement:
             list_replaces = replacement[col]
@@ -839,6 +843,9 @@ class SampleOrPartitionOperation(Operation):
 
         self.seed = self.parameters.get(self.SEED, 'None')
         self.seed = self.seed if self.seed != "" else 'None'
+        # Without a seed, a new sample is expected in each execution
+        self.supports_cache = (self.type == self.TYPE_HEAD or
+                               self.seed != 'None')
 
         self.output = self.named_outputs.get('sampled data',
                                              'output_data_{}'.format(
@@ -892,6 +899,9 @@ class SelectOperation(Operation):
         self.output = self.named_outputs.get(
             'output projected data', 'projection_data_{}'.format(self.order))
 
+    def get_used_attributes(self):
+        return self.attributes
+
     def generate_code(self):
 
         code = "{output} = {input}[[{column}]]"\
@@ -956,6 +966,8 @@ class SplitOperation(Operation):
         self.weights = float(self.parameters.get('weights', 50))/100
         self.seed = self.parameters.get("seed", 'None')
         self.seed = 'None' if self.seed == "" else self.seed
+        # Without a seed, a new split is expected in each execution
+        self.supports_cache = self.seed != 'None'
 
         self.out1 = self.named_outputs.get('split 1',
                                            'split_1_task_{}'.format(self.order))
@@ -1004,23 +1016,25 @@ class TransformationOperation(Operation):
 
     def generate_code(self):
         # Builds the expression and identify the target column
-        params = {'input': self.named_inputs['input data']}
-        functions = ""
+        # Expressions are evaluated over the output, so they can use columns
+        # created by previous expressions
+        params = {'input': self.output}
+        code = """
+        {out} = {input}.copy()""".format(
+            out=self.output, input=self.named_inputs['input data'])
         for expr in self.expressions:
-            expression = expr['tree']
-            expression = Expression(expression, params)
-            f = expression.parsed_expression
-            functions += "['{}', {}],".format(expr['alias'], f)
+            expression = Expression(expr['tree'], params)
+            # Column-wise evaluation is preferred, row by row is much slower
+            if expression.vectorized_expression:
+                f = expression.vectorized_expression
+            else:
+                f = '{}.apply({}, axis=1)'.format(
+                    self.output, expression.parsed_expression)
+            code += """
+        {out}['{alias}'] = {f}""".format(out=self.output,
+                                        alias=expr['alias'], f=f)
             # row.append(expression.imports) #TODO: by operation itself
 
-        code = """
-        {out} = {input}.copy()
-        functions = [{expr}]
-        for col, function in functions:
-            {out}[col] = {out}.apply(function, axis=1)
-        """.format(out=self.output,
-                   input=self.named_inputs['input data'],
-                   expr=functions)
         return dedent(code)
 
 
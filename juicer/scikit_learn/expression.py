@@ -1,6 +1,7 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 from six import text_type
 
 
@@ -8,12 +9,17 @@ class Expression:
     def __init__(self, json_code, params):
         self.code = json_code
         self.functions = {}
+        self.vectorized_functions = {}
         self.imports_functions = {}
         self.translate_functions = {}
         self.build_functions_dict()
+        self.build_vectorized_functions_dict()
 
         self.imports = ""
         self.parsed_expression = "lambda row: " + self.parse(json_code, params)
+        # Column-wise version of the expression (it evaluates the whole data
+        # frame at once). None if the expression does not use any column.
+        self.vectorized_expression = self.parse_vectorized(json_code, params)
 
     def parse(self, tree, params):
 
@@ -68,6 +74,135 @@ class Expression:
 
         return result
 
+    def parse_vectorized(self, tree, params):
+        """
+        Generates code using pandas/numpy column-wise operations over the data
+        frame params['input']. Functions that cannot be vectorized are
+        evaluated row by row (apply), only for their sub-expression.
+        """
+        if 'input' not in params:
+            return None
+        self._uses_columns = False
+        result = self._parse_vectorized(tree, params)
+        return result if self._uses_columns else None
+
+    def _parse_vectorized(self, tree, params):
+        if tree['type'] == 'BinaryExpression':
+            result = "({} {} {})".format(
+                self._parse_vectorized(tree['left'], params),
+                tree['operator'],
+                self._parse_vectorized(tree['right'], params))
+
+        elif tree['type'] == 'Literal':
+            result = self.parse(tree, params)
+
+        elif tree['type'] == 'CallExpression':
+            name = tree['callee']['name']
+            if name not in self.functions:
+                raise ValueError(_('Function {f}() does not exists.').format(
+                    f=name))
+            result = None
+            if name in self.vectorized_functions:
+                result = self.vectorized_functions[name](tree, params)
+            if result is None:
+                result = self._get_row_wise_call(tree, params)
+
+        elif tree['type'] == 'Identifier':
+            self._uses_columns = True
+            result = "{}['{}']".format(params['input'], tree['name'])
+
+        elif tree['type'] == 'UnaryExpression':
+            operator = '~' if tree['operator'] == '!' else tree['operator']
+            result = "({} {})".format(
+                operator, self._parse_vectorized(tree['argument'], params))
+
+        elif tree['type'] == 'LogicalExpression':
+            operators = {"&&": "&", "||": "|", "!": "~"}
+            operator = operators[tree['operator']]
+            result = "({}) {} ({})".format(
+                self._parse_vectorized(tree['left'], params), operator,
+                self._parse_vectorized(tree['right'], params))
+
+        elif tree['type'] == 'ConditionalExpression':
+            result = "np.where({}, {}, {})".format(
+                self._parse_vectorized(tree['test'], params),
+                self._parse_vectorized(tree['consequent'], params),
+                self._parse_vectorized(tree['alternate'], params))
+
+        else:
+            raise ValueError("Unknown type: {}".format(tree['type']))
+
+        return result
+
+    def _get_row_wise_call(self, spec, params):
+        """ Fallback for functions that cannot be vectorized """
+        self._uses_columns = True
+        return "{}.apply(lambda row: {}, axis=1)".format(
+            params['input'], self.parse(spec, params))
+
+    def _get_column_arguments(self, spec, params):
+        """
+        Arguments of a function applied to a column (first argument). None
+        if the first argument is a literal, because pandas accessors (.str,
+        .dt) are not available for it.
+        """
+        if not spec['arguments'] or spec['arguments'][0]['type'] == 'Literal':
+            return None
+        return [self._parse_vectorized(x, params) for x in spec['arguments']]
+
+    def get_numpy_vectorized_call(self, spec, params):
+        """
+        Numpy universal functions are applied to the whole column.
+
+        Example: sin(value) will be converted to np.sin(df['value'])
+        """
+        function = spec['callee']['name']
+        function = self.translate_functions.get(function, function)
+        # Numpy string functions (np.char) require arrays of str, not objects
+        if function.startswith('char.'):
+            return None
+        arguments = ', '.join(
+            [self._parse_vectorized(x, params) for x in spec['arguments']])
+        return "np.{}({})".format(function, arguments)
+
+    def get_str_vectorized_call(self, spec, params):
+        """
+        String methods are mapped to the pandas .str accessor.
+
+        Example: upper(name) will be converted to df['name'].str.upper()
+        """
+        args = self._get_column_arguments(spec, params)
+        if args is None:
+            return None
+        function = spec['callee']['name']
+        if function == 'replace':
+            # Python's str.replace does not use regular expressions
+            args.append('regex=False')
+        return "{}.str.{}({})".format(args[0], function, ', '.join(args[1:]))
+
+    def get_vectorized_call(self, spec, params):
+        """ Other functions with a column-wise equivalent in pandas """
+        args = self._get_column_arguments(spec, params)
+        if args is None:
+            return None
+        templates = {
+            'str': "{}.astype(str)",
+            'len': "{}.str.len()",
+            'length': "{}.str.len()",
+            'weekday': "{}.dt.weekday",
+            'isoweekday': "({}.dt.weekday + 1)",
+            'total_seconds': "{}.dt.total_seconds()",
+            'strip_punctuation':
+                "{}.str.translate(str.maketrans('', '', string.punctuation))",
+        }
+        return templates[spec['callee']['name']].format(args[0])
+
+    def get_when_function(self, spec, params):
+        """ Conditional expression (test ? consequent : alternate) """
+        test, consequent, alternate = [
+            self.parse(x, params) for x in spec['arguments']]
+        return "({} if {} else {})".format(consequent, test, alternate)
+
     def get_numpy_function_call(self, spec, params):
         """
         Wrap column name with row() function call, if such call is not present.
@@ -423,3 +558,32 @@ class Expression:
             'len': self.get_function_call
         }
         self.functions.update(others_functions)
+
+    def build_vectorized_functions_dict(self):
+        # Methods with the same name and semantics in pandas .str accessor.
+        # Others (e.g. count and split, that use regular expressions in
+        # pandas) are evaluated row by row.
+        str_functions = \
+            ['capitalize', 'casefold', 'center', 'endswith', 'find',
+             'index', 'isalnum', 'isalpha', 'isdecimal', 'isdigit',
+             'islower', 'isnumeric', 'isspace', 'istitle', 'isupper',
+             'ljust', 'lower', 'lstrip', 'replace', 'rfind', 'rindex',
+             'rjust', 'rstrip', 'startswith', 'strip', 'swapcase', 'title',
+             'upper', 'zfill']
+        self.vectorized_functions.update(
+            {k: self.get_str_vectorized_call for k in str_functions})
+
+        # Numpy universal functions (and other element-wise functions) are
+        # applied to columns. Others, such as array_equiv (a single result
+        # for whole arrays), are evaluated row by row.
+        numpy_elementwise = ['around', 'clip', 'fix', 'nan_to_num']
+        self.vectorized_functions.update(
+            {k: self.get_numpy_vectorized_call for k, v in
+             self.functions.items() if v == self.get_numpy_function_call and
+             (k in numpy_elementwise or isinstance(getattr(
+                 np, self.translate_functions.get(k, k), None), np.ufunc))})
+
+        self.vectorized_functions.update(
+            {k: self.get_vectorized_call for k in
+             ['str', 'len', 'length', 'weekday', 'isoweekday',
+              'total_seconds', 'strip_punctuation']})
@@ -32,7 +32,7 @@ class FeatureAssemblerOperation(Operation):
         cols = {cols}
         {input}_without_na = {input}.dropna(subset=cols)
         {output} = {input}_without_na.copy()
-        {output}['{alias}'] = {input}_without_na[cols].to_numpy().tolist()
+        {output}['{alias}'] = VectorArray({input}_without_na[cols].to_numpy())
         """.format(output=self.output, alias=self.alias,
                    input=self.named_inputs['input data'],
                    cols=self.parameters[self.ATTRIBUTES_PARAM])
@@ -105,14 +105,15 @@ class MinMaxScalerOperation(Operation):
                    att=self.attribute, alias=self.alias,
                    min=self.min, max=self.max)
 
+        code = dedent(code)
         # TODO: corrigir essa checagem
         if self.contains_results() or len(self.named_outputs) > 0:
-            code += """
+            code += dedent("""
             {output} = {input}.copy()
-            {output}['{alias}'] = {model}.transform(X_train).tolist()
+            {output}['{alias}'] = VectorArray({model}.transform(X_train))
             """.format(output=self.output, input=self.named_inputs['input data'],
-                       model=self.model, alias=self.alias)
-        return dedent(code)
+                       model=self.model, alias=self.alias))
+        return code
 
 
 class MaxAbsScalerOperation(Operation):
@@ -172,14 +173,15 @@ class MaxAbsScalerOperation(Operation):
                    input=self.named_inputs['input data'],
                    att=self.attribute, alias=self.alias)
 
+        code = dedent(code)
         # TODO: corrigir essa checagem
         if self.contains_results() or len(self.named_outputs) > 0:
-            code += """
+            code += dedent("""
             {output} = {input}.copy()
-            {output}['{alias}'] = {model}.transform(X_train).tolist()
+            {output}['{alias}'] = VectorArray({model}.transform(X_train))
             """.format(output=self.output, input=self.named_inputs['input data'],
-                       model=self.model, alias=self.alias)
-        return dedent(code)
+                       model=self.model, alias=self.alias))
+        return code
 
 
 class StandardScalerOperation(Operation):
@@ -250,14 +252,15 @@ class StandardScalerOperation(Operation):
                    input=self.named_inputs['input data'],
                    att=self.attribute, alias=self.alias, op=op)
 
+        code = dedent(code)
         if self.contains_results() or len(self.named_outputs) > 0:
-            code += """
+            code += dedent("""
             {output} = {input}.copy()
-            {output}['{alias}'] = {model}.transform(X_train).tolist()
+            {output}['{alias}'] = VectorArray({model}.transform(X_train))
             """.format(output=self.output,
                        input=self.named_inputs['input data'],
-                       model=self.model, alias=self.alias)
-        return dedent(code)
+                       model=self.model, alias=self.alias))
+        return code
 
 
 class QuantileDiscretizerOperation(Operation):
@@ -317,7 +320,7 @@ class QuantileDiscretizerOperation(Operation):
             encode='ordinal', strategy='quantile')
         X_train = get_X_train_data({input}, {att})
         
-        {output}['{alias}'] = {model}.fit_transform(X_train).flatten().tolist()
+        {output}['{alias}'] = {model}.fit_transform(X_train).ravel()
         """.format(output=self.output,
                    model=self.model,
                    input=self.named_inputs['input data'],
@@ -362,7 +365,7 @@ class OneHotEncoderOperation(Operation):
         from sklearn.preprocessing import OneHotEncoder
         enc = OneHotEncoder()
         X_train = get_X_train_data({input}, {att})
-        {output}['{alias}'] = enc.fit_transform(X_train).toarray().tolist()
+        {output}['{alias}'] = VectorArray(enc.fit_transform(X_train))
         """.format(output=self.output,
                    input=self.named_inputs['input data'],
                    att=self.attribute, alias=self.alias)
@@ -406,11 +409,11 @@ class PCAOperation(Operation):
     def generate_code(self):
         """Generate code."""
         code = """
-        {output} = {input}
+        {output} = {input}.copy()
         from sklearn.decomposition import PCA
         pca = PCA(n_components={n_comp})
         X_train = get_X_train_data({input}, {att})
-        {output}['{alias}'] = pca.fit_transform(X_train).tolist()
+        {output}['{alias}'] = VectorArray(pca.fit_transform(X_train))
         """.format(output=self.output,
                    input=self.named_inputs['input data'],
                    att=self.attributes, alias=self.alias,
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Reads data sources using Apache Arrow (pyarrow.csv and pyarrow.parquet).
+Compared to pandas.read_csv, only the required columns are read
+(projection), Limonero types are mapped to compact data types and data can
+be read in batches (chunks), reducing the peak of memory used.
+Options not supported by the installed pyarrow (0.17, in requirements.txt,
+does not support other encodings than UTF-8 nor skipping invalid rows) are
+handled by reading data with pandas.
+"""
+import inspect
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Types used when compact is False (same as pandas.read_csv)
+LIMONERO_TO_ARROW_TYPES = {
+    'CHARACTER': pa.string(),
+    'DATE': pa.string(),
+    'DATETIME': pa.string(),
+    'DECIMAL': pa.float64(),
+    'DOUBLE': pa.float64(),
+    'FLOAT': pa.float64(),
+    'INTEGER': pa.int64(),
+    'LONG': pa.int64(),
+    'TEXT': pa.string(),
+}
+# Limonero's integer and float are 32 bits types
+COMPACT_TYPES = {
+    'FLOAT': pa.float32(),
+    'INTEGER': pa.int32(),
+}
+# Dates are parsed by pandas (it supports more formats)
+DATE_TYPES = ('DATE', 'DATETIME')
+STRING_TYPES = ('CHARACTER', 'TEXT')
+
+# Integer columns may have missing values
+NULLABLE_TYPES = {
+    pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+}
+
+MB = 1024 * 1024
+
+# Features of newer pyarrow versions
+HAS_ENCODING = hasattr(pa_csv.ReadOptions(), 'encoding')
+HAS_INVALID_ROW_HANDLER = hasattr(pa_csv.ParseOptions(),
+                                  'invalid_row_handler')
+HAS_STREAMING = hasattr(pa_csv, 'open_csv')
+
+# Used by pandas to read CSV in batches (it does not support size in bytes)
+ROWS_PER_MB = 10000
+
+
+def _get_column_types(attributes, compact, categorical):
+    result = {}
+    for name, data_type in attributes.items():
+        if categorical and data_type in STRING_TYPES:
+            result[name] = pa.dictionary(pa.int32(), pa.string())
+        elif compact and data_type in COMPACT_TYPES:
+            result[name] = COMPACT_TYPES[data_type]
+        else:
+            result[name] = LIMONERO_TO_ARROW_TYPES.get(data_type, pa.string())
+    return result
+
+
+def _convert_dates(df, attributes):
+    for name, data_type in attributes.items():
+        if data_type in DATE_TYPES and name in df.columns:
+            try:
+                df[name] = pd.to_datetime(df[name])
+            except (TypeError, ValueError):
+                pass
+    return df
+
+
+def _to_pandas(data, attributes):
+    """ Converts an Arrow table (or batch) to pandas """
+    if attributes:
+        return _convert_dates(data.to_pandas(types_mapper=NULLABLE_TYPES.get),
+                              attributes)
+    return data.to_pandas()
+
+
+def _use_pandas(encoding, fail_fast):
+    """ Options not supported by the installed pyarrow """
+    utf8 = (encoding or 'utf8').lower().replace('-', '') == 'utf8'
+    return (not utf8 and not HAS_ENCODING) or (
+        not fail_fast and not HAS_INVALID_ROW_HANDLER)
+
+
+def _pandas_dtype(arrow_type):
+    if pa.types.is_dictionary(arrow_type):
+        return 'category'
+    return NULLABLE_TYPES.get(arrow_type) or arrow_type.to_pandas_dtype()
+
+
+def _iter_csv_pandas(source, sep, quote, header, encoding, null_values,
+                     attributes, columns, fail_fast, compact, categorical,
+                     chunk_size_mb):
+    """
+    Reads a CSV file with pandas, with the same result of Arrow reader.
+    Batches have about ROWS_PER_MB * chunk_size_mb rows.
+    """
+    options = {'sep': sep, 'quotechar': quote or '"', 'encoding': encoding,
+               'header': 0 if header else None, 'na_values': null_values}
+    if 'on_bad_lines' in inspect.signature(pd.read_csv).parameters:
+        options['on_bad_lines'] = 'error' if fail_fast else 'skip'
+    else:
+        options['error_bad_lines'] = fail_fast
+    if attributes:
+        if not header:
+            options['names'] = list(attributes.keys())
+        options['dtype'] = {
+            name: _pandas_dtype(arrow_type) for name, arrow_type in
+            _get_column_types(attributes, compact, categorical).items()
+            if not columns or name in columns}
+    if columns:
+        if not header and not attributes:
+            # Columns are named col_N (see _set_column_names)
+            options['usecols'] = [int(col[4:]) for col in columns]
+        else:
+            options['usecols'] = list(columns)
+    if chunk_size_mb:
+        options['chunksize'] = max(1, int(chunk_size_mb * ROWS_PER_MB))
+        frames = pd.read_csv(source, **options)
+    else:
+        frames = [pd.read_csv(source, **options)]
+
+    for df in frames:
+        if not header and not attributes:
+            df.columns = ['col_{}'.format(col) for col in df.columns]
+        yield _convert_dates(df, attributes or {})
+
+
+def _csv_options(sep, quote, header, encoding, null_values, attributes,
+                 columns, fail_fast, compact, categorical, chunk_size_mb):
+    read_options = pa_csv.ReadOptions()
+    if HAS_ENCODING:
+        read_options.encoding = encoding or 'utf8'
+    if chunk_size_mb:
+        read_options.block_size = int(chunk_size_mb * MB)
+    if not header:
+        if attributes:
+            read_options.column_names = list(attributes.keys())
+        else:
+            read_options.autogenerate_column_names = True
+
+    parse_options = pa_csv.ParseOptions(delimiter=sep,
+                                        quote_char=quote or '"')
+    if not fail_fast:
+        parse_options.invalid_row_handler = lambda row: 'skip'
+
+    convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+    if null_values:
+        # Same behavior of pandas, informed values are added to the defaults
+        convert_options.null_values = list(
+            convert_options.null_values) + list(null_values)
+    if attributes:
+        convert_options.column_types = _get_column_types(
+            attributes, compact, categorical)
+    if columns:
+        if not header and not attributes:
+            # Columns are named col_N (see _set_column_names)
+            columns = ['f{}'.format(col[4:]) for col in columns]
+        convert_options.include_columns = list(columns)
+    return read_options, parse_options, convert_options
+
+
+def _set_column_names(df, header, attributes):
+    if not header and not attributes:
+        # Arrow generated names are f0, f1, ...
+        df.columns = ['col_{}'.format(col[1:]) for col in df.columns]
+    return df
+
+
+def iter_csv(source, sep=',', quote='"', header=True, encoding='utf-8',
+             null_values=None, attributes=None, columns=None, fail_fast=True,
+             compact=True, categorical=False, chunk_size_mb=16):
+    """
+    Reads a CSV file in batches (about chunk_size_mb of text each), returned
+    as pandas DataFrames. It can be used by operations able to process data
+    incrementally. Parameters are the same of read_csv.
+    """
+    if not HAS_STREAMING or _use_pandas(encoding, fail_fast):
+        for df in _iter_csv_pandas(source, sep, quote, header, encoding,
+                                   null_values, attributes, columns,
+                                   fail_fast, compact, categorical,
+                                   chunk_size_mb):
+            yield df
+        return
+    reader = pa_csv.open_csv(source, *_csv_options(
+        sep, quote, header, encoding, null_values, attributes, columns,
+        fail_fast, compact, categorical, chunk_size_mb))
+    for batch in reader:
+        yield _set_column_names(_to_pandas(batch, attributes), header,
+                                attributes)
+
+
+def read_csv(source, sep=',', quote='"', header=True, encoding='utf-8',
+             null_values=None, attributes=None, columns=None, fail_fast=True,
+             compact=True, categorical=False, chunk_size_mb=0):
+    """
+    Reads a CSV file as a pandas DataFrame.
+
+    :param source: path or file like object;
+    :param header: first line contains the names of the columns;
+    :param null_values: additional values considered missing;
+    :param attributes: dict with Limonero type of each attribute (schema).
+        If None, types are inferred;
+    :param columns: only these columns are read (projection);
+    :param fail_fast: fail when a row is invalid, otherwise it is ignored;
+    :param compact: use 32 bits numbers for Limonero INTEGER and FLOAT;
+    :param categorical: read CHARACTER and TEXT attributes as categories;
+    :param chunk_size_mb: if informed, data is read and converted in
+        batches, so a complete copy of data in Arrow format is not required.
+    """
+    if chunk_size_mb:
+        frames = list(iter_csv(source, sep, quote, header, encoding,
+                               null_values, attributes, columns, fail_fast,
+                               compact, categorical, chunk_size_mb))
+        if not frames:
+            return pd.DataFrame(columns=columns or list(attributes or []))
+        return pd.concat(frames, ignore_index=True)
+
+    if _use_pandas(encoding, fail_fast):
+        return next(_iter_csv_pandas(source, sep, quote, header, encoding,
+                                     null_values, attributes, columns,
+                                     fail_fast, compact, categorical, 0))
+
+    table = pa_csv.read_csv(source, *_csv_options(
+        sep, quote, header, encoding, null_values, attributes, columns,
+        fail_fast, compact, categorical, chunk_size_mb))
+    return _set_column_names(_to_pandas(table, attributes), header,
+                             attributes)
+
+
+def iter_parquet(source, columns=None):
+    """ Reads a Parquet file in batches (one for each row group) """
+    parquet_file = pq.ParquetFile(source)
+    for i in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(i, columns=columns).to_pandas()
+
+
+def read_parquet(source, columns=None, chunked=False):
+    """
+    Reads a Parquet file as a pandas DataFrame. Only the informed columns
+    are read. If chunked, data is converted by row group.
+    """
+    if chunked:
+        frames = list(iter_parquet(source, columns))
+        if frames:
+            return pd.concat(frames, ignore_index=True)
+    return pq.read_table(source, columns=columns).to_pandas()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel execution of model fitting and evaluation in the scikit-learn
+minion. Folds (cross validation) and estimators supporting n_jobs run in a
+joblib worker pool (loky processes, reused between calls). The number of
+cores used by each parallel call is limited by the minion configuration
+(juicer.scikit_learn.max_jobs), so a minion does not take all cores of the
+host.
+"""
+import os
+import threading
+
+import joblib
+
+_lock = threading.Lock()
+_max_jobs = None
+
+
+def configure(max_jobs=None):
+    """
+    Sets the maximum number of cores (jobs) used by parallel calls. If None
+    or 0, all cores are used. Called when the minion starts.
+    """
+    global _max_jobs
+    with _lock:
+        _max_jobs = int(max_jobs) if max_jobs else None
+
+
+def get_max_jobs():
+    cores = os.cpu_count() or 1
+    if _max_jobs is None:
+        return cores
+    return max(1, min(_max_jobs, cores))
+
+
+def get_n_jobs(n_jobs=None):
+    """
+    Returns the number of jobs for a parallel call, limited by the minion
+    configuration. None (or 0) means all available jobs and negative values
+    follow the joblib convention (-1 is all cores, -2 all but one, etc).
+    """
+    max_jobs = get_max_jobs()
+    if not n_jobs:
+        return max_jobs
+    n_jobs = int(n_jobs)
+    if n_jobs < 0:
+        n_jobs = max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return min(n_jobs, max_jobs)
+
+
+def parallel_context(n_jobs=None):
+    """
+    Context where scikit-learn estimators and functions with n_jobs=None
+    use get_n_jobs(n_jobs) jobs of the loky backend
+    (joblib.parallel_backend, available in the pinned joblib 0.13).
+    """
+    return joblib.parallel_backend('loky', n_jobs=get_n_jobs(n_jobs))
+
+
+def shutdown():
+    """ Stops the worker processes of the pool (minion termination) """
+    try:
+        # get_reusable_executor() would start a pool if none exists
+        from joblib.externals.loky import reusable_executor
+        executor = reusable_executor._executor
+        if executor is not None:
+            executor.shutdown(wait=False)
+    except Exception:
+        pass
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Text processing for the scikit-learn platform (tokenization, stop words
+removal and n-grams). Token columns contain one list of tokens by row, but
+operations work on all tokens of a column at once: tokens are flattened in
+a single array, together with the row (parent) of each token, processed by
+vectorized (numpy/pandas) operations, and lists are built again from the
+parents. Only numpy and pandas (versions in requirements.txt) are used.
+"""
+import itertools
+import re
+
+import numpy as np
+import pandas as pd
+
+# Used by simple tokenizer: words, numbers, contractions, hashtags and
+# mentions are kept, punctuation and spaces separate tokens.
+SIMPLE_SEPARATOR = r"[^\w'#@]+"
+
+
+def _to_pandas(series):
+    # modin series are converted to pandas
+    if hasattr(series, '_to_pandas'):
+        return series._to_pandas()
+    return series
+
+
+def _flatten(series):
+    """
+    Returns the tokens of all rows (object array), the row (parent) of each
+    token and a mask of missing rows.
+    """
+    rows = series.to_numpy()
+    nulls = np.array([not isinstance(row, (list, tuple, np.ndarray))
+                      for row in rows], dtype=bool)
+    lengths = np.array([0 if null else len(row)
+                        for row, null in zip(rows, nulls)], dtype=np.int64)
+    values = np.empty(lengths.sum(), dtype=object)
+    values[:] = list(itertools.chain.from_iterable(rows[~nulls]))
+    parents = np.repeat(np.arange(len(rows)), lengths)
+    return values, parents, nulls
+
+
+def _build_lists(values, parents, nulls, series):
+    """
+    Builds a series of lists from values and the row (parent) of each value
+    """
+    counts = np.bincount(parents, minlength=len(nulls))
+    lists = [part.tolist()
+             for part in np.split(values, np.cumsum(counts)[:-1])]
+    # np.split returns one (empty) part if there are no rows
+    lists = lists[:len(nulls)]
+    for i in np.flatnonzero(nulls):
+        lists[i] = None
+    return pd.Series(lists, index=series.index, name=series.name,
+                     dtype=object)
+
+
+def _filter_tokens(values, parents, nulls, series, keep):
+    """ Keeps the tokens for which keep (boolean array) is True """
+    keep = np.asarray(keep, dtype=bool)
+    return _build_lists(values[keep], parents[keep], nulls, series)
+
+
+def tokenize(series, pattern=None, min_token_length=1):
+    """
+    Splits texts in tokens.
+
+    :param series: text column;
+    :param pattern: regular expression matching separators of tokens. If
+        None, a simple tokenizer is used (see SIMPLE_SEPARATOR);
+    :param min_token_length: shorter tokens are discarded.
+    :return: a series of token lists.
+    """
+    series = _to_pandas(series)
+    regex = re.compile(pattern or SIMPLE_SEPARATOR)
+    min_token_length = max(int(min_token_length or 1), 1)
+
+    # Regular expression is compiled once for all texts
+    tokens = pd.Series([regex.split(text) if isinstance(text, str) else None
+                        for text in series.to_numpy()], dtype=object)
+    values, parents, nulls = _flatten(tokens)
+    lengths = pd.Series(values, dtype=object).str.len().to_numpy()
+    return _filter_tokens(values, parents, nulls, series,
+                          lengths >= min_token_length)
+
+
+def remove_stop_words(series, stop_words, case_sensitive=False):
+    """
+    Removes stop words from token lists. Tokens are looked up in a hash set
+    (pandas isin).
+    """
+    series = _to_pandas(series)
+    stop_words = set(w for w in stop_words if w)
+    values, parents, nulls = _flatten(series)
+    tokens = pd.Series(values, dtype=object)
+    if not case_sensitive:
+        stop_words = set(w.lower() for w in stop_words)
+        tokens = tokens.str.lower()
+    return _filter_tokens(values, parents, nulls, series,
+                          ~tokens.isin(stop_words).to_numpy())
+
+
+def generate_ngrams(series, n):
+    """
+    Generates n-grams (tokens joined by a space) from token lists. Lists
+    with less than n tokens produce no n-gram.
+    """
+    series = _to_pandas(series)
+    n = int(n)
+    values, parents, nulls = _flatten(series)
+    size = len(values) - n + 1
+    if n < 1 or size <= 0:
+        return _build_lists(values[:0], parents[:0], nulls, series)
+
+    # The n-gram starting at position i is valid if its last token belongs
+    # to the same row
+    valid = parents[:size] == parents[n - 1:]
+    grams = values[:size]
+    for i in range(1, n):
+        grams = grams + ' ' + values[i:i + size]
+    return _build_lists(grams[valid], parents[:size][valid], nulls, series)
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Vector column for pandas data frames (scikit-learn platform).
+
+Operations producing features (scalers, PCA, one hot encoding, assembler)
+store their output as a VectorArray, a pandas ExtensionArray backed by a
+single 2-D numpy array or by a scipy sparse (CSR) matrix, instead of one
+Python list per row. Operations consuming features use the matrix directly
+(see get_X_train_data in the operation template), without conversions.
+Each element (row) is exposed as a 1-D numpy array.
+"""
+import numbers
+
+import numpy as np
+import pyarrow as pa
+import scipy.sparse
+from pandas.api.extensions import (ExtensionArray, ExtensionDtype,
+                                   register_extension_dtype)
+from pandas.api.indexers import check_array_indexer
+
+
+@register_extension_dtype
+class VectorDtype(ExtensionDtype):
+    name = 'vector'
+    type = np.ndarray
+    kind = 'O'
+    na_value = np.nan
+
+    @classmethod
+    def construct_array_type(cls):
+        return VectorArray
+
+    def __from_arrow__(self, array):
+        """ Converts an Arrow fixed size list array (see __arrow_array__) """
+        if isinstance(array, pa.ChunkedArray):
+            chunks = array.chunks
+        else:
+            chunks = [array]
+        return VectorArray._concat_same_type(
+            [VectorArray._from_arrow_chunk(chunk) for chunk in chunks])
+
+
+class VectorArray(ExtensionArray):
+    def __init__(self, values, mask=None, copy=False):
+        """
+        :param values: a 2-D array (one vector by row) or a scipy sparse
+            matrix, stored in CSR format;
+        :param mask: optional boolean array, True for missing rows.
+        """
+        if isinstance(values, VectorArray):
+            if mask is None:
+                mask = values._mask
+            values = values._data
+        if scipy.sparse.issparse(values):
+            values = scipy.sparse.csr_matrix(values, copy=copy)
+        else:
+            values = np.array(values) if copy else np.asarray(values)
+            if values.dtype == object:
+                try:
+                    values = values.astype(np.float64)
+                except (TypeError, ValueError):
+                    pass
+            if values.ndim == 1:
+                values = values.reshape(-1, 1)
+            elif values.ndim != 2:
+                raise ValueError(_('Vector data must have 2 dimensions.'))
+        if mask is None:
+            mask = np.zeros(values.shape[0], dtype=bool)
+        else:
+            mask = np.array(mask, dtype=bool) if copy else np.asarray(
+                mask, dtype=bool)
+        if mask.shape != (values.shape[0],):
+            raise ValueError(_('Invalid mask for vector data.'))
+        self._data = values
+        self._mask = mask
+
+    # Vector specific interface
+    @property
+    def is_sparse(self):
+        return scipy.sparse.issparse(self._data)
+
+    @property
+    def width(self):
+        return self._data.shape[1]
+
+    def to_matrix(self):
+        """ Returns the underlying 2-D array or CSR matrix (no copy) """
+        return self._data
+
+    # ExtensionArray interface
+    @classmethod
+    def _from_sequence(cls, scalars, dtype=None, copy=False):
+        if isinstance(scalars, VectorArray):
+            return cls(scalars, copy=copy)
+        scalars = list(scalars)
+        mask = np.array([not _is_vector(row) for row in scalars], dtype=bool)
+        rows = [row for row, missing in zip(scalars, mask) if not missing]
+        if any(scipy.sparse.issparse(row) for row in rows):
+            width = rows[0].shape[-1]
+            rows = [scipy.sparse.csr_matrix(row).reshape(1, -1)
+                    for row in rows]
+            data = scipy.sparse.lil_matrix((len(scalars), width))
+            if rows:
+                data[np.flatnonzero(~mask)] = scipy.sparse.vstack(rows)
+            return cls(data.tocsr(), mask)
+        width = len(rows[0]) if rows else 0
+        data = np.full((len(scalars), width), np.nan)
+        if rows:
+            try:
+                data[~mask] = np.vstack(rows)
+            except (TypeError, ValueError):
+                data = data.astype(object)
+                data[~mask] = np.vstack(rows)
+        return cls(data, mask)
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        return cls._from_sequence(values)
+
+    @classmethod
+    def _from_arrow_chunk(cls, chunk):
+        width = chunk.type.list_size
+        # Child values include slots of missing rows, but not the offset
+        # of the chunk (if it is a slice)
+        values = chunk.values.to_numpy(zero_copy_only=False)[
+            chunk.offset * width:(chunk.offset + len(chunk)) * width]
+        data = np.array(values, dtype=np.float64).reshape(-1, width)
+        mask = ~_validity(chunk)
+        data[mask] = np.nan
+        return cls(data, mask)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        to_concat = list(to_concat)
+        if not to_concat:
+            return cls(np.empty((0, 0)))
+        widths = set(arr.width for arr in to_concat if len(arr))
+        if len(widths) > 1:
+            raise ValueError(_('Vectors must have the same size.'))
+        mask = np.concatenate([arr._mask for arr in to_concat])
+        if any(arr.is_sparse for arr in to_concat):
+            return cls(scipy.sparse.vstack(
+                [arr._data for arr in to_concat], format='csr'), mask)
+        return cls(np.vstack([arr._data for arr in to_concat]), mask)
+
+    @property
+    def dtype(self):
+        return VectorDtype()
+
+    @property
+    def nbytes(self):
+        if self.is_sparse:
+            return (self._data.data.nbytes + self._data.indices.nbytes +
+                    self._data.indptr.nbytes + self._mask.nbytes)
+        return self._data.nbytes + self._mask.nbytes
+
+    def __len__(self):
+        return self._data.shape[0]
+
+    def __getitem__(self, item):
+        if isinstance(item, numbers.Integral):
+            if self._mask[item]:
+                return self.dtype.na_value
+            row = self._data[item]
+            if self.is_sparse:
+                return row.toarray().ravel()
+            return row
+        item = check_array_indexer(self, item)
+        return type(self)(self._data[item], self._mask[item])
+
+    def __setitem__(self, key, value):
+        key = check_array_indexer(self, key)
+        if not isinstance(value, VectorArray):
+            if not _is_vector(value) or not len(value) or not _is_vector(
+                    value[0]):
+                # A single vector (or missing value)
+                value = [value]
+            value = VectorArray._from_sequence(value)
+        data, mask = value._data, value._mask
+        if len(value) == 1:
+            data, mask = data[0], mask[0]
+        if self.is_sparse:
+            self._data = self._data.tolil()
+        self._data[key] = data
+        self._mask[key] = mask
+        if self.is_sparse:
+            self._data = self._data.tocsr()
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __array__(self, dtype=None, copy=None):
+        result = np.empty(len(self), dtype=object)
+        result[:] = list(self)
+        return result
+
+    def __eq__(self, other):
+        """ Compares (by row) with vectors of other array """
+        if not isinstance(other, VectorArray) or len(other) != len(self):
+            return NotImplemented
+        if self.width != other.width:
+            return np.zeros(len(self), dtype=bool)
+        if self.is_sparse or other.is_sparse:
+            diff = scipy.sparse.csr_matrix(self._data) != \
+                scipy.sparse.csr_matrix(other._data)
+            equal = np.asarray(diff.sum(axis=1)).ravel() == 0
+        else:
+            equal = (self._data == other._data).all(axis=1)
+        return equal & ~self._mask & ~other._mask
+
+    def isna(self):
+        return self._mask.copy()
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        indices = np.asarray(indices, dtype=np.intp)
+        if not allow_fill:
+            return type(self)(self._data[indices], self._mask[indices])
+
+        missing = indices == -1
+        if (indices < -1).any():
+            raise ValueError(_('Invalid value in indices.'))
+        if len(self) == 0:
+            if not missing.all():
+                raise IndexError(_('Cannot take from an empty array.'))
+            return type(self)(np.full((len(indices), 0), np.nan),
+                              np.ones(len(indices), dtype=bool))
+        safe = np.where(missing, 0, indices)
+        data = self._data[safe]
+        if missing.any() and not self.is_sparse:
+            if data.dtype.kind != 'f':
+                data = data.astype(object)
+            data[missing] = np.nan
+        return type(self)(data, self._mask[safe] | missing)
+
+    def copy(self):
+        return type(self)(self._data.copy(), self._mask.copy())
+
+    def __arrow_array__(self, type=None):
+        """ Vectors are written as Arrow fixed size lists (e.g. cache) """
+        data = self._data
+        if self.is_sparse:
+            data = data.toarray()
+        values = pa.array(data.ravel())
+        # Validity bitmap (LSB order), built from the mask
+        null_count = int(self._mask.sum())
+        bitmap = pa.py_buffer(np.packbits(
+            ~self._mask, bitorder='little')) if null_count else None
+        return pa.Array.from_buffers(
+            pa.list_(values.type, self.width), len(self), [bitmap],
+            null_count=null_count, children=[values])
+
+
+def _validity(array):
+    """ Boolean array, True for rows of an Arrow array that are not null """
+    bitmap = array.buffers()[0]
+    if bitmap is None or array.null_count == 0:
+        return np.ones(len(array), dtype=bool)
+    bits = np.unpackbits(np.frombuffer(bitmap, dtype=np.uint8),
+                         bitorder='little')
+    return bits[array.offset:array.offset + len(array)].astype(bool)
+
+
+def _is_vector(value):
+    return isinstance(value, (list, tuple, np.ndarray)) or \
+        scipy.sparse.issparse(value)
+
+
+def arrow_types_mapper(arrow_type):
+    """
+    Maps Arrow fixed size lists to VectorDtype (use with
+    Table.to_pandas(types_mapper=...)).
+    """
+    if pa.types.is_fixed_size_list(arrow_type) and \
+            pa.types.is_floating(arrow_type.value_type):
+        return VectorDtype()
+    return None
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Cache for models loaded by the scikit-learn minion (see
+juicer.util.model_cache). Models are read from storage into a single
+Arrow buffer (no intermediate BytesIO copy). Local copies (disk tier) are written with
+joblib and their numpy arrays are memory mapped when read, so large models
+are not deserialized again.
+Settings are read from juicer.scikit_learn.model_cache.
+"""
+import copy
+import glob
+import os
+import pickle
+import re
+import threading
+
+from juicer.util.model_cache import ModelCache
+
+# Used when the minion does not configure the cache
+DEFAULT_CONFIG = {'max_entries': 10, 'max_memory_mb': 1024}
+
+_lock = threading.Lock()
+_cache = None
+
+
+class SklearnModelCache(ModelCache):
+    def _disk_path(self, model_id, version):
+        return os.path.join(self.disk_dir, 'model_{}_{}.joblib'.format(
+            model_id, re.sub(r'[^\w.-]', '_', str(version))))
+
+    def _read_disk(self, model_id, version):
+        import joblib
+        path = self._disk_path(model_id, version)
+        if not os.path.exists(path):
+            return None
+        return joblib.load(path, mmap_mode='r')
+
+    def _write_disk(self, model_id, version, model):
+        import joblib
+        if not os.path.exists(self.disk_dir):
+            os.makedirs(self.disk_dir)
+        path = self._disk_path(model_id, version)
+        # Renamed when complete, other minions may read the directory
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _delete_disk(self, model_id, keep_version):
+        keep = self._disk_path(model_id, keep_version)
+        pattern = os.path.join(self.disk_dir,
+                               'model_{}_*.joblib'.format(model_id))
+        for path in glob.glob(pattern):
+            if path != keep:
+                os.remove(path)
+
+
+def configure(config=None):
+    """ Creates the cache used by LoadModel. Called when the minion starts """
+    global _cache
+    settings = dict(DEFAULT_CONFIG)
+    settings.update(config or {})
+    with _lock:
+        _cache = SklearnModelCache.from_config(settings)
+    return _cache
+
+
+def get_model_cache():
+    with _lock:
+        cache = _cache
+    return configure() if cache is None else cache
+
+
+def load_model(model_id, path, fs):
+    """
+    Returns the model saved in path, using the model cache (a shallow copy
+    of the cached model).
+
+    :param model_id: model id (Limonero);
+    :param path: path of the model (pickle file) in fs;
+    :param fs: file system (pyarrow HDFS connection).
+    """
+    if not fs.exists(path):
+        raise ValueError(_('Model does not exist'))
+    info = fs.info(path)
+
+    def _load():
+        # Arrow files do not support readline(), required by pickle.load()
+        # for protocols < 4, so the file is read into a single buffer
+        with fs.open(path, 'rb') as f:
+            return pickle.loads(f.read_buffer())
+
+    model = get_model_cache().get(model_id, info.get('last_modified'),
+                                  _load, info.get('size', 0))
+    # Jobs get a shallow copy: parameters (e.g. set_params) are not shared,
+    # fitted data (arrays) is, and it is only read by predict/transform. A
+    # deep copy would cost as much as loading the model again.
+    return copy.copy(model)
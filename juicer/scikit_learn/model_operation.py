@@ -62,11 +62,13 @@ class ApplyModelOperation(Operation):
         code = dedent("""
             {out} = {in1}.copy()
             X_train = get_X_train_data({in1}, {features})
+            if 'IsotonicRegression' in str({in2}):
+                X_train = np.ravel(X_train)
             if hasattr({in2}, 'predict'):
-                {out}['{new_attr}'] = {in2}.predict(X_train).tolist()
+                {out}['{new_attr}'] = {in2}.predict(X_train)
             else:
                 # to handle scaler operations
-                {out}['{new_attr}'] = {in2}.transform(X_train).tolist()
+                {out}['{new_attr}'] = VectorArray({in2}.transform(X_train))
             """.format(out=self.output, in1=self.named_inputs['input data'],
                        in2=self.model, new_attr=self.prediction,
                        features=self.features))
@@ -88,6 +90,10 @@ class LoadModel(Operation):
         if not self.model:
             msg = 'Missing parameter model'
             raise ValueError(msg)
+        try:
+            self.model_id = int(self.model)
+        except (TypeError, ValueError):
+            raise ValueError(_('Model not found'))
 
         self.has_code = any([len(named_outputs) > 0, self.contains_results()])
         self.output = named_outputs.get(
@@ -101,7 +107,11 @@ class LoadModel(Operation):
         url = limonero_config['url']
         token = str(limonero_config['auth_token'])
 
-        model_data = query_limonero(url, '/models', token, self.model)
+        # Model information may be already retrieved when loading workflow
+        model_data = self.parameters.get('workflow', {}).get(
+            'model_cache', {}).get(self.model_id)
+        if model_data is None:
+            model_data = query_limonero(url, '/models', token, self.model)
         url = model_data['storage']['url']
         if url[-1] != '/':
             url += '/'
@@ -115,23 +125,16 @@ class LoadModel(Operation):
             hostname = parsed.hostname
             port = parsed.port
 
+        # Deserialized models are cached by the minion (by id and version)
         code = """
-        path = '{path}'        
+        from juicer.scikit_learn.model_cache import load_model
         fs = pa.hdfs.connect('{hdfs_server}', {hdfs_port})
-        exists = fs.exists(path)
-        if not exists:
-            raise ValueError('{error_file_not_exists}')
-        
-        import pickle
-        from io import BytesIO
-        with fs.open(path, 'rb') as f:
-            b = BytesIO(f.read()) 
-            {model} = pickle.load(b)
+        {model} = load_model({model_id}, '{path}', fs)
         """.format(model=self.output,
+                   model_id=self.model_id,
                    path=path,
                    hdfs_server=hostname,
-                   hdfs_port=port,
-                   error_file_not_exists=_('Model does not exist'))
+                   hdfs_port=port)
         return dedent(code)
 
 
@@ -418,8 +421,8 @@ class EvaluateModelOperation(Operation):
                 label_col = '{label_attr}'
                 prediction_col = '{prediction_attr}'
                 {model_output} = None
-                y_pred = {input}[prediction_col].to_numpy().tolist()
-                y_true = {input}[label_col].to_numpy().tolist()
+                y_pred = {input}[prediction_col].to_numpy()
+                y_true = {input}[label_col].to_numpy()
                 # Code for evaluating if the Label attribute is categorical
                 from pandas.api.types import is_numeric_dtype
                 if not is_numeric_dtype({input}[label_col]):
@@ -627,13 +630,9 @@ class EvaluateModelOperation(Operation):
 
 
             if len(y_true) < 2000 and display_image:
-                residuals = [t - p for t, p in zip(y_true, y_pred)]
-                pandas_df = pd.DataFrame.from_records(
-                    [
-                        dict(prediction=x[0], residual=x[1])
-                            for x in zip(y_pred, residuals)
-                    ]
-                )
+                pandas_df = pd.DataFrame(
+                    {{'prediction': y_pred,
+                     'residual': np.subtract(y_true, y_pred)}})
 
                 report = SeabornChartReport()
                 emit_event(
@@ -789,7 +788,7 @@ class CrossValidationOperation(Operation):
             'evaluator', 'eval_{}'.format(self.order))
 
         self.has_import = \
-            "from sklearn.model_selection import cross_val_score, KFold\n"
+            "from sklearn.model_selection import cross_validate, KFold\n"
 
 
     @property
@@ -810,8 +809,12 @@ class CrossValidationOperation(Operation):
                   X_train = get_X_train_data({input_data}, {feature_attr})
                   y = get_label_data({input_data}, {label_attr})
 
-                  scores = cross_val_score({algorithm}, X_train.tolist(), 
-                                           y.tolist(), cv=kf, scoring='{metric}')
+                  # Folds are evaluated in parallel and the model fitted
+                  # for each fold is kept (models are not fitted again)
+                  cv_result = cross_validate(
+                      {algorithm}, X_train, y, cv=kf, scoring='{metric}',
+                      n_jobs=get_n_jobs(), return_estimator=True)
+                  scores = cv_result['test_score']
 
                   best_score = np.argmax(scores)
                   """.format(algorithm=self.algorithm_port,
@@ -831,13 +834,7 @@ class CrossValidationOperation(Operation):
         if self.has_models:
 
             code += dedent("""
-                    models = []
-                    for train_index, test_index in kf.split(X_train):
-                        Xf_train, Xf_test = X_train[train_index], X_train[test_index]
-                        yf_train, yf_test = y[train_index],  y[test_index]
-                        {algorithm}.fit(Xf_train.tolist(), yf_train.tolist())
-                        models.append({algorithm})
-                    
+                    models = list(cv_result['estimator'])
                     {best_model} = models[best_score]
                     """.format(algorithm=self.algorithm_port,
                                input_data=self.input_port,
@@ -855,10 +852,7 @@ class CrossValidationOperation(Operation):
         else:
             code += dedent("""
                     models = None
-                    train_index, test_index = list(kf.split(X_train))[best_score]
-                    Xf_train, Xf_test = X_train[train_index], X_train[test_index]
-                    yf_train, yf_test = y[train_index],  y[test_index]
-                    {best_model} = {algorithm}.fit(Xf_train.tolist(), yf_train.tolist())
+                    {best_model} = cv_result['estimator'][best_score]
                     """.format(algorithm=self.algorithm_port,
                                input_data=self.input_port,
                                evaluator=self.evaluator,
@@ -876,7 +870,7 @@ class CrossValidationOperation(Operation):
         code += dedent("""
                 metric_result = scores[best_score]
                 {output} = {input_data}.copy()
-                {output}['{prediction_attr}'] = {best_model}.predict(X_train.tolist())
+                {output}['{prediction_attr}'] = {best_model}.predict(X_train)
                 {models} = models
                 """.format(algorithm=self.algorithm_port,
                            input_data=self.input_port,
@@ -94,7 +94,7 @@ class RegressionModelOperation(Operation):
             if 'IsotonicRegression' in str(algorithm):
                 X_train = np.ravel(X_train)
             {model} = algorithm.fit(X_train, y)
-            {output_data}['{prediction}'] = algorithm.predict(X_train).tolist()
+            {output_data}['{prediction}'] = algorithm.predict(X_train)
             """.format(model=self.model, algorithm=self.algorithm,
                        input=self.named_inputs['train input data'],
                        output_data=self.output, prediction=self.prediction,
@@ -266,7 +266,7 @@ class GradientBoostingRegressorOperation(RegressionOperation):
                 validation_fraction={validation_fraction}, 
                 n_iter_no_change={n_iter_no_change}, tol={tol})
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """.format(output_data=self.output,
                        learning_rate=self.learning_rate,
                        n_estimators=self.n_estimators,
@@ -374,7 +374,7 @@ class HuberRegressorOperation(RegressionOperation):
                     alpha={alpha}, tol={tol}, fit_intercept={fit_intercept}, 
                     warm_start=False)
             {model}.fit(X_train, y)
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """).format(output_data=self.output,
                         epsilon=self.epsilon,
                         alpha=self.alpha,
@@ -476,10 +476,12 @@ class IsotonicRegressionOperation(RegressionOperation):
         {output_data} = {input_data}.copy()
         X_train = get_X_train_data({input_data}, {columns})
         y = get_label_data({input_data}, {label})
+        # Only univariate input (1-D array) is supported
+        X_train = np.ravel(X_train)
 
         {model}.fit(X_train, y)      
 
-        {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+        {output_data}['{prediction}'] = {model}.predict(X_train)
         """).format(output_data=self.output,
                     isotonic=self.isotonic,
                     output=self.output,
@@ -581,7 +583,7 @@ class LinearRegressionOperation(RegressionOperation):
                 normalize={normalize}, positive={positive}, 
                 fit_intercept={fit_intercept})  
         {model}.fit(X_train, y)
-        {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+        {output_data}['{prediction}'] = {model}.predict(X_train)
         """.format(output_data=self.output,
                    max_iter=self.max_iter,
                    alpha=self.alpha,
@@ -824,7 +826,7 @@ class MLPRegressorOperation(Operation):
 
             {model} = MLPRegressor({add_functions_required})
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """.format(output_data=self.output,
                        prediction=self.prediction,
                        columns=self.features,
@@ -988,7 +990,7 @@ class RandomForestRegressorOperation(RegressionOperation):
                     bootstrap={bootstrap},
                     oob_score={oob_score}, verbose={verbose}, warm_start=False)
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """).format(n_estimators=self.n_estimators,
                         max_features=self.max_features,
                         max_depth=self.max_depth,
@@ -1185,7 +1187,7 @@ class SGDRegressorOperation(RegressionOperation):
 
             {model} = SGDRegressor({add_functions_required})
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """).format(output_data=self.output,
                         prediction=self.prediction,
                         columns=self.features,
@@ -1275,7 +1277,7 @@ class GeneralizedLinearRegressionOperation(RegressionOperation):
                     fit_intercept={fit_intercept}, copy_X={copy_X}, 
                     n_jobs={n_jobs})
             {model}.fit(X_train, y)          
-            {output_data}['{prediction}'] = {model}.predict(X_train).tolist()
+            {output_data}['{prediction}'] = {model}.predict(X_train)
             """.format(fit_intercept=self.fit_intercept,
                        normalize=self.normalize,
                        copy_X=self.copy_X,
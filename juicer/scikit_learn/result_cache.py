@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Cache for results of tasks executed by the scikit-learn minion (see
+juicer.util.result_cache). Memory is measured for pandas (or modin) data
+frames kept in the process. Results are spilled as Arrow/Feather files to a
+local directory (vector columns are written as fixed size lists).
+Settings are read from juicer.scikit_learn.result_cache.
+"""
+import json
+import os
+import shutil
+
+from juicer.util.result_cache import ResultCache
+
+TASK_META_FILE = '_lemonade_task.json'
+
+
+class TaskResultCache(ResultCache):
+    def attach(self, workflow_id):
+        """ Loads the index of results spilled for the workflow """
+        with self._lock:
+            self.workflow_id = workflow_id
+            self.load_spill_index()
+
+    def _is_frame(self, value):
+        return hasattr(value, 'memory_usage') and hasattr(value, 'columns')
+
+    def _estimate_size(self, df):
+        return int(df.memory_usage(index=True, deep=True).sum())
+
+    def _write_spill(self, path, results, ports, meta):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        if not os.path.exists(path):
+            os.makedirs(path)
+        meta['modin'] = []
+        for i, port in enumerate(ports):
+            df = results[port]
+            # modin data frames are converted to pandas
+            if hasattr(df, '_to_pandas'):
+                df = df._to_pandas()
+                meta['modin'].append(port)
+            feather.write_feather(
+                pa.Table.from_pandas(df),
+                os.path.join(path, 'port_{}.feather'.format(i)))
+        # Metadata is written last, it marks the spill as complete
+        with open(os.path.join(path, TASK_META_FILE), 'w') as f:
+            json.dump(meta, f)
+
+    def _read_spill(self, path, meta):
+        import pyarrow.feather as feather
+        from juicer.scikit_learn.library.vector_array import \
+            arrow_types_mapper
+
+        result = {}
+        for i, port in enumerate(meta['ports']):
+            df = feather.read_table(
+                os.path.join(path, 'port_{}.feather'.format(i))).to_pandas(
+                types_mapper=arrow_types_mapper)
+            if port in meta.get('modin', []):
+                import modin.pandas as pd
+                df = pd.DataFrame(df)
+            result[port] = df
+        return result
+
+    def _read_spill_index(self):
+        result = []
+        workflow_dir = self._workflow_dir()
+        if not os.path.isdir(workflow_dir):
+            return result
+        for name in os.listdir(workflow_dir):
+            meta_file = os.path.join(workflow_dir, name, TASK_META_FILE)
+            # Incomplete spills do not have metadata
+            if os.path.exists(meta_file):
+                with open(meta_file) as f:
+                    result.append(json.load(f))
+        return result
+
+    def _delete_spill(self, path):
+        shutil.rmtree(path, ignore_errors=True)
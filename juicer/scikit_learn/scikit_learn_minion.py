@@ -3,11 +3,13 @@ import gc
 import gettext
 import imp
 import importlib
+import io
 import json
 import logging.config
 import multiprocessing
 import signal
 import sys
+import threading
 import time
 import traceback
 
@@ -25,7 +27,11 @@ from juicer.runner import configuration
 from juicer.runner import protocol as juicer_protocol
 
 from juicer.runner.minion_base import Minion
+from juicer.scikit_learn import model_cache
+from juicer.scikit_learn.library import parallel
+from juicer.scikit_learn.result_cache import TaskResultCache
 from juicer.scikit_learn.transpiler import ScikitLearnTranspiler
+from juicer.transpiler import GeneratedCodeCache
 from juicer.util import dataframe_util
 from juicer.workflow.workflow import Workflow
 
@@ -44,6 +50,8 @@ class ScikitLearnMinion(Minion):
     IDLENESS_TIMEOUT = 600
     TIMEOUT = 'timeout'
     MSG_PROCESSED = 'message_processed'
+    # Default memory limit (MB) for results of tasks kept by the minion
+    DEFAULT_CACHE_MEMORY_MB = 1024
 
     def __init__(self, redis_conn, workflow_id, app_id, config, lang='en'):
         """Initialize the minion."""
@@ -54,11 +62,14 @@ class ScikitLearnMinion(Minion):
         self.ping_process = None
         self.module = None
 
-        self._state = {}
         self.config = config
 
         self.transpiler = ScikitLearnTranspiler(config)
         configuration.set_config(self.config)
+        minion_config = config['juicer'].get('minion', {})
+        self.code_cache = GeneratedCodeCache(
+            minion_config.get('code_cache_size', 0),
+            minion_config.get('code_cache_ttl', 300))
 
         self.tmp_dir = self.config.get('config', {}).get('tmp_dir', '/tmp')
         sys.path.append(self.tmp_dir)
@@ -69,11 +80,29 @@ class ScikitLearnMinion(Minion):
             config['juicer']['servers']['redis_url'],
             'job_output')
 
-        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_jobs)
         self.job_future = None
+        # Protects code generation when jobs run concurrently
+        self._lock = threading.RLock()
+        # Generated modules being executed (they keep per run globals)
+        self._running_modules = set()
 
         self.scikit_learn_config = config['juicer'].get('scikit_learn', {})
 
+        # Results of tasks, used in incremental (partial) executions. Data
+        # is kept in this process, so memory is limited by default.
+        cache_config = {'max_memory_mb': self.DEFAULT_CACHE_MEMORY_MB}
+        cache_config.update(self.scikit_learn_config.get('result_cache', {}))
+        self._state = TaskResultCache.from_config(cache_config)
+        self._state.attach(self.workflow_id)
+
+        # Cores used by cross validation and estimators (joblib)
+        parallel.configure(self.scikit_learn_config.get('max_jobs'))
+
+        # Models loaded by LoadModel, shared by all jobs of the minion
+        model_cache.configure(self.scikit_learn_config.get('model_cache'))
+
         # self termination timeout
         self.active_messages = 0
         self.self_terminate = True
@@ -101,6 +130,16 @@ class ScikitLearnMinion(Minion):
                 tb = traceback.format_exception(*sys.exc_info())
                 log.exception(_('Unhandled error (%s) \n>%s'),
                               str(ee), '>\n'.join(tb))
+        self._shutdown()
+
+    def _shutdown(self):
+        """
+        Releases resources of the execute process, where results and worker
+        pools live, after termination is requested (see terminate).
+        """
+        # Results are kept for a new minion (if spill is enabled)
+        self._state.flush()
+        parallel.shutdown()
 
     def _process_message(self):
         self._process_message_nb()
@@ -155,11 +194,13 @@ class ScikitLearnMinion(Minion):
 
             app_configs = msg_info.get('app_configs', {})
 
-            if self.job_future:
+            # In sequential mode, jobs wait for the previous one. Otherwise,
+            # the executor limits the number of concurrent jobs.
+            if self.max_concurrent_jobs == 1 and self.job_future:
                 self.job_future.result()
 
-            self.job_future = self._execute_future(job_id, workflow,
-                                                   app_configs)
+            self.job_future = self._track_job_future(
+                job_id, self._execute_future(job_id, workflow, app_configs))
             log.info(_('Execute message finished'))
         elif msg_type == juicer_protocol.TERMINATE:
             job_id = msg_info.get('job_id', None)
@@ -190,8 +231,32 @@ class ScikitLearnMinion(Minion):
 
         result = True
         start = timer()
+        # Module reserved for this job (released when the job finishes)
+        running_module = None
         try:
-            loader = Workflow(workflow, self.config)
+            # Key must be computed before loading, because loading the
+            # workflow changes it.
+            code_key = None
+            cached_code = None
+            if self.code_cache.enabled:
+                code_key = GeneratedCodeCache.compute_key(
+                    workflow, self.transpiler.get_template_version(),
+                    self._state)
+                cached_code = self.code_cache.get(code_key)
+                # A module cannot be shared by jobs running concurrently, so
+                # it is checked and reserved in a single step. If it is in
+                # use, code is generated again.
+                with self._lock:
+                    if cached_code and cached_code[0] in self._running_modules:
+                        cached_code = None
+                    elif cached_code:
+                        running_module = cached_code[0]
+                        self._running_modules.add(running_module)
+
+            if cached_code is None:
+                loader = Workflow(workflow, self.config)
+            else:
+                loader = None
 
             # force the scikit-learn context creation
             self.get_or_create_scikit_learn_session(loader, app_configs, job_id)
@@ -209,17 +274,40 @@ class ScikitLearnMinion(Minion):
             generated_code_path = os.path.join(
                 self.tmp_dir, '{}.py'.format(module_name))
 
-            with codecs.open(generated_code_path, 'w', 'utf8') as out:
-                self.transpiler.transpile(
-                    loader.workflow, loader.graph, {}, out, job_id)
-
-            # Get rid of .pyc file if it exists
-            if os.path.isfile('{}c'.format(generated_code_path)):
-                os.remove('{}c'.format(generated_code_path))
-
-            # Launch the scikit_learn
-            self.module = importlib.import_module(module_name)
-            self.module = imp.reload(self.module)
+            if cached_code is not None:
+                log.info(_('Reusing generated code (workflow unchanged, '
+                           'hits=%s, misses=%s)'), self.code_cache.hits,
+                         self.code_cache.misses)
+                module, gen_source_code = cached_code
+                self.transpiler.save_source_code(job_id, gen_source_code)
+            else:
+                # Formatting generated code is expensive and useless for
+                # interactive runs, so it can be restricted or disabled.
+                params = {'code_format': self.scikit_learn_config.get(
+                    'code_format')}
+                out = io.StringIO()
+                with self._lock:
+                    self.transpiler.transpile(
+                        loader.workflow, loader.graph, params, out, job_id,
+                        self._state)
+                gen_source_code = out.getvalue()
+                with codecs.open(generated_code_path, 'w', 'utf8') as f:
+                    f.write(gen_source_code)
+
+                # Get rid of .pyc file if it exists
+                if os.path.isfile('{}c'.format(generated_code_path)):
+                    os.remove('{}c'.format(generated_code_path))
+
+                # Launch the scikit_learn
+                with self._lock:
+                    module = importlib.import_module(module_name)
+                    module = imp.reload(module)
+                    running_module = module
+                    self._running_modules.add(running_module)
+                if code_key:
+                    self.code_cache.put(code_key, module,
+                                        gen_source_code, job_id)
+            self.module = module
             if log.isEnabledFor(logging.DEBUG):
                 log.debug('Objects in memory after loading module: %s',
                           len(gc.get_objects()))
@@ -229,7 +317,7 @@ class ScikitLearnMinion(Minion):
             # current state (if any). We pass the current state to the execution
             # to avoid re-computing the same tasks over and over again, in case
             # of several partial workflow executions.
-            new_state = self.module.main(
+            new_state = module.main(
                 self.get_or_create_scikit_learn_session(loader,
                                                         app_configs,
                                                         job_id),
@@ -245,7 +333,7 @@ class ScikitLearnMinion(Minion):
 
             # We update the state incrementally, i.e., new task results can be
             # overwritten but never lost.
-            # self._state.update(new_state)
+            self._state.update(new_state)
 
         except UnicodeEncodeError as ude:
             message = self.MNN006[1].format(ude)
@@ -300,6 +388,10 @@ class ScikitLearnMinion(Minion):
                 status='ERROR', identifier=job_id)
             self._generate_output(str(ee), 'ERROR', code=1000)
             result = False
+        finally:
+            if running_module is not None:
+                with self._lock:
+                    self._running_modules.discard(running_module)
 
         self.message_processed('execute')
 
@@ -318,10 +410,16 @@ class ScikitLearnMinion(Minion):
     def _read_dataframe_data(self, task_id, output, port):
         success = True
         data = []
+        task_state = self._state[task_id]
+        if isinstance(task_state, (list, tuple)):
+            # Current format: [results (by port), task hash]
+            task_state = dict(
+                (name, {'output': value, 'sample': None})
+                for name, value in task_state[0].items())
         # Last position in state is the execution time, so it should be ignored
-        if port in self._state[task_id]:
-            df = self._state[task_id][port]['output']
-            partial_result = self._state[task_id][port]['sample']
+        if port in task_state:
+            df = task_state[port]['output']
+            partial_result = task_state[port]['sample']
 
             # In this case we already have partial data collected for the
             # particular task
@@ -340,7 +438,7 @@ class ScikitLearnMinion(Minion):
                 # FIXME define as a parameter?:
                 status_data = {'status': 'SUCCESS', 'code': self.MNN002[0],
                                'message': self.MNN002[1], 'output': output}
-                data = df.rdd.map(dataframe_util.convert_to_csv).take(100)
+                data = dataframe_util.get_csv_sample(df, 100)
 
             # In this case, do not make sense to request data for this
             # particular task output port
@@ -356,11 +454,15 @@ class ScikitLearnMinion(Minion):
 
         return success, status_data, data
 
-    # noinspection PyUnusedLocal
     def cancel_job(self, job_id):
-        if self.job_future:
-            while True:
-                pass
+        """
+        Cancels a job waiting for execution. Python code cannot be
+        interrupted, so a running job completes.
+        """
+        future = self.job_futures.get(str(job_id))
+        if future and not future.cancel():
+            log.warn(_('Job %s is running and cannot be interrupted.'),
+                     job_id)
 
         message = self.MNN007[1].format(self.app_id)
         log.info(message)
@@ -406,6 +508,7 @@ class ScikitLearnMinion(Minion):
         #     self.spark_session.sparkContext.stop()
         #     self.spark_session = None
 
+        # The execute process flushes results when it reads the message
         log.info('Post terminate message in queue')
         self.terminate_proc_queue.put({'terminate': True})
 
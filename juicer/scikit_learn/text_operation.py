@@ -38,7 +38,8 @@ class TokenizerOperation(Operation):
 
             self.expression_param = parameters.get(self.EXPRESSION_PARAM, '\s+')
 
-            self.min_token_lenght = parameters.get(self.MINIMUM_SIZE, 3)
+            self.min_token_lenght = int(
+                parameters.get(self.MINIMUM_SIZE, 3) or 0)
             if self.ATTRIBUTES_PARAM in parameters:
                 self.attributes = parameters.get(self.ATTRIBUTES_PARAM)
             else:
@@ -62,46 +63,25 @@ class TokenizerOperation(Operation):
             self.output = self.named_outputs.get(
                     'output data', 'output_data_{}'.format(self.order))
 
-            if self.type == self.TYPE_SIMPLE:
-                self.has_import = "from nltk.tokenize import TweetTokenizer\n"
-            else:
-                self.has_import = "from nltk.tokenize import regexp_tokenize\n"
+            self.has_import = \
+                "from juicer.scikit_learn.library.text import tokenize\n"
 
     def generate_code(self):
         """Generate code."""
-
-        if self.min_token_lenght is not None:
-            self.min_token_lenght = \
-                ' if len(word) >= {}'.format(self.min_token_lenght)
-
+        # Simple type uses the default (words) tokenizer, regex type uses
+        # the expression as separator of tokens.
         if self.type == self.TYPE_SIMPLE:
-            code = """
-            {output} = {input}.copy()
-            result = []
-            toktok = TweetTokenizer()
-    
-            for row in {output}['{att}'].to_numpy():
-                result.append([word 
-                for word in toktok.tokenize(row){limit}])
-            {output}['{alias}'] = result
-            """.format(output=self.output,
-                       input=self.named_inputs['input data'],
-                       att=self.attributes[0], alias=self.alias[0],
-                       limit=self.min_token_lenght)
+            pattern = None
         else:
-            code = """
-           {output} = {input}.copy()
-           result = []
-
-           for row in {output}['{att}'].to_numpy():
-               result.append([word for word in 
-                              regexp_tokenize(row, pattern='{exp}'){limit}])
-
-           {output}['{alias}'] = result
-           """.format(output=self.output,
-                      input=self.named_inputs['input data'],
-                      att=self.attributes[0], alias=self.alias[0],
-                      exp=self.expression_param, limit=self.min_token_lenght)
+            pattern = self.expression_param
+        code = """
+        {output} = {input}.copy()
+        {output}['{alias}'] = tokenize(
+            {output}['{att}'], pattern={pattern}, min_token_length={limit})
+        """.format(output=self.output,
+                   input=self.named_inputs['input data'],
+                   att=self.attributes[0], alias=self.alias[0],
+                   pattern=repr(pattern), limit=self.min_token_lenght)
 
         return dedent(code)
 
@@ -157,7 +137,9 @@ class RemoveStopWordsOperation(Operation):
 
             self.has_import = "import nltk\n" \
                               "nltk.download('stopwords')\n" \
-                              "from nltk.corpus import stopwords\n"
+                              "from nltk.corpus import stopwords\n" \
+                              "from juicer.scikit_learn.library.text " \
+                              "import remove_stop_words\n"
 
     def generate_code(self):
         """Generate code."""
@@ -179,33 +161,11 @@ class RemoveStopWordsOperation(Operation):
         stop_words += {stop_word_list}
         """.format(stop_word_list=self.stop_word_list)
 
-        if self.sw_case_sensitive == "1":
-            code += """
-        word_tokens = {OUT}['{att}'].to_numpy()       
-        result = []
-        case_sensitive = True
-        for row in word_tokens:
-            result.append([w for w in row if not w in stop_words])
-        {OUT}['{alias}'] = result
-        """.format(att=self.attributes,
-                   att_stop=self.stop_word_attribute,
-                   alias=self.alias, case=self.sw_case_sensitive,
-                   OUT=self.output,
-                   stoplist=self.stop_word_list, sw=self.stopwords_input)
-        else:
-            code += """
-        stop_words = [w.lower() for w in stop_words]
-        word_tokens = {OUT}['{att}'].to_numpy()       
-        result = []
-        case_sensitive = False
-        for row in word_tokens:
-            result.append([w for w in row if not w.lower() in stop_words])
-        {OUT}['{alias}'] = result
-        """.format(att=self.attributes,
-                   att_stop=self.stop_word_attribute,
-                   alias=self.alias, case=self.sw_case_sensitive,
-                   OUT=self.output,
-                   stoplist=self.stop_word_list, sw=self.stopwords_input)
+        code += """
+        {OUT}['{alias}'] = remove_stop_words(
+            {OUT}['{att}'], stop_words, case_sensitive={case})
+        """.format(att=self.attributes, alias=self.alias,
+                   case=self.sw_case_sensitive == "1", OUT=self.output)
 
         return dedent(code)
 
@@ -248,18 +208,14 @@ class GenerateNGramsOperation(Operation):
             self.alias = parameters.get(
                         self.ALIAS_PARAM, '{}_ngram'.format(self.attributes))
 
-            self.has_import = "from nltk.util import ngrams\n"
+            self.has_import = "from juicer.scikit_learn.library.text " \
+                              "import generate_ngrams\n"
 
     def generate_code(self):
         input_data = self.named_inputs['input data']
         code = dedent("""
             {output} = {input}.copy()
-                    
-            grams = []
-            for row in {output}['{att}'].to_numpy():
-                grams.append([" ".join(gram) for gram in ngrams(row, {n})])
-                
-            {output}['{alias}'] = grams
+            {output}['{alias}'] = generate_ngrams({output}['{att}'], {n})
             """).format(att=self.attributes, alias=self.alias,
                         n=self.n, input=input_data, output=self.output)
 
@@ -367,7 +323,7 @@ class WordToVectorOperation(Operation):
                              min_df={min_df}, max_features={vocab_size})
                             
             {model}.fit(corpus)
-            {out}['{alias}'] = {model}.transform(corpus).toarray().tolist()
+            {out}['{alias}'] = VectorArray({model}.transform(corpus))
             {vocab} = {model}.get_feature_names()
             """.format(
                     input=input_data,
@@ -392,7 +348,7 @@ class WordToVectorOperation(Operation):
                              min_df={min_df}, max_features={vocab_size})
                             
             {model}.fit(corpus)
-            {out}['{alias}'] = {model}.transform(corpus).toarray().tolist()
+            {out}['{alias}'] = VectorArray({model}.transform(corpus))
             {vocab} = {model}.get_feature_names()
             """.format(
                     input=input_data,
@@ -418,7 +374,7 @@ class WordToVectorOperation(Operation):
                 
             {model}.fit(corpus)
             {out} = {input}.copy()
-            vector = {model}.transform(corpus).toarray().tolist()
+            vector = VectorArray({model}.transform(corpus))
             {out}['{alias}'] = vector
 
             # There is no vocabulary in this type of transformer
@@ -3,7 +3,7 @@
 import json
 import logging
 
-import requests
+from juicer.service import http_client
 
 log = logging.getLogger()
 log.setLevel(logging.DEBUG)
@@ -19,7 +19,7 @@ def _update_caipirinha(base_url, item_path, token, item_id, data):
 
     log.debug(_('Querying Caipirinha URL: %s'), url)
 
-    r = requests.post(url, headers=headers, data=data)
+    r = http_client.post(url, headers, data)
     if r.status_code == 200:
         return json.loads(r.text)
     else:
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Shared HTTP client for Lemonade services (Tahiti, Limonero, Stand and
+Caipirinha). All requests use a single pooled session (keep-alive) with
+retries and backoff. Read-mostly resources, such as operation definitions
+and data source descriptors, may be cached (TTL and ETag aware).
+
+Settings are read from the juicer.service_client section of the
+configuration file (see conf/juicer-config.yaml.template).
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from juicer.runner import configuration
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+log = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.3
+# Default time to live (seconds) of cached responses, by service
+DEFAULT_CACHE_TTL = {
+    'tahiti': 300,
+    'limonero': 30,
+    'stand': 30,
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_settings():
+    config = configuration.get_config() or {}
+    return config.get('juicer', {}).get('service_client', {}) or {}
+
+
+def get_session():
+    """ Returns the session shared by all service calls in this process """
+    global _session
+    with _session_lock:
+        if _session is None:
+            settings = _get_settings()
+            pool_size = settings.get('pool_size', DEFAULT_POOL_SIZE)
+            # Only idempotent methods are retried (urllib3 default). When
+            # retries are exhausted, the last response is returned (callers
+            # check the status code).
+            retry = Retry(
+                total=settings.get('retries', DEFAULT_RETRIES),
+                backoff_factor=settings.get('backoff_factor',
+                                            DEFAULT_BACKOFF_FACTOR),
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=pool_size,
+                                  pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+class CachedResponse(object):
+    """ Response served from cache (same interface used by services) """
+
+    def __init__(self, status_code, text, headers):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+
+
+class ResponseCache(object):
+    """ LRU cache for responses of read-mostly resources. Expired entries
+    having an ETag are revalidated using If-None-Match.
+    """
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """ Returns a tuple (response, fresh) or None if not cached. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            expires, response = entry
+            fresh = expires > time.time()
+            if fresh:
+                self.hits += 1
+            elif not response.headers.get('ETag'):
+                del self._entries[key]
+                self.misses += 1
+                return None
+            return response, fresh
+
+    def put(self, key, response, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def revalidated(self, key, ttl):
+        with self._lock:
+            self.revalidations += 1
+            self.hits += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (time.time() + ttl, entry[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.revalidations = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'revalidations': self.revalidations,
+                'size': len(self._entries)}
+
+
+response_cache = ResponseCache()
+
+
+def _get_cache_ttl(service):
+    ttl = _get_settings().get('cache_ttl', {})
+    if not isinstance(ttl, dict):
+        return ttl
+    return ttl.get(service, DEFAULT_CACHE_TTL.get(service, 0))
+
+
+def get(url, headers, service=None):
+    """
+    Executes a GET request. If a service is informed and it has a cache TTL
+    greater than zero, successful responses are cached.
+    """
+    ttl = _get_cache_ttl(service) if service else 0
+    if not ttl:
+        return get_session().get(url, headers=headers)
+
+    key = (url, headers.get('X-Auth-Token'))
+    cached = response_cache.get(key)
+    if cached is not None:
+        response, fresh = cached
+        if fresh:
+            return response
+        headers = dict(headers)
+        headers['If-None-Match'] = response.headers['ETag']
+
+    r = get_session().get(url, headers=headers)
+    if r.status_code == 304 and cached is not None:
+        response_cache.revalidated(key, ttl)
+        return cached[0]
+    if r.status_code == 200:
+        response_cache.put(key, CachedResponse(
+            r.status_code, r.text,
+            {'ETag': r.headers.get('ETag')} if r.headers.get('ETag') else {}),
+            ttl)
+        log.debug('Service cache (%s): %s', service, response_cache.stats())
+    return r
+
+
+def post(url, headers, data):
+    return get_session().post(url, headers=headers, data=data)
+
+
+def patch(url, headers, data):
+    return get_session().patch(url, data=data, headers=headers)
+
+
+def request(method, url, headers, data):
+    return get_session().request(method, url, data=data, headers=headers)
@@ -3,9 +3,10 @@
 import json
 import logging
 
-import requests
 from gettext import gettext
 
+from juicer.service import http_client
+
 log = logging.getLogger()
 log.setLevel(logging.DEBUG)
 
@@ -36,7 +37,7 @@ def query_limonero(base_url, item_path, token, item_id):
 
     # log.debug(gettext('Querying Limonero URL: %s'), url)
 
-    r = requests.get(url, headers=headers)
+    r = http_client.get(url, headers, 'limonero')
     if r.status_code == 200:
         return json.loads(r.text)
     else:
@@ -75,7 +76,7 @@ def register_model(base_url, payload, token):
         'content-type': "application/json",
         'cache-control': "no-cache"
     }
-    r = requests.request("POST", url, data=json.dumps(payload), headers=headers)
+    r = http_client.request("POST", url, headers, json.dumps(payload))
 
     if r.status_code == 200:
         return json.loads(r.text)
@@ -94,7 +95,7 @@ def register_datasource(base_url, payload, token, mode=''):
         'content-type': "application/json",
         'cache-control': "no-cache"
     }
-    r = requests.request("POST", url, data=json.dumps(payload), headers=headers)
+    r = http_client.request("POST", url, headers, json.dumps(payload))
 
     if r.status_code == 200:
         return json.loads(r.text)
@@ -111,7 +112,7 @@ def update_initialization_status(base_ur, payload, token):
         'content-type': "application/json",
         'cache-control': "no-cache"
     }
-    r = requests.request("POST", url, data=json.dumps(payload), headers=headers)
+    r = http_client.request("POST", url, headers, json.dumps(payload))
 
     if r.status_code == 200:
         return json.loads(r.text)
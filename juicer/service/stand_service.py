@@ -4,7 +4,7 @@
 import json
 import logging
 
-import requests
+from juicer.service import http_client
 
 log = logging.getLogger()
 log.setLevel(logging.DEBUG)
@@ -18,10 +18,9 @@ def save_job_source_code(base_url, token, job_id, source):
 
     url = '{}/jobs/{}/source-code'.format(base_url, job_id)
 
-    r = requests.patch(url,
-                       data=json.dumps({'secret': token, 'source': source},
-                                       sort_keys=True),
-                       headers=headers)
+    r = http_client.patch(url, headers,
+                          json.dumps({'secret': token, 'source': source},
+                                     sort_keys=True))
     if r.status_code == 200:
         return json.loads(r.text)
     else:
@@ -38,7 +37,7 @@ def get_cluster_info(base_url, token, cluster_id):
 
     url = '{}/clusters/{}'.format(base_url, cluster_id)
 
-    r = requests.get(url, headers=headers)
+    r = http_client.get(url, headers, 'stand')
     if r.status_code == 200:
         return json.loads(r.text)
     else:
@@ -4,7 +4,7 @@
 import json
 import logging
 
-import requests
+from juicer.service import http_client
 
 log = logging.getLogger()
 log.setLevel(logging.DEBUG)
@@ -24,7 +24,7 @@ def query_tahiti(base_url, item_path, token, item_id, qs=None):
         url += '?' + qs
     log.debug(_('Querying Tahiti URL: %s'), url)
 
-    r = requests.get(url, headers=headers)
+    r = http_client.get(url, headers, 'tahiti')
     if r.status_code == 200:
         return json.loads(r.text)
     else:
@@ -60,9 +60,23 @@ class DataReaderOperation(Operation):
         '{new_line \\r\\n}': '\r\n'
     }
 
+    CACHE_POLICY_AUTO = 'auto'
+    CACHE_POLICY_ALWAYS = 'always'
+    CACHE_POLICY_NEVER = 'never'
+    # Serialized data uses less memory (pyspark has no constant for it)
+    STORAGE_MEMORY_AND_DISK_SER = 'StorageLevel(True, True, False, False)'
+    STORAGE_DISK_ONLY = 'StorageLevel.DISK_ONLY'
+
     def __init__(self, parameters, named_inputs, named_outputs):
         Operation.__init__(self, parameters, named_inputs, named_outputs)
 
+        cache_config = parameters.get('configuration', {}).get(
+            'juicer', {}).get('transpiler', {}).get('data_reader_cache', {})
+        self.cache_policy = cache_config.get('policy',
+                                             self.CACHE_POLICY_AUTO)
+        # Larger data sources are cached only in disk
+        self.cache_max_memory_mb = cache_config.get('max_memory_mb', 1024)
+
         self.has_code = any(
             [len(self.named_outputs) > 0, self.contains_results()])
 
@@ -234,8 +248,6 @@ class DataReaderOperation(Operation):
                         '{url}')""".format(output=self.output,
                                            url=url))
                 code.append(code_json)
-                # FIXME: Evaluate if it is good idea to always use cache
-                code.append('{}.cache()'.format(self.output))
 
             elif self.metadata['format'] == 'LIB_SVM':
                 self._generate_code_for_lib_svm(code, infer_from_data)
@@ -247,9 +259,34 @@ class DataReaderOperation(Operation):
                 'privacy_restrictions', {}).get(self.data_source_id)
             code.extend(self._apply_privacy_constraints(restrictions))
 
-        code.append('{}.cache()'.format(self.output))
+        if self.has_code:
+            storage_level = self.get_cache_storage_level()
+            if storage_level:
+                code.append('{}.persist({})'.format(self.output,
+                                                    storage_level))
         return '\n'.join(code)
 
+    def get_cache_storage_level(self):
+        """
+        Returns the storage level used to cache data read, or None if data
+        must not be cached. With the auto policy, data is cached only if it
+        is used more than once: by more than one task (out degree), by a
+        task and for sample/schema, or in new jobs of the application (the
+        task was executed before, see execution_date). Data sources larger
+        than cache_max_memory_mb (estimated by Limonero) are cached in disk.
+        """
+        if self.cache_policy == self.CACHE_POLICY_NEVER:
+            return None
+        uses = self.out_degree + (1 if self.contains_results() else 0)
+        reused = self.parameters.get('execution_date') is not None
+        if self.cache_policy == self.CACHE_POLICY_AUTO and uses < 2 and \
+                not reused:
+            return None
+        size = self.metadata.get('estimated_size_in_mega_bytes') or 0
+        if size > self.cache_max_memory_mb:
+            return self.STORAGE_DISK_ONLY
+        return self.STORAGE_MEMORY_AND_DISK_SER
+
     def _generate_code_for_jdbc(self, code):
 
         parsed = urlparse(self.metadata['url'])
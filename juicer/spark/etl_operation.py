@@ -838,24 +838,44 @@ class CleanMissingOperation(Operation):
         partial = []
         attrs_json = json.dumps(self.attributes)
 
-        if any([self.min_missing_ratio, self.max_missing_ratio]):
+        use_ratio = any([self.min_missing_ratio, self.max_missing_ratio])
+
+        # Statistics computed by a single aggregation (one pass over data).
+        # Aliases are positional, because attribute names may clash.
+        stats_list = []
+        if use_ratio:
             self.min_missing_ratio = float(self.min_missing_ratio)
             self.max_missing_ratio = float(self.max_missing_ratio)
-
             # Based on http://stackoverflow.com/a/35674589/1646932
-            select_list = [
+            stats_list.extend([
                 ("\n    (functions.avg(functions.col('{0}').isNull()."
-                 "cast('int'))).alias('{0}')").format(attr)
-                for attr in self.attributes]
+                 "cast('int'))).alias('ratio_{1}')").format(attr, i)
+                for i, attr in enumerate(self.attributes)])
+        if self.cleaning_mode == self.MEAN:
+            stats_list.extend([
+                "\n    functions.avg(functions.col('{0}')).alias('mean_{1}')"
+                "".format(attr, i) for i, attr in enumerate(self.attributes)])
+        elif self.cleaning_mode == self.MEDIAN:
+            # See http://stackoverflow.com/a/31437177/1646932
+            # Relat. error=10% (accuracy=10). Null values are ignored by
+            # percentile_approx for each attribute (unlike approxQuantile
+            # for multiple columns in Spark 2.x, which drops rows with nulls)
+            stats_list.extend([
+                "\n    functions.expr('percentile_approx(`{0}`, 0.5, 10)')"
+                ".alias('median_{1}')".format(attr.replace('`', '``'), i)
+                for i, attr in enumerate(self.attributes)])
+
+        if stats_list:
             pre_code.extend([
-                "# Computes the ratio of missing values for each attribute",
-                "ratio_{0} = {0}.select({1}).collect()".format(
-                    input_data, ', '.join(select_list)), "",
-                "attributes_{0} = [c for c in {1} "
-                "\n                  if {2} <= ratio_{0}[0][c] <= {3}]".format(
-                    input_data, attrs_json, self.min_missing_ratio,
-                    self.max_missing_ratio)
-            ])
+                "# Computes statistics for all attributes in a single pass",
+                "stats_{0} = {0}.select({1}).collect()[0]".format(
+                    input_data, ', '.join(stats_list))])
+        if use_ratio:
+            pre_code.append(
+                "attributes_{0} = [c for i, c in enumerate({1})"
+                "\n    if {2} <= stats_{0}['ratio_{{}}'.format(i)] <= {3}]"
+                "".format(input_data, attrs_json, self.min_missing_ratio,
+                          self.max_missing_ratio))
         else:
             pre_code.append(
                 "attributes_{0} = {1}".format(input_data, attrs_json))
@@ -880,48 +900,52 @@ class CleanMissingOperation(Operation):
                     self.output, input_data))
 
         elif self.cleaning_mode == self.MODE:
-            # Based on http://stackoverflow.com/a/36695251/1646932
-            # But null values cause exception, so it needs to remove them
+            # Values of all attributes are stacked as (attribute, value) and
+            # counted by a single query. Values are compared as strings and
+            # cast back to the attribute type (it also handles Decimal).
             partial.append("""
-                import decimal
-                md_replace_{1} = dict()
-                for md_attr_{1} in attributes_{1}:
-                    md_count_{1} = {1}.na.drop(subset=[md_attr_{1}]).groupBy(
-                        md_attr_{1}).count().orderBy(
-                            functions.desc('count')).limit(1)
-                    # Spark does not support BigDecimal!
-                    if isinstance(md_count_{1}.collect()[0][0],
-                        decimal.Decimal):
-                        replacement = float(md_count_{1}.collect()[0][0])
-                    else:
-                        replacement = md_count_{1}.collect()[0][0]
-                    md_replace_{1}[md_attr_{1}] = replacement
-                {0} = {1}.fillna(value=md_replace_{1})""".format(
-                self.output, input_data)
+                md_values_{1} = {1}.select(functions.explode(functions.array(*[
+                    functions.struct(
+                        functions.lit(i).alias('attr'),
+                        {1}[c].cast('string').alias('value'))
+                    for i, c in enumerate(attributes_{1})])).alias('md')
+                ).select('md.*').na.drop(subset=['value'])
+                md_window_{1} = Window.partitionBy('attr').orderBy(
+                    functions.desc('count'))
+                md_rows_{1} = md_values_{1}.groupBy('attr', 'value').count()\\
+                    .withColumn('rank',
+                                functions.row_number().over(md_window_{1}))\\
+                    .filter(functions.col('rank') == 1).collect()
+                md_replace_{1} = dict([(attributes_{1}[r['attr']], r['value'])
+                                      for r in md_rows_{1}])
+                {0} = {1}.select([
+                    functions.coalesce({1}[c], functions.lit(
+                        md_replace_{1}[c]).cast({1}.schema[c].dataType)).alias(c)
+                    if c in md_replace_{1} else {1}[c]
+                    for c in {1}.columns])""".format(self.output, input_data)
             )
 
         elif self.cleaning_mode == self.MEDIAN:
-            # See http://stackoverflow.com/a/31437177/1646932
-            # But null values cause exception, so it needs to remove them
             partial.append("""
-                mdn_replace_{1} = dict()
-                for mdn_attr_{1} in attributes_{1}:
-                    # Computes median value for column with relat. error=10%
-                    mdn_{1} = {1}.na.drop(subset=[mdn_attr_{1}])\\
-                        .approxQuantile(str(mdn_attr_{1}), [.5], .1)
-                    mdn_replace_{1}[mdn_attr_{1}] = mdn_{1}[0]
-                {0} = {1}.fillna(value=mdn_replace_{1})""".format(
-                self.output, input_data))
+                # Medians are computed by the aggregation of statistics
+                mdn_replace_{1} = dict([
+                    (c, float(stats_{1}['median_{{}}'.format(i)]))
+                    for i, c in enumerate({2})
+                    if c in attributes_{1} and
+                    stats_{1}['median_{{}}'.format(i)] is not None])
+                {0} = {1}.na.fill(value=mdn_replace_{1})""".format(
+                self.output, input_data, attrs_json))
 
         elif self.cleaning_mode == self.MEAN:
             partial.append("""
-                avg_{1} = {1}.select([functions.avg(c).alias(c)
-                                        for c in attributes_{1}]).collect()
                 # Convert to float because Spark complains about Decimal
-                values_{1} = dict([(c, float(avg_{1}[0][c]))
-                    for c in attributes_{1}])
-                {0} = {1}.na.fill(value=values_{1})""".format(self.output,
-                                                              input_data))
+                values_{1} = dict([
+                    (c, float(stats_{1}['mean_{{}}'.format(i)]))
+                    for i, c in enumerate({2})
+                    if c in attributes_{1} and
+                    stats_{1}['mean_{{}}'.format(i)] is not None])
+                {0} = {1}.na.fill(value=values_{1})""".format(
+                self.output, input_data, attrs_json))
         else:
             raise ValueError(
                 _("Parameter '{}' has an incorrect value '{}' in {}").format(
@@ -150,9 +150,8 @@ class Expression(object):
         """
         """
         arguments = [self.parse(x, params) for x in spec['arguments']]
-        f = 'juicer_ext.ith_function_udf'
-        result = '{}({}, functions.lit({}))'.format(f, arguments[0],
-                                                    arguments[1])
+        f = 'juicer_ext.ith_function'
+        result = '{}({}, {})'.format(f, arguments[0], arguments[1])
         return result
 
     def get_strip_accents_function(self, spec, params):
@@ -167,7 +166,7 @@ class Expression(object):
         #     "if unicodedata.category(c) != 'Mn'), "
         #     "types.StringType())"
         # )
-        strip_accents = 'juicer_ext.strip_accents_udf'
+        strip_accents = 'juicer_ext.strip_accents'
 
         result = '{}({})'.format(strip_accents, arguments)
 
@@ -185,7 +184,7 @@ class Expression(object):
         #     "dict((ord(char), None) for char in string.punctuation)), "
         #     "types.StringType())"
         # )
-        strip_punctuation = 'juicer_ext.remove_punctuation_udf'
+        strip_punctuation = 'juicer_ext.remove_punctuation'
 
         result = '{}({})'.format(strip_punctuation, arguments)
 
@@ -252,7 +251,7 @@ class Expression(object):
         """
         """
         arguments = [self.parse(x, params) for x in spec['arguments']]
-        f = 'juicer_ext.translate_function_udf'
+        f = 'juicer_ext.translate_function'
         result = dedent('''{}(
                     {}, {}, {},
                     {})'''.format(f, arguments[0], arguments[1], arguments[2],
@@ -14,6 +14,7 @@ try:
     from pyspark.ml.param.shared import Param, HasOutputCol, HasFeaturesCol, \
         HasPredictionCol, Params, TypeConverters
     from pyspark.sql import functions, types
+    from pyspark.sql.window import Window
 except ImportError:
     pass
 
@@ -64,6 +65,168 @@ def translate_function_udf(v, missing='null', _type='string', pairs=None):
     return functions.udf(translate, t())(v)
 
 
+# Functions used by expressions, implemented by Spark SQL built-in functions
+# (executed in the JVM) or, when there is no equivalent, by vectorized pandas
+# UDFs. Row-at-a-time UDFs (above) are only used if the Spark version does not
+# support them.
+TRANSLATE_TYPES = {
+    'float': 'float',
+    'int': 'int',
+    'long': 'bigint',
+    'timestamp': 'timestamp',
+    'string': 'string',
+}
+_strip_accents_pandas_udf = None
+
+
+def remove_punctuation(text):
+    # \p{Punct} is the same set of chars of Python's string.punctuation
+    return functions.regexp_replace(text, r'\p{Punct}', '')
+
+
+def _get_strip_accents_pandas_udf():
+    global _strip_accents_pandas_udf
+    if _strip_accents_pandas_udf is None:
+        def strip_accents_series(values):
+            normalized = values.str.normalize('NFD')
+            # Non-spacing marks (accents) found in the batch
+            marks = dict((ord(c), None) for c in set(
+                ''.join(normalized.dropna())) if
+                unicodedata.category(c) == 'Mn')
+            return normalized.str.translate(marks)
+
+        _strip_accents_pandas_udf = functions.pandas_udf(
+            strip_accents_series, types.StringType())
+    return _strip_accents_pandas_udf
+
+
+def strip_accents(text):
+    # Spark SQL does not have a function for Unicode normalization
+    try:
+        return _get_strip_accents_pandas_udf()(text)
+    except (AttributeError, ImportError):
+        # Spark < 2.3 or pyarrow not available
+        return strip_accents_udf(text)
+
+
+def ith_function(v, i):
+    try:
+        from pyspark.ml.functions import vector_to_array
+    except ImportError:
+        # Spark < 3.0
+        return ith_function_udf(v, functions.lit(i))
+    return vector_to_array(v).getItem(i).cast('float')
+
+
+def translate_function(v, missing='null', _type='string', pairs=None):
+    if _type not in TRANSLATE_TYPES:
+        raise ValueError('Invalid type: {}'.format(_type))
+    if not pairs or not pairs[0]:
+        lookup = functions.lit(None)
+    else:
+        mapping = functions.create_map(*[
+            functions.lit(value) for pair in pairs for value in pair])
+        lookup = mapping[v]
+    if missing != 'null':
+        lookup = functions.coalesce(lookup, v)
+    return lookup.cast(TRANSLATE_TYPES[_type])
+
+
+def _get_point_in_polygon_udf():
+    def point_in_polygon(lat, lng, polygon_id, polygon):
+        import numpy as np
+        import pandas as pd
+        from matplotlib.path import Path
+
+        result = np.zeros(len(lat), dtype=bool)
+        frame = pd.DataFrame({'lat': lat.values, 'lng': lng.values,
+                              'id': polygon_id.values})
+        # Points of a batch are tested together, by polygon
+        for _, group in frame.dropna(subset=['id']).groupby('id'):
+            path = Path(np.array(
+                [list(p) for p in polygon.iloc[group.index[0]]], dtype=float))
+            # Polygon points are (longitude, latitude)
+            result[group.index] = path.contains_points(
+                group[['lng', 'lat']].values)
+        return pd.Series(result)
+
+    return functions.pandas_udf(point_in_polygon, types.BooleanType())
+
+
+def geo_within(df, geo_df, lat, lng, points_column, attributes, aliases,
+               grid_size=None):
+    """
+    Spatial join: adds the attributes of the first polygon (in geo_df) that
+    contains each point (lat, lng) of df. Attributes are null if no polygon
+    contains the point.
+    Points and polygons are partitioned by a grid (join by cell), candidate
+    pairs are filtered by the bounding box of polygons and the exact test is
+    performed by a vectorized (pandas) UDF. Points of polygons are
+    (longitude, latitude) pairs, as read by ReadShapefile. If grid_size (in
+    degrees) is not informed, the median size of polygons is used.
+    """
+    polygons = geo_df.select(
+        functions.monotonically_increasing_id().alias('_polygon_id'),
+        functions.col(points_column).alias('_polygon'),
+        *[functions.col(attr).alias(alias)
+          for attr, alias in zip(attributes, aliases)])
+    for name, func, index in [('_lat_min', 'array_min', 1),
+                              ('_lat_max', 'array_max', 1),
+                              ('_lng_min', 'array_min', 0),
+                              ('_lng_max', 'array_max', 0)]:
+        polygons = polygons.withColumn(name, functions.expr(
+            '{}(transform(_polygon, p -> p[{}]))'.format(func, index)))
+
+    if not grid_size:
+        grid_size = polygons.agg(functions.expr(
+            'percentile_approx(greatest(_lat_max - _lat_min, '
+            '_lng_max - _lng_min), 0.5)')).collect()[0][0]
+    grid_size = float(grid_size or 0) or 1.0
+
+    def cell(value):
+        return functions.floor(value / grid_size)
+
+    # A polygon is assigned to all cells covered by its bounding box
+    polygons = polygons.withColumn('_cell_lat', functions.explode(
+        functions.sequence(cell(functions.col('_lat_min')),
+                           cell(functions.col('_lat_max'))))).withColumn(
+        '_cell_lng', functions.explode(
+            functions.sequence(cell(functions.col('_lng_min')),
+                               cell(functions.col('_lng_max')))))
+
+    points = df.withColumn(
+        '_point_id', functions.monotonically_increasing_id()).withColumn(
+        '_p_lat', functions.col(lat).cast('double')).withColumn(
+        '_p_lng', functions.col(lng).cast('double'))
+    points = points.withColumn(
+        '_p_cell_lat', cell(functions.col('_p_lat'))).withColumn(
+        '_p_cell_lng', cell(functions.col('_p_lng')))
+
+    condition = ((functions.col('_p_cell_lat') == functions.col('_cell_lat')) &
+                 (functions.col('_p_cell_lng') == functions.col('_cell_lng')) &
+                 functions.col('_p_lat').between(functions.col('_lat_min'),
+                                                 functions.col('_lat_max')) &
+                 functions.col('_p_lng').between(functions.col('_lng_min'),
+                                                 functions.col('_lng_max')))
+    candidates = points.join(polygons, condition, 'left').withColumn(
+        '_inside', _get_point_in_polygon_udf()(
+            functions.col('_p_lat'), functions.col('_p_lng'),
+            functions.col('_polygon_id'), functions.col('_polygon')))
+
+    # Only the first polygon containing the point is kept
+    window = Window.partitionBy('_point_id').orderBy(
+        functions.desc('_inside'), '_polygon_id')
+    result = candidates.withColumn(
+        '_rank', functions.row_number().over(window)).where(
+        functions.col('_rank') == 1)
+    return result.select(
+        [functions.col('`{}`'.format(c.replace('`', '``')))
+         for c in df.columns] +
+        [functions.when(functions.col('_inside'),
+                        functions.col(alias)).alias(alias)
+         for alias in aliases])
+
+
 # noinspection PyPep8Naming
 class CustomExpressionTransformer(Transformer, HasOutputCol):
     """
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Model tuning (cross validation over a grid of parameters) for Spark ML.
+
+Folds are assigned and materialized once: input data, with a fold column,
+is persisted (or checkpointed) and every grid point reads its train and
+validation sets from it. Fitting and evaluation of (grid point, fold) pairs
+run concurrently, limited by `parallelism`, because each pair is an
+independent set of Spark jobs.
+
+Strategies:
+    - grid: every grid point is evaluated in all folds;
+    - halving: successive halving, where folds are the resource. All grid
+      points are evaluated in a few folds, only the best 1/factor ones are
+      evaluated in more folds, until the remaining ones use all folds.
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from pyspark import StorageLevel
+    from pyspark.ml.tuning import CrossValidatorModel
+    from pyspark.sql import functions
+except ImportError:
+    pass
+
+STRATEGY_GRID = 'grid'
+STRATEGY_HALVING = 'halving'
+
+FOLD_COL = '_fold'
+
+
+def materialize_folds(df, num_folds=None, fold_col=None, seed=None,
+                      checkpoint=False):
+    """
+    Returns data with a fold column (zero based), persisted (or
+    checkpointed), the name of fold column and the number of folds. If
+    fold_col is informed, existing folds are used. Random fold assignment is
+    not deterministic, so it must be materialized to be shared by all grid
+    points.
+    """
+    if fold_col:
+        num_folds = 1 + df.agg(functions.max(fold_col)).head()[0]
+    else:
+        fold_col = FOLD_COL
+        df = df.withColumn(fold_col, functions.floor(
+            functions.rand(seed) * num_folds).cast('int'))
+
+    if checkpoint:
+        session = getattr(df, 'sparkSession', None) or \
+            df.sql_ctx.sparkSession
+        context = session.sparkContext
+        if context._jsc.sc().getCheckpointDir().isDefined():
+            df = df.checkpoint(eager=True)
+        else:
+            df = df.localCheckpoint(eager=True)
+    else:
+        df = df.persist(StorageLevel.MEMORY_AND_DISK)
+        df.count()
+    return df, fold_col, num_folds
+
+
+def _is_better(evaluator):
+    if evaluator.isLargerBetter():
+        return lambda a, b: a > b
+    return lambda a, b: a < b
+
+
+def _halving_rounds(num_folds, factor):
+    """ Number of folds evaluated in each round of successive halving """
+    rounds = []
+    folds = num_folds
+    while folds >= 1:
+        rounds.insert(0, folds)
+        if folds == 1:
+            break
+        folds = max(1, int(math.ceil(folds / float(factor))))
+    return rounds
+
+
+def cross_validation(df, fold_col, estimator, estimator_params, evaluator,
+                     collect_sub_models=False, parallelism=1, num_folds=3,
+                     seed=None, strategy=STRATEGY_GRID, halving_factor=3,
+                     checkpoint=False):
+    """
+    Evaluates estimator_params (list of param maps) using cross validation
+    and fits the best one using all data.
+
+    :return: tuple with a CrossValidatorModel, metrics (by fold, in the
+        order of estimator_params, only of evaluated grid points), index of
+        the best param map and the number of folds.
+    """
+    data, fold_col, folds = materialize_folds(df, num_folds, fold_col, seed,
+                                              checkpoint)
+    try:
+        num_models = len(estimator_params)
+        splits = [(data.filter(data[fold_col] != i).drop(fold_col),
+                   data.filter(data[fold_col] == i).drop(fold_col))
+                  for i in range(folds)]
+
+        # metrics[i][j]: metric of grid point j in fold i
+        metrics = [[None] * num_models for _ in range(folds)]
+        sub_models = [[None] * num_models for _ in range(folds)] \
+            if collect_sub_models else None
+
+        def fit_and_evaluate(i, j):
+            train, validation = splits[i]
+            model = estimator.fit(train, estimator_params[j])
+            metric = evaluator.evaluate(
+                model.transform(validation, estimator_params[j]))
+            return i, j, metric, model
+
+        def evaluate(pairs):
+            workers = max(1, min(int(parallelism or 1), len(pairs)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for i, j, metric, model in pool.map(
+                        lambda pair: fit_and_evaluate(*pair), pairs):
+                    metrics[i][j] = metric
+                    if collect_sub_models:
+                        sub_models[i][j] = model
+
+        def average(j, num):
+            return sum(metrics[i][j] for i in range(num)) / num
+
+        is_better = _is_better(evaluator)
+        candidates = list(range(num_models))
+        if strategy == STRATEGY_HALVING and num_models > 1:
+            evaluated = 0
+            for num in _halving_rounds(folds, halving_factor):
+                evaluate([(i, j) for i in range(evaluated, num)
+                          for j in candidates])
+                evaluated = num
+                if num == folds:
+                    break
+                keep = max(1, int(math.ceil(
+                    len(candidates) / float(halving_factor))))
+                candidates.sort(key=lambda j: average(j, num),
+                                reverse=evaluator.isLargerBetter())
+                candidates = candidates[:keep]
+        else:
+            evaluate([(i, j) for i in range(folds) for j in candidates])
+
+        # Average of folds where each grid point was evaluated
+        avg_metrics = []
+        for j in range(num_models):
+            values = [m[j] for m in metrics if m[j] is not None]
+            avg_metrics.append(sum(values) / len(values))
+
+        best_index = candidates[0]
+        for j in candidates[1:]:
+            if is_better(avg_metrics[j], avg_metrics[best_index]):
+                best_index = j
+    finally:
+        data.unpersist()
+
+    best_model = estimator.fit(df, estimator_params[best_index])
+    metrics_by_fold = [[m for m in fold if m is not None]
+                       for fold in metrics]
+    return (CrossValidatorModel(best_model, avg_metrics, sub_models),
+            metrics_by_fold, best_index, folds)
@@ -115,6 +115,7 @@ class GeoWithin(Operation):
     POLYGON_ALIAS_COLUMN_PARAM = 'alias'
     TARGET_LAT_COLUMN_PARAM = 'latitude'
     TARGET_LON_COLUMN_PARAM = 'longitude'
+    GRID_SIZE_PARAM = 'grid_size'
 
     def __init__(self, parameters, named_inputs, named_outputs):
         Operation.__init__(self, parameters, named_inputs, named_outputs)
@@ -133,6 +134,11 @@ class GeoWithin(Operation):
 
         self.lat_column = parameters[self.TARGET_LAT_COLUMN_PARAM]
         self.lon_column = parameters[self.TARGET_LON_COLUMN_PARAM]
+        # Size (degrees) of grid cells used to partition points and polygons.
+        # If not informed, the median size of polygons is used.
+        grid_size = parameters.get(self.GRID_SIZE_PARAM)
+        self.grid_size = float(grid_size) if grid_size not in (None, '') \
+            else None
 
         self.output = self.named_outputs.get('output data',
                                              'out_{}'.format(self.order))
@@ -141,114 +147,19 @@ class GeoWithin(Operation):
             raise ValueError(
                 _('Values for latitude and longitude columns must be informed'))
 
-    def _generate_code(self):
-        return """
-            def geo_join(lat, lng, row_number, points):
-                p_polygon = Path(points)
-                bcast_index = broad_casted_sp_index.value
-                matches = bcast_index.intersect([lat, lng, lat, lng])
-                return row_number in matches and p_polygon.contains_point(
-                    [lng, lat])
-
-            f_join = functions.udf(geo_join, types.BooleanType())
-
-            {geo} = dataframe_util.df_zip_with_index({geo}, 0, '_row_number_')
-            {out} = {input}.crossJoin({geo}).where(
-                f_join({input}['lat'], {input}['lng'], {geo}['_row_number_'],
-                {geo}['points']))
-
-        """
-
     def generate_code(self):
         code = """
-            from matplotlib.path import Path
-            import pyqtree
-
-            attributes_to_add = {attributes}
-
-            schema = [s.name for s in {geo}.schema]
-            shp_object = {geo}.select(attributes_to_add +
-                ['{points_column}']).collect()
-            bcast_shapefile = spark_session.sparkContext.broadcast(shp_object)
-
-            f_min = functions.udf(
-                lambda v, index: min([item[index] for item in v]),
-                    types.DoubleType())
-            f_max = functions.udf(
-                lambda v, index: max([item[index] for item in v]),
-                    types.DoubleType())
-
-            boundaries = {geo}.select(
-                (f_min('{points_column}', functions.lit(1))).alias('x_min'),
-                (f_min('{points_column}', functions.lit(0))).alias('y_min'),
-                (f_max('{points_column}', functions.lit(1))).alias('x_max'),
-                (f_max('{points_column}', functions.lit(0))).alias('y_max'),
-            ).collect()
-
-            global_min_x = float('+inf')
-            global_min_y = float('+inf')
-            global_max_x = float('-inf')
-            global_max_y = float('-inf')
-
-            to_update = []
-            for inx, row in enumerate(boundaries):
-                x_min = row['x_min']
-                y_min = row['y_min']
-                x_max = row['x_max']
-                y_max = row['y_max']
-                to_update.append({{
-                    'item': inx,
-                    'bbox': [x_min, y_min, x_max, y_max]
-                }})
-                global_min_x = min(global_min_x, x_min)
-                global_min_y = min(global_min_y, y_min)
-                global_max_x = max(global_max_x, x_max)
-                global_max_y = max(global_max_y, y_max)
-
-            sp_index = pyqtree.Index(
-                bbox=[global_min_x, global_min_y, global_max_x, global_max_y])
-
-            for item in to_update:
-                sp_index.insert(**item)
-
-            broad_casted_sp_index = spark_session.sparkContext.broadcast(
-                sp_index)
-
-            def get_first_polygon(lat, lng):
-                x = float(lat)
-                y = float(lng)
-                bcast_index = broad_casted_sp_index.value
-                matches = bcast_index.intersect([x, y, x, y])
-
-                for shp_inx in matches:
-                    row = bcast_shapefile.value[shp_inx]
-                    p_polygon = Path(row['{points_column}'])
-                    # Here it uses longitude, latitude
-                    if p_polygon.contains_point([y, x]):
-                        return [c for c in row] # must return an array, no Row
-                return [None] * len(bcast_shapefile.value[0])
-
-            udf_get_first_polygon = functions.udf(
-                get_first_polygon, types.ArrayType(types.StringType()))
-            within = {input}.withColumn(
-                'tmp_polygon_data', udf_get_first_polygon(
-                    functions.col('{lat}'), functions.col('{lng}')))
-            aliases = {aliases}
-
-            {out} = within.select(within.columns +
-               [within.tmp_polygon_data[i].alias(aliases.pop())
-                for i, col in enumerate(schema)
-                if col in attributes_to_add])
-
-            {out} = {out}.drop('tmp_polygon_data')
-
-
+            {out} = juicer_ext.geo_within(
+                {input}, {geo}, '{lat}', '{lng}', '{points_column}',
+                attributes={attributes},
+                aliases={aliases},
+                grid_size={grid_size})
         """.format(geo=self.named_inputs['geo data'],
                    points_column=self.points_column[0],
                    input=self.named_inputs['input data'],
                    lat=self.lat_column[0],
                    lng=self.lon_column[0], out=self.output,
                    aliases=json.dumps(self.alias),
-                   attributes=self.attributes
-                   )
+                   attributes=json.dumps(self.attributes),
+                   grid_size=self.grid_size)
         return dedent(code)
@@ -992,6 +992,18 @@ class CrossValidationOperation(Operation):
     PREDICTION_ATTRIBUTE_PARAM = 'prediction_attribute'
     LABEL_ATTRIBUTE_PARAM = 'label_attribute'
     FEATURES_PARAM = 'features'
+    PARALLELISM_PARAM = 'parallelism'
+    STRATEGY_PARAM = 'search_strategy'
+    HALVING_FACTOR_PARAM = 'halving_factor'
+
+    STRATEGY_GRID = 'grid'
+    STRATEGY_HALVING = 'halving'
+
+    # Defaults, overridden by juicer.transpiler.cross_validation
+    CROSS_VALIDATION_DEFAULTS = {
+        'parallelism': 4,
+        'checkpoint': False,
+    }
 
     METRIC_TO_EVALUATOR = {
         'areaUnderROC': (
@@ -1043,7 +1055,32 @@ class CrossValidationOperation(Operation):
         self.label_attr = parameters.get(self.LABEL_ATTRIBUTE_PARAM)
 
         self.num_folds = parameters.get(self.NUM_FOLDS_PARAM, 3)
-        self.seed = parameters.get(self.SEED_PARAM)
+        seed = parameters.get(self.SEED_PARAM)
+        self.seed = int(seed) if seed not in (None, '') else None
+
+        cv_config = dict(self.CROSS_VALIDATION_DEFAULTS)
+        cv_config.update(parameters.get('configuration', {}).get(
+            'juicer', {}).get('transpiler', {}).get('cross_validation') or {})
+        self.parallelism = int(parameters.get(self.PARALLELISM_PARAM) or
+                               cv_config['parallelism'])
+        if self.parallelism <= 0:
+            raise ValueError(
+                _("Parameter '{}' must be x>0 for task {}").format(
+                    self.PARALLELISM_PARAM, self.__class__))
+        self.checkpoint = bool(cv_config['checkpoint'])
+
+        self.strategy = parameters.get(
+            self.STRATEGY_PARAM, self.STRATEGY_GRID) or self.STRATEGY_GRID
+        if self.strategy not in [self.STRATEGY_GRID, self.STRATEGY_HALVING]:
+            raise ValueError(
+                _("Invalid value '{}' for parameter '{}' in task {}").format(
+                    self.strategy, self.STRATEGY_PARAM, self.__class__))
+        self.halving_factor = int(
+            parameters.get(self.HALVING_FACTOR_PARAM) or 3)
+        if self.halving_factor < 2:
+            raise ValueError(
+                _("Parameter '{}' must be x>=2 for task {}").format(
+                    self.HALVING_FACTOR_PARAM, self.__class__))
 
         self.output = self.named_outputs.get(
             'scored data', 'scored_data_task_{}'.format(self.order))
@@ -1089,11 +1126,14 @@ class CrossValidationOperation(Operation):
                 estimator.setFeaturesCol(features)
                 estimator.setPredictionCol('{prediction_attr}')
 
-                cross_validator = tuning.CrossValidator(
-                    estimator=estimator,
-                    estimatorParamMaps=grid_builder.build(),
-                    evaluator=evaluator, numFolds={folds})
-                cv_model = cross_validator.fit({input_data})
+                # Folds are materialized once and grid points are evaluated
+                # concurrently
+                cv_result = juicer_tuning.cross_validation(
+                    {input_data}, None, estimator, grid_builder.build(),
+                    evaluator, parallelism={parallelism}, num_folds={folds},
+                    seed={seed}, strategy='{strategy}',
+                    halving_factor={halving_factor}, checkpoint={checkpoint})
+                cv_model, metrics, best_index, folds = cv_result
                 fit_data = cv_model.transform({input_data})
                 {best_model} = cv_model.bestModel
                 metric_result = evaluator.evaluate(fit_data)
@@ -1110,7 +1150,12 @@ class CrossValidationOperation(Operation):
                            prediction_attr=self.prediction_attr,
                            label_attr=self.label_attr[0],
                            folds=self.num_folds,
-                           metric=self.metric))
+                           metric=self.metric,
+                           parallelism=self.parallelism,
+                           seed=self.seed,
+                           strategy=self.strategy,
+                           halving_factor=self.halving_factor,
+                           checkpoint=self.checkpoint))
 
         # If there is an output needing the evaluation result, it must be
         # processed here (summarization of data results)
@@ -3345,6 +3390,10 @@ class LoadModelOperation(Operation):
         if not self.model:
             msg = 'Missing parameter model'
             raise ValueError(msg)
+        try:
+            self.model_id = int(self.model)
+        except (TypeError, ValueError):
+            raise ValueError(_('Model not found'))
 
         self.has_code = any([len(named_outputs) > 0, self.contains_results()])
         self.output_model = named_outputs.get(
@@ -3357,7 +3406,11 @@ class LoadModelOperation(Operation):
         url = limonero_config['url']
         token = str(limonero_config['auth_token'])
 
-        model_data = query_limonero(url, '/models', token, self.model)
+        # Model information may be already retrieved when loading workflow
+        model_data = self.parameters.get('workflow', {}).get(
+            'model_cache', {}).get(self.model_id)
+        if model_data is None:
+            model_data = query_limonero(url, '/models', token, self.model)
         parts = model_data['class_name'].split('.')
         url = model_data['storage']['url']
         if url[-1] != '/':
@@ -3365,11 +3418,14 @@ class LoadModelOperation(Operation):
 
         path = '{}{}'.format(url, model_data['path'])
 
+        # Loaded models are cached by the minion (by id and version)
         code = dedent("""
             from {pkg} import {cls}
-            {output} = {cls}.load('{path}')
+            from juicer.spark.model_cache import load_model
+            {output} = load_model(spark_session, {model_id}, '{path}', {cls})
         """.format(
             output=self.output_model,
+            model_id=self.model_id,
             path=path,
             cls=parts[-1],
             pkg='.'.join(parts[:-1])
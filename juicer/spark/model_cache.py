@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Cache for models loaded by the Spark minion (see juicer.util.model_cache).
+Models belong to the Spark session (their data is kept in the driver JVM),
+so the cache is cleared when the session is stopped. The version of a model
+is the modification time of its directory in storage (a model saved again
+is written to a new directory) and memory is estimated by its size.
+Settings are read from juicer.minion.model_cache.
+"""
+import threading
+
+from juicer.util.model_cache import ModelCache
+
+# Used when the minion does not configure the cache
+DEFAULT_CONFIG = {'max_entries': 10}
+
+_lock = threading.Lock()
+_cache = None
+
+
+class SparkModelCache(ModelCache):
+    def __init__(self, max_entries=0, max_memory_mb=0, disk_dir=None,
+                 enabled=True):
+        # Local copies of Spark models would not be visible to executors
+        super(SparkModelCache, self).__init__(
+            max_entries, max_memory_mb, None, enabled)
+
+
+def configure(config=None):
+    """ Creates the cache used by LoadModel. Called when the minion starts """
+    global _cache
+    settings = dict(DEFAULT_CONFIG)
+    settings.update(config or {})
+    with _lock:
+        _cache = SparkModelCache.from_config(settings)
+    return _cache
+
+
+def get_model_cache():
+    with _lock:
+        cache = _cache
+    return configure() if cache is None else cache
+
+
+def load_model(spark_session, model_id, path, model_class):
+    """
+    Returns the model saved in path, using the model cache. A copy of the
+    cached model is returned (it shares the model data), so changes in
+    parameters made by a job are not seen by other jobs.
+
+    :param spark_session: Spark session;
+    :param model_id: model id (Limonero);
+    :param path: path of the model (Hadoop file system URI);
+    :param model_class: class used to load the model (e.g. PipelineModel).
+    """
+    sc = spark_session.sparkContext
+    hadoop_path = sc._jvm.org.apache.hadoop.fs.Path(path)
+    fs = hadoop_path.getFileSystem(sc._jsc.hadoopConfiguration())
+    version = fs.getFileStatus(hadoop_path).getModificationTime()
+    size = fs.getContentSummary(hadoop_path).getLength()
+
+    model = get_model_cache().get(
+        model_id, version, lambda: model_class.load(path), size)
+    return model.copy()
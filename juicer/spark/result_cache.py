@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Cache for results of tasks executed by the Spark minion (see
+juicer.util.result_cache). Memory is estimated for DataFrames persisted in
+memory (storage level) and evicted DataFrames are unpersisted. Results are
+spilled as Parquet files (local or HDFS directory).
+Settings are read from juicer.minion.result_cache.
+"""
+import json
+
+from juicer.util.result_cache import ResultCache, POLICY_LRU, POLICY_COST
+
+TASK_META_DIR = '_lemonade_task'
+
+
+class TaskResultCache(ResultCache):
+    def __init__(self, max_entries=0, max_memory_mb=0,
+                 eviction_policy=POLICY_LRU, spill_dir=None):
+        super(TaskResultCache, self).__init__(
+            max_entries, max_memory_mb, eviction_policy, spill_dir)
+        self.spark_session = None
+
+    def attach(self, spark_session, workflow_id):
+        """
+        Sets the Spark session used to spill/read results and loads the
+        index of results spilled by previous minions of the workflow.
+        """
+        with self._lock:
+            self.spark_session = spark_session
+            self.workflow_id = workflow_id
+            self.load_spill_index()
+
+    def _is_frame(self, value):
+        # Duck typing allows unit testing without Spark
+        return hasattr(value, 'storageLevel') and hasattr(value, 'unpersist')
+
+    def _estimate_size(self, df):
+        if not df.is_cached or not df.storageLevel.useMemory:
+            return 0
+        # For cached data, the plan is an InMemoryRelation, whose statistics
+        # reflect the materialized data.
+        stats = df._jdf.queryExecution().optimizedPlan().stats()
+        return int(stats.sizeInBytes().toString())
+
+    def _release(self, df):
+        if df.is_cached:
+            df.unpersist()
+
+    def _get_fs(self, path):
+        sc = self.spark_session.sparkContext
+        hadoop_path = sc._jvm.org.apache.hadoop.fs.Path(path)
+        return (hadoop_path.getFileSystem(sc._jsc.hadoopConfiguration()),
+                hadoop_path)
+
+    def _write_spill(self, path, results, ports, meta):
+        if self.spark_session is None:
+            raise ValueError(_('Spark session is not available'))
+        for i, port in enumerate(ports):
+            results[port].write.mode('overwrite').parquet(
+                '{}/port_{}'.format(path, i))
+        # Metadata is written last, it marks the spill as complete
+        self.spark_session.createDataFrame(
+            [(json.dumps(meta),)], ['value']).coalesce(1).write.mode(
+            'overwrite').text('{}/{}'.format(path, TASK_META_DIR))
+
+    def _read_spill(self, path, meta):
+        if self.spark_session is None:
+            raise ValueError(_('Spark session is not available'))
+        return {port: self.spark_session.read.parquet(
+            '{}/port_{}'.format(path, i))
+            for i, port in enumerate(meta['ports'])}
+
+    def _read_spill_index(self):
+        result = []
+        if self.spark_session is None:
+            return result
+        fs, hadoop_path = self._get_fs(self._workflow_dir())
+        if not fs.exists(hadoop_path):
+            return result
+        for status in fs.listStatus(hadoop_path):
+            path = '{}/{}'.format(self._workflow_dir(),
+                                  status.getPath().getName())
+            try:
+                result.append(json.loads(self.spark_session.read.text(
+                    '{}/{}'.format(path, TASK_META_DIR)).first()[0]))
+            except Exception:
+                # Incomplete spill
+                pass
+        return result
+
+    def _delete_spill(self, path):
+        fs, hadoop_path = self._get_fs(path)
+        if fs.exists(hadoop_path):
+            fs.delete(hadoop_path, True)
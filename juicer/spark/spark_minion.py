@@ -5,11 +5,13 @@ import gc
 import gettext
 import imp
 import importlib
+import io
 import json
 import logging.config
 import multiprocessing
 import signal
 import sys
+import threading
 import time
 import traceback
 
@@ -31,7 +33,10 @@ from juicer.runner import configuration
 from juicer.runner import protocol as juicer_protocol
 
 from juicer.runner.minion_base import Minion
+from juicer.spark import model_cache
+from juicer.spark.result_cache import TaskResultCache
 from juicer.spark.transpiler import SparkTranspiler
+from juicer.transpiler import GeneratedCodeCache
 from juicer.util import dataframe_util, listener_util
 from juicer.workflow.workflow import Workflow
 from juicer.util.template_util import strip_accents
@@ -50,6 +55,8 @@ class SparkMinion(Minion):
     # max idle time allowed in seconds until this minion self termination
     IDLENESS_TIMEOUT = 600
     TIMEOUT = 'timeout'
+    # Required by pandas UDFs in Spark 2.x with pyarrow >= 0.15
+    LEGACY_ARROW_FORMAT_VAR = 'ARROW_PRE_0_15_IPC_FORMAT'
 
     def __init__(self, redis_conn, workflow_id, app_id, config, lang='en',
                  jars=None):
@@ -62,9 +69,18 @@ class SparkMinion(Minion):
         self.reload_code_process = None
         self.module = None
 
-        self._state = {}
         self.transpiler = SparkTranspiler(config)
         self.config = config
+        minion_config = config['juicer'].get('minion', {})
+        # Results of tasks, used in incremental (partial) executions
+        self._state = TaskResultCache.from_config(
+            minion_config.get('result_cache'))
+        # Models loaded by LoadModel, shared by all jobs of the minion
+        self.model_cache = model_cache.configure(
+            minion_config.get('model_cache'))
+        self.code_cache = GeneratedCodeCache(
+            minion_config.get('code_cache_size', 0),
+            minion_config.get('code_cache_ttl', 300))
         configuration.set_config(self.config)
         self.juicer_listener_enabled = False
 
@@ -85,8 +101,14 @@ class SparkMinion(Minion):
             config['juicer']['servers']['redis_url'],
             'job_output')
 
-        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_jobs)
         self.job_future = None
+        # Protects state, code generation and session creation when jobs
+        # run concurrently
+        self._lock = threading.RLock()
+        # Generated modules being executed (they keep per run globals)
+        self._running_modules = set()
 
         # self termination timeout
         self.active_messages = 0
@@ -286,6 +308,9 @@ class SparkMinion(Minion):
 
             if all([self.last_cluster_id,
                     self.last_cluster_id != cluster_info['id']]):
+                # Running jobs must finish before the session is stopped
+                for future in list(self.job_futures.values()):
+                    future.result()
                 if self.spark_session:
                     self._emit_event(room=job_id, namespace='/stand')(
                         name='update job',
@@ -293,8 +318,10 @@ class SparkMinion(Minion):
                                   'Stopping previous cluster.'),
                         status='RUNNING', identifier=job_id)
                     # Requires finish Spark Context
+                    self._state.flush()
                     self.spark_session.stop()
-                    self._state = {}
+                    self._state.clear(release=False)
+                    self.model_cache.clear()
                     self.spark_session = None
 
             self.cluster_options = {}
@@ -361,11 +388,13 @@ class SparkMinion(Minion):
             # (old configs) spark session?
             app_configs = msg_info.get('app_configs', {})
 
-            if self.job_future:
+            # In sequential mode, jobs wait for the previous one. Otherwise,
+            # the executor limits the number of concurrent jobs.
+            if self.max_concurrent_jobs == 1 and self.job_future:
                 self.job_future.result()
 
-            self.job_future = self._execute_future(job_id, workflow,
-                                                   app_configs)
+            self.job_future = self._track_job_future(
+                job_id, self._execute_future(job_id, workflow, app_configs))
             log.info(_('Execute message finished'))
 
         elif msg_type == juicer_protocol.TERMINATE:
@@ -397,10 +426,37 @@ class SparkMinion(Minion):
 
         result = True
         start = timer()
+        # Module reserved for this job (released when the job finishes)
+        running_module = None
         try:
-            loader = Workflow(workflow, self.config)
+            # Key must be computed before loading, because loading the
+            # workflow changes it.
+            code_key = None
+            cached_code = None
+            if self.code_cache.enabled:
+                code_key = GeneratedCodeCache.compute_key(
+                    workflow, self.transpiler.get_template_version(),
+                    self._state)
+                if self.is_spark_session_available():
+                    cached_code = self.code_cache.get(code_key)
+                # A module cannot be shared by jobs running concurrently, so
+                # it is checked and reserved in a single step. If it is in
+                # use, code is generated again.
+                with self._lock:
+                    if cached_code and cached_code[0] in self._running_modules:
+                        cached_code = None
+                    elif cached_code:
+                        running_module = cached_code[0]
+                        self._running_modules.add(running_module)
+
+            if cached_code is None:
+                loader = Workflow(workflow, self.config)
+            else:
+                # Session is available, so loader is not required
+                loader = None
             # force the spark context creation
-            self.get_or_create_spark_session(loader, app_configs, job_id)
+            with self._lock:
+                self.get_or_create_spark_session(loader, app_configs, job_id)
 
             # Mark job as running
             if self.new_session:
@@ -423,18 +479,36 @@ class SparkMinion(Minion):
             generated_code_path = os.path.join(
                 self.tmp_dir, module_name + '.py')
 
-            with codecs.open(generated_code_path, 'w', 'utf8') as out:
-                self.transpiler.transpile(
-                    loader.workflow, loader.graph, {}, out, job_id,
-                    self._state)
-
-            # Get rid of .pyc file if it exists
-            if os.path.isfile('{}c'.format(generated_code_path)):
-                os.remove('{}c'.format(generated_code_path))
-
-            self.module = importlib.import_module(module_name)
-            # self.module = imp.reload(self.module)
-            self.module = importlib.reload(self.module)
+            if cached_code is not None:
+                log.info(_('Reusing generated code (workflow unchanged, '
+                           'hits=%s, misses=%s)'), self.code_cache.hits,
+                         self.code_cache.misses)
+                module, gen_source_code = cached_code
+                self.transpiler.save_source_code(job_id, gen_source_code)
+            else:
+                out = io.StringIO()
+                with self._lock:
+                    self.transpiler.transpile(
+                        loader.workflow, loader.graph, {}, out, job_id,
+                        self._state)
+                gen_source_code = out.getvalue()
+                with codecs.open(generated_code_path, 'w', 'utf8') as f:
+                    f.write(gen_source_code)
+
+                # Get rid of .pyc file if it exists
+                if os.path.isfile('{}c'.format(generated_code_path)):
+                    os.remove('{}c'.format(generated_code_path))
+
+                with self._lock:
+                    module = importlib.import_module(module_name)
+                    # module = imp.reload(module)
+                    module = importlib.reload(module)
+                    running_module = module
+                    self._running_modules.add(running_module)
+                if code_key:
+                    self.code_cache.put(code_key, module,
+                                        gen_source_code, job_id)
+            self.module = module
             if log.isEnabledFor(logging.DEBUG):
                 log.debug('Objects in memory after loading module: %s',
                           len(gc.get_objects()))
@@ -444,15 +518,18 @@ class SparkMinion(Minion):
             # current state (if any). We pass the current state to the execution
             # to avoid re-computing the same tasks over and over again, in case
             # of several partial workflow executions.
+            self._set_job_properties(job_id)
             try:
-                new_state = self.module.main(
+                # State (cache) is thread safe
+                new_state = module.main(
                     self.get_or_create_spark_session(loader, app_configs,
                                                      job_id),
                     self._state,
                     self._emit_event(room=job_id, namespace='/stand'))
             except Exception as ex:
                 if self.is_spark_session_available():
-                    self.spark_session.sparkContext.cancelAllJobs()
+                    self.spark_session.sparkContext.cancelJobGroup(
+                        str(job_id))
                 raise ex from None
 
             end = timer()
@@ -464,7 +541,8 @@ class SparkMinion(Minion):
 
             # We update the state incrementally, i.e., new task results can be
             # overwritten but never lost.
-            self._state.update(new_state)
+            with self._lock:
+                self._state.update(new_state)
 
         except UnicodeEncodeError as ude:
             message = self.MNN006[1].format(ude)
@@ -510,6 +588,10 @@ class SparkMinion(Minion):
                 status='ERROR', identifier=job_id)
             self._generate_output(str(ee), 'ERROR', code=1000)
             result = False
+        finally:
+            if running_module is not None:
+                with self._lock:
+                    self._running_modules.discard(running_module)
 
         self.message_processed('execute')
 
@@ -519,12 +601,30 @@ class SparkMinion(Minion):
         if stop:
             log.warn(
                 _('Minion is configured to stop Spark after each execution'))
-            self._state = {}
+            self._state.flush()
             self.spark_session.stop()
+            self._state.clear(release=False)
+            self.model_cache.clear()
             self.spark_session = None
 
         return result
 
+    def _set_job_properties(self, job_id):
+        """
+        Spark jobs triggered by this thread belong to a job group (used for
+        cancellation) and, when jobs run concurrently, to a fair scheduler
+        pool (one per job). Properties are copied to the threads used by the
+        generated code.
+        """
+        if not self.is_spark_session_available():
+            return
+        sc = self.spark_session.sparkContext
+        sc.setJobGroup(str(job_id), _('Lemonade job {}').format(job_id),
+                       interruptOnCancel=True)
+        if self.max_concurrent_jobs > 1:
+            sc.setLocalProperty('spark.scheduler.pool',
+                                'lemonade_job_{}'.format(job_id))
+
     # noinspection PyProtectedMember
     def is_spark_session_available(self):
         """
@@ -535,6 +635,14 @@ class SparkMinion(Minion):
                 self.spark_session.sparkContext._jsc and
                 not self.spark_session.sparkContext._jsc.sc().isStopped())
 
+    @staticmethod
+    def _get_pyarrow_version():
+        try:
+            import pyarrow
+            return pyarrow.__version__
+        except ImportError:
+            return None
+
     # noinspection PyUnresolvedReferences,PyProtectedMember
     def get_or_create_spark_session(self, loader, app_configs, job_id):
         """
@@ -543,6 +651,7 @@ class SparkMinion(Minion):
         to support partial workflow executions within the same context.
         """
 
+        import pyspark
         from pyspark.sql import SparkSession
         if not self.is_spark_session_available():
 
@@ -565,6 +674,25 @@ class SparkMinion(Minion):
                 app_configs['driver-library-path'] = \
                     '{}/lib/native/'.format(os.environ.get('HADOOP_HOME'))
 
+            # Concurrent jobs share the cluster using fair scheduler pools
+            if self.max_concurrent_jobs > 1:
+                spark_builder = spark_builder.config('spark.scheduler.mode',
+                                                     'FAIR')
+
+            # Samples and chart data are moved to the driver through Arrow,
+            # unless disabled in configuration (Spark 2.x and 3.x options)
+            spark_config = self.config['juicer'].get('spark', {})
+            for option in ('spark.sql.execution.arrow.enabled',
+                           'spark.sql.execution.arrow.pyspark.enabled'):
+                if option not in spark_config:
+                    spark_builder = spark_builder.config(option, 'true')
+            if dataframe_util.requires_legacy_arrow_format(
+                    pyspark.__version__, self._get_pyarrow_version()):
+                # Driver (this process) and executors (Python workers)
+                os.environ[self.LEGACY_ARROW_FORMAT_VAR] = '1'
+                spark_builder = spark_builder.config(
+                    'spark.executorEnv.' + self.LEGACY_ARROW_FORMAT_VAR, '1')
+
             # Default options from configuration file
             app_configs.update(self.config['juicer'].get('spark', {}))
 
@@ -630,6 +758,7 @@ class SparkMinion(Minion):
             self._build_dist_file()
             self.spark_session.sparkContext.addPyFile(self.DIST_ZIP_FILE)
             self.new_session = True
+            self._state.attach(self.spark_session, self.workflow_id)
 
             def _send_listener_log(data):
                 self._emit_event(room=job_id, namespace='/stand')(
@@ -704,10 +833,16 @@ class SparkMinion(Minion):
     def _read_dataframe_data(self, task_id, output, port):
         success = True
         data = []
+        task_state = self._state[task_id]
+        if isinstance(task_state, (list, tuple)):
+            # Current format: [results (by port), task hash]
+            task_state = dict(
+                (name, {'output': value, 'sample': None})
+                for name, value in task_state[0].items())
         # Last position in state is the execution time, so it should be ignored
-        if port in self._state[task_id]:
-            df = self._state[task_id][port]['output']
-            partial_result = self._state[task_id][port]['sample']
+        if port in task_state:
+            df = task_state[port]['output']
+            partial_result = task_state[port]['sample']
 
             # In this case we already have partial data collected for the
             # particular task
@@ -726,7 +861,7 @@ class SparkMinion(Minion):
                 # FIXME define as a parameter?:
                 status_data = {'status': 'SUCCESS', 'code': self.MNN002[0],
                                'message': self.MNN002[1], 'output': output}
-                data = df.rdd.map(dataframe_util.convert_to_csv).take(100)
+                data = dataframe_util.get_csv_sample(df, 100)
 
             # In this case, do not make sense to request data for this
             # particular task output port
@@ -742,19 +877,22 @@ class SparkMinion(Minion):
 
         return success, status_data, data
 
-    # noinspection PyUnusedLocal
     def cancel_job(self, job_id):
-        if self.job_future:
+        """ Cancels a job, without affecting other jobs of the app """
+        future = self.job_futures.get(str(job_id))
+        # A job waiting for the executor is only removed from the queue
+        if future and not future.cancel():
             while True:
                 if self.is_spark_session_available():
-                    self.spark_session.sparkContext.cancelAllJobs()
+                    self.spark_session.sparkContext.cancelJobGroup(
+                        str(job_id))
                 try:
-                    self.job_future.result(timeout=1)
+                    future.result(timeout=1)
                     break
                 except TimeoutError as te:
                     pass
 
-        message = self.MNN007[1].format(self.app_id)
+        message = self.MNN007[1].format(job_id)
         log.info(message)
         self._generate_output(message, 'SUCCESS', self.MNN007[0])
 
@@ -797,6 +935,8 @@ class SparkMinion(Minion):
         if self.spark_session:
             sc = self.spark_session.sparkContext
 
+            # Results are kept for a new minion (if spill is enabled)
+            self._state.flush()
             self.spark_session.stop()
             self.spark_session.sparkContext.stop()
             self.spark_session = None
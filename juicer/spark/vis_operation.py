@@ -3,8 +3,8 @@
 
 import collections
 import decimal
-import itertools
 import json
+import threading
 from collections import Iterable
 from textwrap import dedent
 
@@ -13,7 +13,6 @@ import datetime
 from juicer import auditing
 from juicer.operation import Operation
 from juicer.service import limonero_service
-from juicer.util import chunks
 from juicer.util import dataframe_util
 from juicer.util.dataframe_util import get_csv_schema
 
@@ -26,6 +25,28 @@ COLORS_PALETTE = list(reversed([
     '#072163', '#0C2D7F', '#113A9F', '#3054AD', '#506FBB', ]))  # purple
 SHAPES = ['diamond', 'point', 'circle']
 
+# Maximum number of points (rows) retrieved by each kind of chart. It can be
+# changed in juicer.transpiler.visualization.max_points.
+DEFAULT_MAX_POINTS = {
+    'bar': 100,
+    'pie': 100,
+    'line': 5000,
+    'scatter': 5000,
+    'map': 10000,
+}
+
+# Summary statistics. Correlation matrix is skipped when there are more
+# numeric attributes than max_correlation_attributes. Can be changed in
+# juicer.transpiler.visualization.summary_statistics.
+SUMMARY_DEFAULTS = {
+    'max_correlation_attributes': 50,
+    'quantile_error': 0.01,
+}
+# Statistics computed by the minion, by input hash and data version (LRU)
+SUMMARY_CACHE_SIZE = 32
+_summary_cache = collections.OrderedDict()
+_summary_cache_lock = threading.Lock()
+
 
 def get_caipirinha_config(config, indentation=0):
     limonero_conf = config['juicer']['services']['limonero']
@@ -167,6 +188,9 @@ class VisualizationMethodOperation(Operation):
     ID_ATTR_PARAM = 'id_attribute'
     VALUE_ATTR_PARAM = 'value_attribute'
 
+    # Key used to define the budget of points (see DEFAULT_MAX_POINTS)
+    CHART_KIND = None
+
     def __init__(self, parameters, named_inputs,
                  named_outputs):
         Operation.__init__(self, parameters, named_inputs, named_outputs)
@@ -181,6 +205,12 @@ class VisualizationMethodOperation(Operation):
         self.id_attribute = parameters.get(self.ID_ATTR_PARAM, [])
         self.value_attribute = parameters.get(self.VALUE_ATTR_PARAM, [])
 
+        vis_config = parameters.get('configuration', {}).get(
+            'juicer', {}).get('transpiler', {}).get('visualization', {})
+        max_points = dict(DEFAULT_MAX_POINTS)
+        max_points.update(vis_config.get('max_points') or {})
+        self.max_points = max_points.get(self.CHART_KIND)
+
         # Visualizations are not cached!
         self.supports_cache = False
         self.output = self.named_outputs.get('visualization',
@@ -207,6 +237,8 @@ class VisualizationMethodOperation(Operation):
         for k, v in list(self.parameters.items()):
             if k in valid:
                 result[k] = v
+        if self.max_points:
+            result['max_points'] = self.max_points
         return result
 
     def get_output_names(self, sep=','):
@@ -276,6 +308,8 @@ class VisualizationMethodOperation(Operation):
 
 
 class BarChartOperation(VisualizationMethodOperation):
+    CHART_KIND = 'bar'
+
     def __init__(self, parameters, named_inputs, named_outputs):
         VisualizationMethodOperation.__init__(self, parameters, named_inputs,
                                               named_outputs)
@@ -285,6 +319,8 @@ class BarChartOperation(VisualizationMethodOperation):
 
 
 class PieChartOperation(VisualizationMethodOperation):
+    CHART_KIND = 'pie'
+
     def __init__(self, parameters, named_inputs, named_outputs):
         VisualizationMethodOperation.__init__(self, parameters, named_inputs,
                                               named_outputs)
@@ -294,6 +330,8 @@ class PieChartOperation(VisualizationMethodOperation):
 
 
 class DonutChartOperation(VisualizationMethodOperation):
+    CHART_KIND = 'pie'
+
     def __init__(self, parameters, named_inputs, named_outputs):
         VisualizationMethodOperation.__init__(self, parameters, named_inputs,
                                               named_outputs)
@@ -303,6 +341,8 @@ class DonutChartOperation(VisualizationMethodOperation):
 
 
 class LineChartOperation(VisualizationMethodOperation):
+    CHART_KIND = 'line'
+
     def __init__(self, parameters, named_inputs, named_outputs):
         VisualizationMethodOperation.__init__(self, parameters, named_inputs,
                                               named_outputs)
@@ -312,6 +352,8 @@ class LineChartOperation(VisualizationMethodOperation):
 
 
 class AreaChartOperation(VisualizationMethodOperation):
+    CHART_KIND = 'line'
+
     def __init__(self, parameters, named_inputs, named_outputs):
         VisualizationMethodOperation.__init__(self, parameters, named_inputs,
                                               named_outputs)
@@ -330,6 +372,8 @@ class TableVisualizationOperation(VisualizationMethodOperation):
 
 
 class ScatterPlotOperation(VisualizationMethodOperation):
+    CHART_KIND = 'scatter'
+
     def __init__(self, parameters, named_inputs, named_outputs):
         VisualizationMethodOperation.__init__(self, parameters, named_inputs,
                                               named_outputs)
@@ -339,6 +383,8 @@ class ScatterPlotOperation(VisualizationMethodOperation):
 
 
 class MapOperation(VisualizationMethodOperation):
+    CHART_KIND = 'map'
+
     def __init__(self, parameters, named_inputs, named_outputs):
 
         if parameters.get('type') in ['polygon', 'geojson']:
@@ -373,7 +419,23 @@ class SummaryStatisticsOperation(VisualizationMethodOperation):
         self.attributes = parameters.get(self.ATTRIBUTES_PARAM, None)
 
     def get_model_parameters(self):
-        return {self.ATTRIBUTES_PARAM: self.attributes or []}
+        summary_config = dict(SUMMARY_DEFAULTS)
+        summary_config.update(self.parameters.get('configuration', {}).get(
+            'juicer', {}).get('transpiler', {}).get('visualization', {}).get(
+            'summary_statistics') or {})
+        # Task hash does not change if a data source is overwritten, so the
+        # update time of data sources read by the workflow is also a key
+        data_sources = self.parameters.get('workflow', {}).get(
+            'data_source_cache') or {}
+        summary_config.update({
+            self.ATTRIBUTES_PARAM: self.attributes or [],
+            # Task hash changes if the input (or any previous task) changes
+            'input_hash': self.parameters.get('hash'),
+            'data_version': sorted(
+                [str(ds_id), str(ds.get('updated'))]
+                for ds_id, ds in data_sources.items() if ds),
+        })
+        return summary_config
 
     def get_model_name(self):
         return SummaryStatisticsModel.__name__
@@ -383,6 +445,74 @@ class SummaryStatisticsOperation(VisualizationMethodOperation):
 # Visualization Models used inside the code generated #
 #######################################################
 
+class VisualizationData(object):
+    """
+    Retrieves the data used by a chart, limited to a budget of points.
+    If data is larger than the budget, it is reduced by Spark (aggregation
+    with top-N, reservoir or stratified sampling) before being collected,
+    so at most max_points + 1 rows reach the driver.
+    """
+    SEED = 2017
+
+    def __init__(self, data, max_points):
+        self.data = data
+        self.max_points = max_points
+
+    def _collect_if_small(self):
+        """
+        Returns all rows (in their original order) if they fit the budget.
+        Only max_points + 1 rows are retrieved to find it out.
+        """
+        if not self.max_points:
+            return self.data.collect()
+        rows = self.data.limit(self.max_points + 1).collect()
+        if len(rows) <= self.max_points:
+            return rows
+        return None
+
+    def top_n(self, group_attr, value_attrs):
+        """
+        Values are summed by group, only the groups with largest (first)
+        value are retrieved.
+        """
+        rows = self._collect_if_small()
+        if rows is None:
+            from pyspark.sql import functions
+            rows = self.data.groupBy(group_attr).agg(
+                *[functions.sum(attr).alias(attr) for attr in value_attrs]
+            ).orderBy(functions.desc(value_attrs[0])).limit(
+                self.max_points).collect()
+        return rows
+
+    def sample(self, order_attr=None, strata_attr=None):
+        """
+        Uniform sample (without replacement) of rows. Ordering by a random
+        value and limiting the result is executed as a top-K by Spark, i.e.,
+        each partition keeps a reservoir of max_points rows.
+        If strata_attr is informed, each stratum (e.g. series) contributes
+        with the same number of rows.
+        """
+        rows = self._collect_if_small()
+        if rows is None:
+            from pyspark.sql import functions
+            from pyspark.sql.window import Window
+            df = self.data
+            if strata_attr:
+                strata = df.agg(functions.approx_count_distinct(
+                    strata_attr)).collect()[0][0] or 1
+                quota = max(1, self.max_points // strata)
+                window = Window.partitionBy(strata_attr).orderBy(
+                    functions.rand(self.SEED))
+                df = df.withColumn(
+                    '_vis_rank', functions.row_number().over(window)).filter(
+                    functions.col('_vis_rank') <= quota).drop('_vis_rank')
+            df = df.orderBy(functions.rand(self.SEED)).limit(self.max_points)
+            if order_attr:
+                df = df.orderBy(order_attr)
+            rows = df.collect()
+        return rows
+
+
 class VisualizationModel(object):
     def __init__(self, data, task_id, type_id, type_name, title, column_names,
                  orientation,
@@ -407,6 +537,10 @@ class VisualizationModel(object):
     def get_data(self):
         raise NotImplementedError(_('Should be implemented in derived classes'))
 
+    def _get_bounded_data(self, chart_kind):
+        return VisualizationData(self.data, self.params.get(
+            'max_points', DEFAULT_MAX_POINTS.get(chart_kind)))
+
     def get_schema(self):
         return self.data.schema.json()
 
@@ -509,7 +643,8 @@ class BarChartModel(ChartVisualization):
     def get_data(self):
         x_attr, x_type, y_attrs = self._get_axis_info()
 
-        rows = self.data.collect()
+        rows = self._get_bounded_data('bar').top_n(
+            x_attr.name, [attr.name for attr in y_attrs])
 
         colors = {}
         color_counter = 0
@@ -634,10 +769,8 @@ class PieChartModel(ChartVisualization):
     def get_data(self):
         label_attr, ignored, value_attr = self._get_axis_info()
 
-        # @FIXME Spark 2.2.0 is raising an exception if self.data.collect()
-        # is called directly when the output port is used multiple times.
-        self.data.count()
-        rows = self.data.collect()
+        rows = self._get_bounded_data('pie').top_n(label_attr.name,
+                                                    [value_attr.name])
         result = self._get_title_legend_tooltip()
         result['legend']['isVisible'] = self.params.get('legend') in ('1', 1)
 
@@ -686,7 +819,7 @@ class LineChartModel(ChartVisualization):
     def get_data(self):
         x_attr, x_type, y_attrs = self._get_axis_info()
 
-        rows = self.data.collect()
+        rows = self._get_bounded_data('line').sample(order_attr=x_attr.name)
 
         data = []
         for i, attr in enumerate(y_attrs):
@@ -748,7 +881,7 @@ class MapModel(ChartVisualization):
     def get_data(self):
         result = {}
         result.update(self._get_title_legend_tooltip())
-        rows = self.data.collect()
+        rows = self._get_bounded_data('map').sample()
 
         if self.params.get('value'):
             value_attr = next((c for c in self.data.schema if
@@ -874,7 +1007,8 @@ class ScatterPlotModel(ChartVisualization):
                 "values": []
             }
 
-        rows = self.data.collect()
+        rows = self._get_bounded_data('scatter').sample(
+            strata_attr=series_attr.name if series_attr else None)
         current_color = 0
         for row in rows:
             if series_attr:
@@ -982,6 +1116,13 @@ class TableVisualizationModel(VisualizationModel):
 
 
 class SummaryStatisticsModel(TableVisualizationModel):
+    """
+    Statistics are computed in tiers: moments and quantiles (sketches) of
+    all attributes in a single aggregation and, if the number of numeric
+    attributes is up to max_correlation_attributes, the correlation matrix
+    by pyspark.ml.stat.Correlation. Results are cached by input hash and
+    by the version (update time) of data sources.
+    """
     # noinspection PyUnusedLocal
     def __init__(self, data, task_id, type_id, type_name, title,
                  column_names,
@@ -1003,10 +1144,17 @@ class SummaryStatisticsModel(TableVisualizationModel):
         else:
             self.attrs = [attr for attr in all_attr if
                           attr in self.params['attributes']]
+        self.max_correlation_attributes = self.params.get(
+            'max_correlation_attributes',
+            SUMMARY_DEFAULTS['max_correlation_attributes'])
+        self.quantile_error = self.params.get(
+            'quantile_error', SUMMARY_DEFAULTS['quantile_error'])
+
         self.names = [_('attribute'), _('max'), _('min'), _('std. dev.'),
                       _('count'), _('avg'),
                       _('approx. distinct'), _('missing'), _('skewness'),
-                      _('kurtosis')]
+                      _('kurtosis'), _('1st quartile'), _('median'),
+                      _('3rd quartile')]
 
         self.names.extend(
             [_('correlation to {} (Pearson)').format(attr) for attr in
@@ -1016,76 +1164,119 @@ class SummaryStatisticsModel(TableVisualizationModel):
     def get_icon(self):
         return 'fa-table'
 
-    # noinspection PyUnresolvedReferences
-    def get_data(self):
+    def _get_cache_key(self):
+        input_hash = self.params.get('input_hash')
+        if input_hash:
+            data_version = tuple(
+                tuple(v) for v in self.params.get('data_version') or [])
+            return (input_hash, data_version, tuple(self.attrs),
+                    self.max_correlation_attributes, self.quantile_error)
+        return None
+
+    def _compute_moments(self):
         """
-        Returns statistics about attributes in a data frame
+        Moments and quantiles (percentile_approx sketches) of all attributes
+        in a single pass over data.
         """
-
         from pyspark.sql import functions
 
-        # Correlation pairs
-        corr_pairs = list(
-            chunks(
-                list(itertools.product(self.attrs, self.attrs)),
-                len(self.attrs)))
-
-        # Cache data
-        self.data.cache()
-
-        df_count = self.data.count()
-
-        # TODO: Implement median using df.approxQuantile('col', [.5], .25)
-
-        stats = []
+        accuracy = int(1.0 / max(self.quantile_error, 1e-6))
+        stats = [functions.count(functions.lit(1)).alias('total')]
         for i, name in enumerate(self.attrs):
             df_col = functions.col(name)
-            stats.append(functions.lit(name))
-            stats.append(functions.max(df_col).alias('max_{}'.format(name)))
-            stats.append(functions.min(df_col).alias('min_{}'.format(name)))
+            stats.append(functions.max(df_col).alias('max_{}'.format(i)))
+            stats.append(functions.min(df_col).alias('min_{}'.format(i)))
+            stats.append(functions.count(df_col).alias('count_{}'.format(i)))
+            stats.append(functions.approx_count_distinct(df_col).alias(
+                'distinct_{}'.format(i)))
             if name in self.numeric_attrs:
                 stats.append(functions.round(
                     functions.stddev(df_col), 4).alias(
-                    'stddev_{}'.format(name)))
-            else:
-                stats.append(functions.lit('-'))
-            stats.append(
-                functions.count(df_col).alias('count_{}'.format(name)))
-            if name in self.numeric_attrs:
+                    'stddev_{}'.format(i)))
                 stats.append(functions.round(
-                    functions.avg(df_col), 4).alias('avg_{}'.format(name)))
-            else:
-                stats.append(functions.lit('-'))
-
-            stats.append(functions.approx_count_distinct(df_col).alias(
-                'distinct_{}'.format(name)))
-            stats.append((df_count - functions.count(df_col)).alias(
-                'missing_{}'.format(name)))
-
-            if name in self.numeric_attrs:
+                    functions.avg(df_col), 4).alias('avg_{}'.format(i)))
                 stats.append(
                     functions.round(functions.skewness(df_col), 2).alias(
-                        'skewness_{}'.format(name)))
+                        'skewness_{}'.format(i)))
                 stats.append(
                     functions.round(functions.kurtosis(df_col), 2).alias(
-                        'kurtosis_{}'.format(name)))
-            else:
-                stats.append(functions.lit('-'))
-                stats.append(functions.lit('-'))
-
-            for pair in corr_pairs[i]:
-                if all([pair[0] in self.numeric_attrs,
-                        pair[1] in self.numeric_attrs]):
-                    stats.append(
-                        functions.round(functions.corr(*pair), 4).alias(
-                            'corr_{}'.format(i)))
+                        'kurtosis_{}'.format(i)))
+                stats.append(functions.expr(
+                    'percentile_approx(`{}`, array(.25, .5, .75), {})'.format(
+                        name.replace('`', '``'), accuracy)).alias(
+                    'quantiles_{}'.format(i)))
+        return self.data.agg(*stats).collect()[0]
+
+    def _compute_correlation(self, numeric_attrs):
+        """
+        Correlation matrix of numeric attributes (rows with missing values
+        are ignored). Skipped if there are too many attributes or less than
+        2 rows without missing values (correlation is undefined).
+        """
+        if not numeric_attrs or \
+                len(numeric_attrs) > self.max_correlation_attributes:
+            return None
+        from pyspark.ml.feature import VectorAssembler
+        from pyspark.ml.stat import Correlation
+
+        assembler = VectorAssembler(inputCols=numeric_attrs,
+                                    outputCol='_features',
+                                    handleInvalid='skip')
+        vectors = assembler.transform(
+            self.data.select(*numeric_attrs)).select('_features')
+        # Correlation.corr fails (covariance) for less than 2 rows
+        if vectors.limit(2).count() < 2:
+            return None
+        matrix = Correlation.corr(vectors, '_features').head()[0].toArray()
+        return dict(
+            ((a1, a2), round(float(matrix[i][j]), 4))
+            for i, a1 in enumerate(numeric_attrs)
+            for j, a2 in enumerate(numeric_attrs))
+
+    def _compute_rows(self):
+        moments = self._compute_moments()
+        numeric_attrs = [a for a in self.attrs if a in self.numeric_attrs]
+        correlation = self._compute_correlation(numeric_attrs)
+
+        rows = []
+        for i, name in enumerate(self.attrs):
+            numeric = name in self.numeric_attrs
+            row = [name, moments['max_{}'.format(i)],
+                   moments['min_{}'.format(i)],
+                   moments['stddev_{}'.format(i)] if numeric else '-',
+                   moments['count_{}'.format(i)],
+                   moments['avg_{}'.format(i)] if numeric else '-',
+                   moments['distinct_{}'.format(i)],
+                   moments['total'] - moments['count_{}'.format(i)],
+                   moments['skewness_{}'.format(i)] if numeric else '-',
+                   moments['kurtosis_{}'.format(i)] if numeric else '-']
+            quantiles = moments['quantiles_{}'.format(i)] if numeric else None
+            row.extend(quantiles or ['-', '-', '-'])
+            for other in self.attrs:
+                if correlation is not None and (name, other) in correlation:
+                    row.append(correlation[(name, other)])
                 else:
-                    stats.append(functions.lit('-'))
+                    row.append('-')
+            rows.append(row)
+        return rows
 
-        self.data = self.data.agg(*stats)
-        aggregated = self.data.take(1)[0]
-        n = len(self.names)
-        rows = [aggregated[i:i + n] for i in range(0, len(aggregated), n)]
+    # noinspection PyUnresolvedReferences
+    def get_data(self):
+        """
+        Returns statistics about attributes in a data frame
+        """
+        key = self._get_cache_key()
+        with _summary_cache_lock:
+            rows = _summary_cache.get(key) if key else None
+            if rows is not None:
+                _summary_cache.move_to_end(key)
+        if rows is None:
+            rows = self._compute_rows()
+            if key:
+                with _summary_cache_lock:
+                    _summary_cache[key] = rows
+                    while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+                        _summary_cache.popitem(last=False)
 
         return {"rows": rows, "attributes": self.get_column_names().split(',')}
 
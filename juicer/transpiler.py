@@ -5,7 +5,11 @@ import datetime
 import hashlib
 import json
 import logging
+import os
+import re
 import sys
+import threading
+import time
 import uuid
 from collections import OrderedDict
 from urllib.parse import urlparse
@@ -14,7 +18,7 @@ import jinja2
 import networkx as nx
 import redis
 from juicer import auditing
-from juicer.util.jinja2_custom import AutoPep8Extension
+from juicer.util.jinja2_custom import AutoPep8Extension, FORMAT_FULL
 from rq import Queue
 from .service import stand_service
 from .util.template_util import HandleExceptionExtension
@@ -40,6 +44,117 @@ class DependencyController(object):
         return True  # len(self.requires[_id].difference(self._satisfied)) == 0
 
 
+class TemplateRegistry(object):
+    """ Process-wide registry of Jinja2 environments, one per template
+    directory. Each environment keeps its compiled templates between
+    transpiles and reloads a template only if its file modification time
+    changes. Optionally, compiled bytecode is also stored on disk, so new
+    minion processes do not need to compile the templates again.
+    """
+    _environments = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_environment(cls, template_dir, bytecode_cache_dir=None):
+        key = (template_dir, bytecode_cache_dir)
+        with cls._lock:
+            env = cls._environments.get(key)
+            if env is None:
+                bytecode_cache = None
+                if bytecode_cache_dir:
+                    if not os.path.exists(bytecode_cache_dir):
+                        os.makedirs(bytecode_cache_dir)
+                    bytecode_cache = jinja2.FileSystemBytecodeCache(
+                        bytecode_cache_dir)
+                template_loader = jinja2.FileSystemLoader(
+                    searchpath=template_dir)
+                env = jinja2.Environment(loader=template_loader,
+                                         extensions=[AutoPep8Extension,
+                                                     HandleExceptionExtension,
+                                                     'jinja2.ext.do'],
+                                         auto_reload=True,
+                                         bytecode_cache=bytecode_cache)
+                env.globals.update(zip=zip)
+                cls._environments[key] = env
+                log.debug('Created template environment for %s', template_dir)
+        return env
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._environments.clear()
+
+
+class GeneratedCodeCache(object):
+    """ Memoises generated code (already imported as a Python module) by a
+    canonical hash of the workflow, platform, templates version and tasks
+    with results in the current state. If the workflow is executed again
+    without changes, a minion reuses the module, avoiding transpiling,
+    writing and importing code again. Entries expire after a TTL, because
+    metadata used during code generation (e.g. data sources in Limonero)
+    may change without changing the workflow.
+    """
+
+    def __init__(self, max_size=10, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    @staticmethod
+    def compute_key(workflow, template_version, state=None):
+        signature = {
+            'workflow': workflow,
+            'platform': workflow.get('platform', {}).get('slug'),
+            'templates': template_version,
+            # Tasks with results in state are generated differently
+            # (e.g. data readers check cached results).
+            'state': sorted(state.keys()) if state else [],
+        }
+        return hashlib.sha1(json.dumps(
+            signature, sort_keys=True, default=str).encode(
+            'utf8', errors='ignore')).hexdigest()
+
+    def get(self, key):
+        """ Returns a tuple (module, source code) or None if not cached. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1:]
+
+    def put(self, key, module, source_code, job_id):
+        """ Stores the module, unless the generated code depends on the job
+        (e.g. job id used to store visualizations or reports), because in
+        this case, it can not be reused by another job.
+        """
+        if not self.enabled or re.search(
+                r'\b{}\b'.format(re.escape(str(job_id))), source_code):
+            return False
+        with self._lock:
+            self._entries[key] = (time.time(), module, source_code)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
 # noinspection PyMethodMayBeStatic
 class Transpiler(object):
     """Base class for transpilers (converts workflow into platform specific
@@ -84,6 +199,25 @@ class Transpiler(object):
     def get_deploy_template(self):
         return "templates/deploy.tmpl"
 
+    def get_template_environment(self):
+        """ Returns the (shared) Jinja2 environment for this transpiler.
+        Templates are compiled once per process and reused by all transpiles.
+        """
+        bytecode_cache_dir = self.configuration.get('juicer', {}).get(
+            'transpiler', {}).get('bytecode_cache_dir')
+        return TemplateRegistry.get_environment(self.template_dir,
+                                                bytecode_cache_dir)
+
+    def get_template_version(self):
+        """ Templates version, i.e., the most recent modification time of
+        the template files used by this transpiler.
+        """
+        templates_dir = os.path.join(self.template_dir, 'templates')
+        if not os.path.isdir(templates_dir):
+            return 0
+        return max([os.path.getmtime(os.path.join(templates_dir, f))
+                    for f in os.listdir(templates_dir)] or [0])
+
     def get_audit_info(self, graph, workflow, task, parameters):
         result = []
         task['ancestors'] = nx.ancestors(graph, task['id'])
@@ -124,6 +258,31 @@ class Transpiler(object):
             })
         return result
 
+    @staticmethod
+    def _push_down_projections(graph, instances):
+        """
+        Data sources supporting projection read only the attributes used by
+        the operations reading them, if all of them inform which attributes
+        they use (see Operation.get_used_attributes).
+        """
+        for task_id, instance in instances.items():
+            if not getattr(instance, 'supports_projection', False) or \
+                    instance.contains_results():
+                continue
+            children = set(graph.successors(task_id))
+            if not children or not children.issubset(instances):
+                continue
+            used = [instances[child].get_used_attributes()
+                    for child in children]
+            if all(attributes is not None for attributes in used):
+                instance.used_attributes = sorted(
+                    set(attr for attributes in used for attr in attributes))
+                # Task output depends on attributes read (result cache)
+                task_hash = hashlib.sha1(instance.parameters['hash'].encode())
+                task_hash.update(repr(instance.used_attributes).encode(
+                    'utf8', errors='ignore'))
+                instance.parameters['hash'] = task_hash.hexdigest()
+
     def generate_code(self, graph, job_id, out, params, ports,
                       sorted_tasks_id, state, task_hash, using_stdout,
                       workflow, deploy=False, export_notebook=False):
@@ -247,6 +406,8 @@ class Transpiler(object):
             instance.out_degree = graph.out_degree(task_id)
             instances[task['id']] = instance
 
+        self._push_down_projections(graph, instances)
+
         if audit_events:
 
             redis_url = self.configuration['juicer']['servers']['redis_url']
@@ -258,7 +419,10 @@ class Transpiler(object):
                 event['date'] = event['date'].isoformat()
             q.enqueue(AUDITING_JOB_NAME, json.dumps(audit_events))
 
+        code_format = params.get('code_format') or self.configuration.get(
+            'juicer', {}).get('transpiler', {}).get('code_format', FORMAT_FULL)
         env_setup = {
+            'code_format': code_format,
             'dependency_controller': DependencyController(
                 params.get('requires_info', False)),
             'disabled_tasks': workflow['disabled_tasks'],
@@ -274,13 +438,7 @@ class Transpiler(object):
         }
         env_setup.update(self.get_context())
 
-        template_loader = jinja2.FileSystemLoader(
-            searchpath=self.template_dir)
-        template_env = jinja2.Environment(loader=template_loader,
-                                          extensions=[AutoPep8Extension,
-                                                      HandleExceptionExtension,
-                                                      'jinja2.ext.do'])
-        template_env.globals.update(zip=zip)
+        template_env = self.get_template_environment()
 
         if deploy:
             env_setup['slug_to_op_id'] = self.slug_to_op_id
@@ -300,16 +458,20 @@ class Transpiler(object):
                 out.write(gen_source_code)
             else:
                 out.write(gen_source_code)
-            stand_config = self.configuration.get('juicer', {}).get(
-                'services', {}).get('stand')
-            if stand_config and job_id:
-                # noinspection PyBroadException
-                try:
-                    stand_service.save_job_source_code(
-                        stand_config['url'], stand_config['auth_token'], job_id,
-                        gen_source_code)
-                except Exception as ex:
-                    log.exception(str(ex))
+            self.save_source_code(job_id, gen_source_code)
+
+    def save_source_code(self, job_id, gen_source_code):
+        """ Stores the generated code for the job in Stand (if configured) """
+        stand_config = self.configuration.get('juicer', {}).get(
+            'services', {}).get('stand')
+        if stand_config and job_id:
+            # noinspection PyBroadException
+            try:
+                stand_service.save_job_source_code(
+                    stand_config['url'], stand_config['auth_token'], job_id,
+                    gen_source_code)
+            except Exception as ex:
+                log.exception(str(ex))
 
     def transpile(self, workflow, graph, params, out=None, job_id=None,
                   state=None, deploy=False, export_notebook=False):
@@ -186,30 +186,127 @@ def emit_schema_sklearn(task_id, df, emit_event, name, notebook=False):
                task={'id': task_id})
 
 
-def emit_sample(task_id, df, emit_event, name, size=50, notebook=False,
-                title=None):
-    from juicer.spark.reports import SimpleTableReport
-    headers = [f.name for f in df.schema.fields]
+def _is_missing(value):
+    # Missing values are converted to NaN or NaT by pandas
+    return value is None or (isinstance(value, float) and value != value) \
+        or str(value) == 'NaT'
+
 
+def _format_sample_value(value, sklearn=False):
     number_types = (int, float, decimal.Decimal)
+    if not sklearn and _is_missing(value):
+        return json.dumps(None)
+    if hasattr(value, 'tolist') and not isinstance(
+            value, number_types + (datetime.date,)):
+        # numpy arrays (Arrow lists) and scalars
+        value = value.tolist()
+    if isinstance(value, (str, text_type)):
+        return value
+    elif isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    elif isinstance(value, number_types):
+        return str(value)
+    elif sklearn and isinstance(value, list):
+        return '[' + ', '.join([str(x) if isinstance(x, number_types)
+                                else "'{}'".format(x) for x in value]) + ']'
+    else:
+        return json.dumps(value, cls=CustomEncoder)
+
 
+def _format_sample_frame(pdf, sklearn=False):
+    """
+    Formats a (small) pandas data frame as a list of rows with string values.
+    Values larger than 200 chars are truncated, by column.
+    """
+    import pandas as pd
+    if pdf.shape[1] == 0:
+        return [[] for _ in range(len(pdf))]
+    columns = []
+    for i in range(pdf.shape[1]):
+        values = pd.Series(
+            [_format_sample_value(v, sklearn) for v in pdf.iloc[:, i]],
+            dtype=object)
+        too_long = values.str.len() > 200
+        if too_long.any():
+            values[too_long] = (values[too_long].str[:150] + ' ... ' +
+                                values[too_long].str[-50:])
+        columns.append(values.tolist())
+    return [list(row) for row in zip(*columns)]
+
+
+def _limit_spark_sample(df, size, truncate=True):
+    """
+    Limits the sample and truncates long strings using Spark. Integer and
+    decimal values are converted to strings in Spark, so they are not changed
+    when converted to pandas (e.g. integers with missing values).
+    """
+    from pyspark.sql import functions, types
+    attrs = []
+    for field in df.schema.fields:
+        attr = df[field.name]
+        if truncate and isinstance(field.dataType, types.StringType):
+            attr = functions.when(
+                functions.length(attr) > 200, functions.concat(
+                    functions.substring(attr, 1, 150), functions.lit(' ... '),
+                    functions.substring(attr, -50, 50))).otherwise(attr)
+        elif isinstance(field.dataType,
+                        (types.IntegralType, types.DecimalType)):
+            attr = attr.cast('string')
+        attrs.append(attr.alias(field.name))
+    return df.limit(size).select(*attrs)
+
+
+def get_sample_rows(df, size=50, truncate=True):
+    """
+    Returns a sample of a Spark data frame as rows of strings. Rows are
+    limited and truncated by Spark and retrieved through Arrow (toPandas, if
+    Arrow is enabled in the Spark session).
+    """
+    names = [f.name for f in df.schema.fields]
+    if hasattr(df, 'toPandas') and len(set(names)) == len(names):
+        return _format_sample_frame(
+            _limit_spark_sample(df, size, truncate).toPandas())
+    # Duplicated attribute names are not supported by pandas
     rows = []
     for row in df.take(size):
-        new_row = []
-        rows.append(new_row)
-        for col in row:
-            if isinstance(col, (str, text_type)):
-                value = col
-            elif isinstance(col, (datetime.datetime, datetime.date)):
-                value = col.isoformat()
-            elif isinstance(col, number_types):
-                value = str(col)
-            else:
-                value = json.dumps(col, cls=CustomEncoder)
-            # truncate column if size is bigger than 200 chars.
-            if len(value) > 200:
-                value = value[:150] + ' ... ' + value[-50:]
-            new_row.append(value)
+        rows.append([_format_sample_value(col) for col in row])
+    return [[v[:150] + ' ... ' + v[-50:] if truncate and len(v) > 200
+             else v for v in row] for row in rows]
+
+
+def get_csv_sample(df, size=100):
+    """
+    Returns a sample of a data frame (Spark or pandas) as CSV lines, used when
+    a client requests the data of a task output.
+    """
+    if hasattr(df, 'toPandas'):
+        from pyspark.sql import types
+        names = [f.name for f in df.schema.fields]
+        if len(set(names)) != len(names):
+            return df.rdd.map(convert_to_csv).take(size)
+        pdf = _limit_spark_sample(df, size, truncate=False).toPandas()
+        # Integer and decimal values were converted to strings by Spark
+        numbers = set(f.name for f in df.schema.fields if isinstance(
+            f.dataType, (types.IntegralType, types.DecimalType)))
+    elif hasattr(df, 'rdd'):
+        return df.rdd.map(convert_to_csv).take(size)
+    else:
+        pdf = df.head(size)
+        numbers = set()
+    pdf = pdf.astype(object).where(pdf.notna(), None)
+    return [','.join(
+        value if name in numbers and value is not None
+        else convert_to_csv([value])
+        for name, value in zip(pdf.columns, row))
+        for row in pdf.itertuples(index=False, name=None)]
+
+
+def emit_sample(task_id, df, emit_event, name, size=50, notebook=False,
+                title=None):
+    from juicer.spark.reports import SimpleTableReport
+    headers = [f.name for f in df.schema.fields]
+
+    rows = get_sample_rows(df, size)
 
     css_class = 'table table-striped table-bordered w-auto' \
         if not notebook else ''
@@ -228,30 +325,7 @@ def emit_sample_sklearn(task_id, df, emit_event, name, size=50, notebook=False):
     from juicer.spark.reports import SimpleTableReport
     headers = list(df.columns)
 
-    number_types = (int, float, decimal.Decimal)
-    rows = []
-
-    for row in df.head(size).values:
-        new_row = []
-        rows.append(new_row)
-        for col in row:
-            if isinstance(col, str):
-                value = col
-            elif isinstance(col, str):
-                value = col
-            elif isinstance(col, (datetime.datetime, datetime.date)):
-                value = col.isoformat()
-            elif isinstance(col, number_types):
-                value = str(col)
-            elif isinstance(col, list):
-                value = '[' + ', '.join([str(x) if isinstance(x, number_types)
-                                   else "'{}'".format(x) for x in col]) + ']'
-            else:
-                value = json.dumps(col, cls=CustomEncoder)
-            # truncate column if size is bigger than 200 chars.
-            if len(value) > 200:
-                value = value[:150] + ' ... ' + value[-50:]
-            new_row.append(value)
+    rows = _format_sample_frame(df.head(size), sklearn=True)
 
     css_class = 'table table-striped table-bordered w-auto' \
         if not notebook else ''
@@ -355,6 +429,23 @@ def spark_version(spark_session):
     return tuple(map(int, spark_session.version.split('.')))
 
 
+def _version_tuple(version):
+    return tuple(int(v) for v in re.findall(r'\d+', version or '')[:3])
+
+
+def requires_legacy_arrow_format(pyspark_version, pyarrow_version):
+    """
+    Spark 2.x uses Arrow < 0.15 in the JVM, which does not read the IPC
+    format written by pyarrow >= 0.15, so pandas UDFs and Arrow conversions
+    fail when executed (SPARK-29367). In this case, pyarrow must write the
+    legacy format (ARROW_PRE_0_15_IPC_FORMAT=1) in driver and executors.
+    """
+    if not pyspark_version or not pyarrow_version:
+        return False
+    return (_version_tuple(pyspark_version) < (3, 0) and
+            _version_tuple(pyarrow_version) >= (0, 15))
+
+
 def merge_dicts(x, y):
     """Given two dicts, merge them into a new dict as a shallow copy."""
     z = x.copy()
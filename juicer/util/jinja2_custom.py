@@ -1,9 +1,45 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
+import threading
+from collections import OrderedDict
+
 from jinja2 import nodes
 from jinja2.ext import Extension
 import autopep8
 
+# Formatting modes for generated code:
+# - full: the whole module inside {% autopep8 %} is formatted (default);
+# - fragment: only the code generated by each operation is formatted, using
+#   the autopep8 filter, and results are cached by the fragment hash;
+# - none: no formatting at all (fastest, useful for interactive runs).
+FORMAT_FULL = 'full'
+FORMAT_FRAGMENT = 'fragment'
+FORMAT_NONE = 'none'
+
+_FORMAT_CACHE_SIZE = 2048
+_format_cache = OrderedDict()
+_format_cache_lock = threading.Lock()
+
+
+def format_code(code):
+    """ Formats code using autopep8. Results are cached by the hash of the
+    source code, so unchanged fragments are not formatted again.
+    """
+    key = hashlib.sha1(code.encode('utf8', errors='ignore')).hexdigest()
+    with _format_cache_lock:
+        if key in _format_cache:
+            _format_cache.move_to_end(key)
+            return _format_cache[key]
+
+    result = autopep8.fix_code(code, options={'aggressive': 1})
+
+    with _format_cache_lock:
+        _format_cache[key] = result
+        while len(_format_cache) > _FORMAT_CACHE_SIZE:
+            _format_cache.popitem(last=False)
+    return result
+
 
 class AutoPep8Extension(Extension):
     # a set of names that trigger the extension.
@@ -13,16 +49,30 @@ class AutoPep8Extension(Extension):
         super(AutoPep8Extension, self).__init__(environment)
         # add the defaults to the environment
         environment.extend()
+        environment.filters['autopep8'] = self._format_fragment
 
     def parse(self, parser):
         lineno = next(parser.stream).lineno
 
+        # Optional formatting mode, e.g. {% autopep8 code_format %}
+        if parser.stream.current.type != 'block_end':
+            args = [parser.parse_expression()]
+        else:
+            args = [nodes.Const(FORMAT_FULL)]
+
         body = parser.parse_statements(['name:endautopep8'], drop_needle=True)
-        args = []
         result = nodes.CallBlock(self.call_method('_format_support', args),
                                  [], [], body).set_lineno(lineno)
         return result
 
     @staticmethod
-    def _format_support(caller):
-        return autopep8.fix_code(caller(), options={'aggressive': 1})
\ No newline at end of file
+    def _format_support(code_format, caller):
+        if code_format in (FORMAT_FRAGMENT, FORMAT_NONE):
+            return caller()
+        return format_code(caller())
+
+    @staticmethod
+    def _format_fragment(code, code_format=FORMAT_FULL):
+        if code_format == FORMAT_FRAGMENT:
+            return format_code(code)
+        return code
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Cache for models loaded by minions (LoadModel operation), shared by all
+jobs executed by a minion.
+
+Entries are keyed by model id and by the version of the model in storage
+(modification time), so a model saved again with the same id is loaded
+again and the previous version is discarded. Deserialized models are kept
+in memory, bounded by number of entries and by memory (estimated by the
+size of the model in storage), and evicted in LRU order. Optionally,
+platforms keep a local copy of models in a directory (disk tier), which is
+faster to read than the storage and is shared by minions in the same host.
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+
+class ModelCache(object):
+    def __init__(self, max_entries=0, max_memory_mb=0, disk_dir=None,
+                 enabled=True):
+        self.max_entries = max_entries or 0
+        self.max_memory = (max_memory_mb or 0) * 1024 * 1024
+        self.disk_dir = disk_dir.rstrip('/') if disk_dir else None
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.memory = 0
+
+        # {(model_id, version): (model, size)}
+        self._entries = OrderedDict()
+        # Models being loaded (concurrent jobs load a model only once)
+        self._loading = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_config(cls, config):
+        config = config or {}
+        return cls(config.get('max_entries', 0),
+                   config.get('max_memory_mb', 0),
+                   config.get('disk_dir'),
+                   config.get('enabled', True))
+
+    # Platform specific (disk tier)
+    def _read_disk(self, model_id, version):
+        """ Returns the local copy of the model or None, if not found """
+        return None
+
+    def _write_disk(self, model_id, version, model):
+        pass
+
+    def _delete_disk(self, model_id, keep_version):
+        """ Deletes local copies of other versions of the model """
+        pass
+
+    def get(self, model_id, version, loader, size=0):
+        """
+        Returns the model, cached or loaded by loader() (a function without
+        arguments).
+
+        :param model_id: model id (Limonero);
+        :param version: version of the model in storage (modification time);
+        :param loader: loads the model from storage;
+        :param size: size of the model in storage (bytes), used as an
+            estimate of its memory.
+        """
+        if not self.enabled:
+            return loader()
+        key = (model_id, version)
+        with self._lock:
+            if key in self._entries:
+                return self._hit(key)
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            try:
+                with self._lock:
+                    if key in self._entries:
+                        return self._hit(key)
+                model = self._load(model_id, version, loader)
+                with self._lock:
+                    self.misses += 1
+                    self._put(key, model, size)
+                return model
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+
+    def _load(self, model_id, version, loader):
+        """ Loads the model from the disk tier or from storage """
+        if self.disk_dir:
+            try:
+                model = self._read_disk(model_id, version)
+                if model is not None:
+                    return model
+            except Exception as ex:
+                log.warn(_('Unable to read cached model %s: %s'), model_id,
+                         ex)
+        model = loader()
+        if self.disk_dir:
+            try:
+                self._write_disk(model_id, version, model)
+                self._delete_disk(model_id, version)
+            except Exception as ex:
+                log.warn(_('Unable to write cached model %s: %s'), model_id,
+                         ex)
+        return model
+
+    def invalidate(self, model_id):
+        """ Removes all versions of a model from memory """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == model_id]:
+                self._remove(key)
+
+    def clear(self):
+        """ Removes all models from memory (local copies are kept) """
+        with self._lock:
+            for key in list(self._entries.keys()):
+                self._remove(key)
+
+    def stats(self):
+        return {'entries': len(self._entries), 'memory': self.memory,
+                'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _hit(self, key):
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def _put(self, key, model, size):
+        # Previous versions of the model will not be used anymore
+        for other in [k for k in self._entries if k[0] == key[0]]:
+            self._remove(other)
+        self._entries[key] = (model, size or 0)
+        self.memory += size or 0
+        while len(self._entries) > 1 and (
+                (self.max_entries and
+                 len(self._entries) > self.max_entries) or
+                (self.max_memory and self.memory > self.max_memory)):
+            evicted = next(iter(self._entries))
+            self._remove(evicted)
+            self.evictions += 1
+            log.info(_('Model %s evicted from cache (%s).'), evicted[0],
+                     self.stats())
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.memory -= entry[1]
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+Cache for results of tasks executed by minions (minion state), used in
+incremental executions.
+
+Entries have the format {task_id: [results, task_hash]}, where results is a
+dict with the outputs of the task (by port name), as returned by the
+generated code. The cache is a (thread safe) mapping, so it can be used in
+place of a dict.
+
+The cache may be bounded by number of entries and by (estimated) memory used
+by data frames. Optionally, evicted results are spilled to a directory,
+keyed by the task hash, so a new minion for the same workflow can resume
+incremental execution. Platforms implement how data frames are measured,
+released, written and read.
+"""
+import datetime
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+log = logging.getLogger(__name__)
+
+POLICY_LRU = 'lru'
+POLICY_COST = 'cost'
+
+# Keys in results that are not task outputs
+META_KEYS = ('execution_date', 'task_name', 'time')
+
+
+class ResultCache(MutableMapping):
+    def __init__(self, max_entries=0, max_memory_mb=0,
+                 eviction_policy=POLICY_LRU, spill_dir=None):
+        self.max_entries = max_entries or 0
+        self.max_memory = (max_memory_mb or 0) * 1024 * 1024
+        self.eviction_policy = eviction_policy or POLICY_LRU
+        self.spill_dir = spill_dir.rstrip('/') if spill_dir else None
+
+        self.workflow_id = None
+        self.evictions = 0
+        self.memory = 0
+
+        self._entries = OrderedDict()
+        self._sizes = {}
+        # Spilled results, by task id: (task_hash, metadata)
+        self._spilled = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_config(cls, config):
+        config = config or {}
+        return cls(config.get('max_entries', 0),
+                   config.get('max_memory_mb', 0),
+                   config.get('eviction_policy', POLICY_LRU),
+                   config.get('spill_dir'))
+
+    # Platform specific
+    def _is_frame(self, value):
+        raise NotImplementedError()
+
+    def _estimate_size(self, frame):
+        raise NotImplementedError()
+
+    def _release(self, frame):
+        """ Releases resources used by an evicted data frame """
+        pass
+
+    def _write_spill(self, path, results, ports, meta):
+        raise NotImplementedError()
+
+    def _read_spill(self, path, meta):
+        """ Returns the outputs (by port) of spilled results """
+        raise NotImplementedError()
+
+    def _read_spill_index(self):
+        """ Returns metadata of results spilled for the workflow """
+        raise NotImplementedError()
+
+    def _delete_spill(self, path):
+        raise NotImplementedError()
+
+    # Mapping interface
+    def __getitem__(self, task_id):
+        with self._lock:
+            if task_id in self._entries:
+                self._entries.move_to_end(task_id)
+                return self._entries[task_id]
+            if task_id in self._spilled:
+                entry = self._read_spilled(task_id)
+                if entry is not None:
+                    self._put(task_id, entry)
+                    self._evict_if_needed()
+                    return entry
+            raise KeyError(task_id)
+
+    def __setitem__(self, task_id, entry):
+        with self._lock:
+            self._put(task_id, entry)
+            self._evict_if_needed()
+
+    def __delitem__(self, task_id):
+        with self._lock:
+            self._remove(task_id, release=True)
+
+    def __contains__(self, task_id):
+        with self._lock:
+            return task_id in self._entries or task_id in self._spilled
+
+    def __iter__(self):
+        with self._lock:
+            keys = list(self._entries.keys())
+            keys.extend(k for k in self._spilled if k not in self._entries)
+        return iter(keys)
+
+    def __len__(self):
+        with self._lock:
+            return len(set(self._entries) | set(self._spilled))
+
+    def update(self, *args, **kwargs):
+        with self._lock:
+            for task_id, entry in dict(*args, **kwargs).items():
+                self._put(task_id, entry)
+            self._evict_if_needed()
+
+    def clear(self, release=True):
+        """
+        Removes all entries from memory (spilled results are kept). If the
+        session was stopped, there is nothing to release.
+        """
+        with self._lock:
+            for task_id in list(self._entries.keys()):
+                self._remove(task_id, release=release)
+
+    def stats(self):
+        return {'entries': len(self._entries), 'memory': self.memory,
+                'spilled': len(self._spilled), 'evictions': self.evictions}
+
+    # Memory accounting and eviction
+    @staticmethod
+    def _get_results(entry):
+        if isinstance(entry, (list, tuple)) and entry and isinstance(
+                entry[0], dict):
+            return entry[0]
+        return None
+
+    def _get_frames(self, entry):
+        results = self._get_results(entry)
+        if results is None:
+            return []
+        return [v for k, v in results.items()
+                if k not in META_KEYS and self._is_frame(v)]
+
+    def _put(self, task_id, entry):
+        previous = self._entries.get(task_id)
+        self._remove(task_id, release=False)
+        self._entries[task_id] = entry
+        size = 0
+        for frame in self._get_frames(entry):
+            try:
+                size += self._estimate_size(frame)
+            except Exception:
+                pass
+        self._sizes[task_id] = size
+        self.memory += size
+        if previous is not None:
+            self._release_unused(self._get_frames(previous))
+
+    def _remove(self, task_id, release):
+        entry = self._entries.pop(task_id, None)
+        self.memory -= self._sizes.pop(task_id, 0)
+        if entry is not None and release:
+            self._release_unused(self._get_frames(entry))
+
+    def _release_unused(self, frames):
+        # Data frames may be shared by other tasks (e.g. pass through)
+        in_use = set(id(df) for other in self._entries.values()
+                     for df in self._get_frames(other))
+        for frame in frames:
+            if id(frame) not in in_use:
+                self._release(frame)
+
+    def _cost(self, task_id):
+        """ Cost-based policy: recompute time per byte of memory """
+        results = self._get_results(self._entries[task_id]) or {}
+        return (results.get('time') or 0) / max(self._sizes.get(task_id, 0),
+                                                 1)
+
+    def _evict_if_needed(self):
+        while len(self._entries) > 1 and (
+                (self.max_entries and
+                 len(self._entries) > self.max_entries) or
+                (self.max_memory and self.memory > self.max_memory)):
+            if self.eviction_policy == POLICY_COST:
+                task_id = min(self._entries, key=self._cost)
+            else:
+                task_id = next(iter(self._entries))
+            if self.spill_dir:
+                self._spill(task_id)
+            self._remove(task_id, release=True)
+            self.evictions += 1
+            log.info(_('Task %s evicted from cache (%s).'), task_id,
+                     self.stats())
+
+    # Spill
+    def flush(self):
+        """ Spills all results in memory (e.g. before minion termination) """
+        with self._lock:
+            if self.spill_dir:
+                for task_id in list(self._entries.keys()):
+                    self._spill(task_id)
+
+    def load_spill_index(self):
+        """ Loads the index of results spilled by previous minions """
+        with self._lock:
+            if not self.spill_dir:
+                return
+            try:
+                for meta in self._read_spill_index():
+                    current = self._spilled.get(meta['task_id'])
+                    if current is None or current[1]['spilled_at'] < meta[
+                            'spilled_at']:
+                        self._spilled[meta['task_id']] = (meta['hash'], meta)
+                log.info(_('Spilled results available for %s task(s).'),
+                         len(self._spilled))
+            except Exception as ex:
+                log.warn(_('Unable to read cache directory %s: %s'),
+                         self._workflow_dir(), ex)
+
+    def _workflow_dir(self):
+        return '{}/workflow_{}'.format(self.spill_dir, self.workflow_id)
+
+    def _task_dir(self, task_hash):
+        return '{}/{}'.format(self._workflow_dir(), task_hash)
+
+    def _spill(self, task_id):
+        entry = self._entries.get(task_id)
+        results = self._get_results(entry)
+        if results is None:
+            return False
+        task_hash = entry[1]
+        if self._spilled.get(task_id, (None,))[0] == task_hash:
+            return True
+        ports = [k for k in results if k not in META_KEYS]
+        # Only data frames can be spilled (models, reports, etc. cannot)
+        if not ports or not all(self._is_frame(results[p]) for p in ports):
+            return False
+        try:
+            execution_date = results.get('execution_date')
+            meta = {
+                'task_id': task_id, 'hash': task_hash, 'ports': ports,
+                'task_name': results.get('task_name'),
+                'time': results.get('time'), 'spilled_at': time.time(),
+                'execution_date': execution_date.isoformat()
+                if execution_date else None}
+            self._write_spill(self._task_dir(task_hash), results, ports,
+                              meta)
+
+            previous = self._spilled.get(task_id)
+            if previous and previous[0] != task_hash:
+                self._delete_spill(self._task_dir(previous[0]))
+            self._spilled[task_id] = (task_hash, meta)
+            return True
+        except Exception as ex:
+            log.warn(_('Unable to spill results of task %s: %s'), task_id,
+                     ex)
+            return False
+
+    def _read_spilled(self, task_id):
+        task_hash, meta = self._spilled[task_id]
+        try:
+            results = {'task_name': meta.get('task_name'),
+                       'time': meta.get('time'), 'execution_date': None}
+            if meta.get('execution_date'):
+                results['execution_date'] = datetime.datetime.strptime(
+                    meta['execution_date'][:19], '%Y-%m-%dT%H:%M:%S')
+            results.update(self._read_spill(self._task_dir(task_hash), meta))
+            return [results, task_hash]
+        except Exception as ex:
+            log.warn(_('Unable to read spilled results of task %s: %s'),
+                     task_id, ex)
+            del self._spilled[task_id]
+            return None
@@ -2,6 +2,7 @@
 
 import collections
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from gettext import gettext
 
 import networkx as nx
@@ -50,6 +51,7 @@ class Workflow(object):
         # Workflow dictionary
         self.workflow = workflow_data
         self.workflow['data_source_cache'] = {}
+        self.workflow['model_cache'] = {}
         self.workflow['disabled_tasks'] = self.disabled_tasks
 
         # Construct graph
@@ -61,6 +63,9 @@ class Workflow(object):
         # Spark or COMPSs
         self.platform = workflow_data.get('platform', {}).get('slug', 'spark')
 
+        # Data sources and models used by operations are retrieved at once
+        self._resolve_limonero_resources()
+
         if self.platform == 'spark':
             self._build_privacy_restrictions()
 
@@ -83,20 +88,24 @@ class Workflow(object):
         data_sources = []
         if self.workflow['platform']['slug'] != 'spark':
             return
+        data_source_cache = self.workflow['data_source_cache']
         for t in self.workflow['tasks']:
             if t['operation'].get('slug') == 'data-reader':
                 if self.query_data_sources:
                     ds = next(self.query_data_sources())
                 else:
-                    ds = limonero_service.get_data_source_info(
-                        limonero_config['url'],
-                        str(limonero_config['auth_token']),
-                        t['forms']['data_source']['value'])
+                    data_source_id = t['forms']['data_source']['value']
+                    ds = data_source_cache.get(
+                        self._get_resource_key(data_source_id))
+                    if ds is None:
+                        ds = limonero_service.get_data_source_info(
+                            limonero_config['url'],
+                            str(limonero_config['auth_token']),
+                            data_source_id)
                 data_sources.append(ds)
 
         privacy_info = {}
         attribute_group_set = collections.defaultdict(list)
-        data_source_cache = {}
         for ds in data_sources:
             data_source_cache[ds['id']] = ds
             attrs = []
@@ -140,6 +149,69 @@ class Workflow(object):
         self.workflow['data_source_cache'] = data_source_cache
         self.workflow['privacy_restrictions'] = privacy_info
 
+    @staticmethod
+    def _get_resource_key(resource_id):
+        try:
+            return int(resource_id)
+        except (TypeError, ValueError):
+            return resource_id
+
+    def _resolve_limonero_resources(self):
+        """
+        Retrieves, concurrently, all data sources and models referenced by
+        the workflow tasks and stores them in the workflow, so they are
+        shared by all operations (they would be retrieved one by one during
+        transpiling). Errors are ignored here, because operations retrieve
+        missing resources again and report errors in their context.
+        """
+        if self.query_data_sources or 'services' not in self.config.get(
+                'juicer', {}):
+            return
+        limonero_config = self.config['juicer']['services'].get('limonero')
+        if not limonero_config:
+            return
+
+        data_source_ids = set()
+        model_ids = set()
+        for task_id in self.graph.nodes:
+            task = self.graph.nodes[task_id]['attr_dict']
+            slug = task['operation'].get('slug')
+            forms = task.get('forms', {})
+            if slug == 'data-reader' and forms.get('data_source', {}).get(
+                    'value'):
+                data_source_ids.add(
+                    self._get_resource_key(forms['data_source']['value']))
+            elif slug == 'load-model' and forms.get('model', {}).get(
+                    'value'):
+                model_ids.add(self._get_resource_key(forms['model']['value']))
+
+        requests = [(self.workflow['data_source_cache'], ds_id,
+                     limonero_service.get_data_source_info)
+                    for ds_id in data_source_ids]
+        requests.extend([(self.workflow['model_cache'], model_id,
+                          limonero_service.get_model_info)
+                         for model_id in model_ids])
+        if not requests:
+            return
+
+        url = limonero_config['url']
+        token = str(limonero_config['auth_token'])
+        max_workers = self.config['juicer'].get('service_client', {}).get(
+            'max_workers', 8)
+
+        def _retrieve(request):
+            cache, resource_id, fn = request
+            try:
+                cache[resource_id] = fn(url, token, resource_id)
+            except Exception as ex:
+                self.log.warning(
+                    _('Unable to retrieve resource %s from Limonero: %s'),
+                    resource_id, ex)
+
+        with ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, len(requests)))) as pool:
+            list(pool.map(_retrieve, requests))
+
     def _build_initial_workflow_graph(self):
         """ Builds a graph with the tasks """
 
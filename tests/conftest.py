@@ -5,6 +5,7 @@ import gettext
 import os
 import sys
 
+import mock
 import pytest
 
 sys.path.append(os.path.dirname(os.path.curdir))
@@ -18,6 +19,14 @@ def pytest_sessionstart(session):
     t.install()
 
 
+@pytest.fixture(autouse=True)
+def clear_service_cache():
+    """ Cached responses from services must not leak between tests """
+    from juicer.service import http_client
+    http_client.response_cache.clear()
+    yield
+
+
 # Mock for Limonero services
 def patched_get_data_source_info(base_url, token, data_source_id):
     return {
@@ -34,3 +43,31 @@ def app(request):
         'TESTING': True,
     }
     yield settings_override
+
+
+@pytest.fixture
+def spark_ext():
+    """
+    Module juicer.spark.ext imported without Spark (pyspark modules are
+    mocks), used to test code that does not depend on Spark (e.g. pandas
+    UDFs functions and tuning logic).
+    """
+    modules = dict((name, mock.MagicMock()) for name in (
+        'pyspark', 'pyspark.ml', 'pyspark.ml.param', 'pyspark.ml.param.shared',
+        'pyspark.ml.tuning', 'pyspark.ml.util', 'pyspark.ml.wrapper',
+        'pyspark.sql', 'pyspark.sql.window'))
+    # Base classes of transformers defined by the module
+    for module, names in [('pyspark.ml', ['Transformer']),
+                          ('pyspark.ml.param.shared',
+                           ['HasOutputCol', 'HasFeaturesCol']),
+                          ('pyspark.ml.util',
+                           ['JavaMLWritable', 'JavaMLReadable']),
+                          ('pyspark.ml.wrapper', ['JavaTransformer'])]:
+        for name in names:
+            setattr(modules[module], name, type(name, (object,), {}))
+    with mock.patch.dict('sys.modules', modules):
+        for name in [n for n in sys.modules if n.startswith(
+                'juicer.spark.ext')]:
+            sys.modules.pop(name)
+        from juicer.spark import ext
+        yield ext
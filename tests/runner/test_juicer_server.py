@@ -481,6 +481,75 @@ def test_runner_minion_termination():
         assert len(server.active_minions) == 0
 
 
+def test_runner_minion_pool_success():
+    config = {
+        'juicer': {
+            'servers': {
+                'redis_url': "nonexisting.mock"
+            },
+            'minion': {
+                'pool': {'size': {'spark': 1}, 'check_interval': 1}
+            }
+        }
+    }
+    app_id = '1'
+    workflow_id = '1000'
+    workflow = {
+        'workflow_id': workflow_id,
+        'app_id': app_id,
+        'type': 'execute',
+        'cluster': {},
+        'workflow': {}
+    }
+
+    with mock.patch('redis.StrictRedis',
+                    mock_strict_redis_client) as mocked_redis:
+        with mock.patch('subprocess.Popen') as mocked_popen:
+            mocked_popen.return_value.pid = 1
+            mocked_popen.return_value.poll.return_value = None
+            server = JuicerServer(config, 'faked_minions.py',
+                                  config_file_path='config.yaml')
+            mocked_redis_conn = mocked_redis()
+            state_control = StateControlRedis(mocked_redis_conn)
+            server.state_control = state_control
+
+            # Starts an idle minion
+            server._maintain_minion_pool()
+            assert server.minion_pool.size() == 1
+            cmd = mocked_popen.call_args_list[0][0][0]
+            assert cmd[:4] == ['nohup', sys.executable, 'faked_minions.py',
+                               '--pool']
+            assert cmd[5:] == ['-t', 'spark', '-c', 'config.yaml']
+            pool_id = cmd[4]
+
+            # Pool is full, no new minion
+            server._maintain_minion_pool()
+            assert mocked_popen.call_count == 1
+
+            # Idle minion is ready (health check)
+            state_control.set_pool_minion_status(pool_id, json.dumps(
+                {'status': 'IDLE', 'pid': 1}))
+
+            state_control.push_start_queue(json.dumps(workflow))
+            server.read_start_queue(mocked_redis_conn)
+
+            # Idle minion was assigned to the app, no new process
+            assert mocked_popen.call_count == 1
+            assert server.minion_pool.size() == 0
+            assert json.loads(state_control.pop_pool_queue(pool_id)) == {
+                'workflow_id': workflow_id, 'app_id': app_id}
+            assert json.loads(state_control.get_minion_status(app_id)) == {
+                'pid': 1, 'port': 36000}
+            assert server.active_minions[(workflow_id, app_id)][
+                       'port'] == 36000
+            assert json.loads(state_control.pop_app_queue(app_id)) == workflow
+
+            # Pool is replenished, using another port
+            server._maintain_minion_pool()
+            assert mocked_popen.call_count == 2
+            assert server.minion_pool.ports() == [36001]
+
+
 def test_global_configuration():
     config = {
         'juicer': {
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import subprocess
+import sys
+
+import pytest
+from juicer.runner import minion
+from juicer.runner.startup_profile import StartupProfile
+
+
+def test_minion_backends_are_lazy_success():
+    # Importing the entry point must not import any minion implementation
+    code = ('import sys, juicer.runner.minion as m; '
+            'print([p for p in m.MINION_BACKENDS.values() '
+            'if p.rsplit(".", 1)[0] in sys.modules])')
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.strip() == b'[]'
+
+    with pytest.raises(ValueError):
+        minion.get_minion_class('unknown-platform')
+
+
+def test_startup_profile_success():
+    sys.modules.pop('colorsys', None)
+    profile = StartupProfile()
+    with profile.stage('test'):
+        import colorsys
+        assert colorsys is not None
+
+    assert len(profile.stages) == 1
+    name, elapsed, modules = profile.stages[0]
+    assert name == 'test'
+    assert elapsed >= 0
+    assert modules == 1
+    assert 'colorsys' in profile.import_times
+    assert profile.report()[0].startswith('test')
+
+    disabled = StartupProfile(enabled=False)
+    with disabled.stage('test'):
+        pass
+    assert disabled.stages == []
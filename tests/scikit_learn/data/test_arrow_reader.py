@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from juicer.scikit_learn.library import arrow_reader
+from juicer.scikit_learn.library.arrow_reader import (iter_csv, read_csv,
+                                                      read_parquet)
+
+CSV = b"""id,name,value,created
+1,Ana,1.5,2020-01-01 10:00:00
+2,Bia,NA,2020-01-02 11:00:00
+,Ana,3.5,2020-01-03 12:00:00
+"""
+ATTRIBUTES = {'id': 'INTEGER', 'name': 'CHARACTER', 'value': 'FLOAT',
+              'created': 'DATETIME'}
+
+
+def test_arrow_reader_csv_schema_success():
+    df = read_csv(BytesIO(CSV), attributes=ATTRIBUTES, categorical=True)
+    assert list(df.columns) == ['id', 'name', 'value', 'created']
+    assert str(df['id'].dtype) == 'Int32'
+    assert df['id'].isna().sum() == 1
+    assert df['value'].dtype == 'float32'
+    assert df['name'].dtype == 'category'
+    assert df['created'].dtype.kind == 'M'
+
+    # Not compact and in batches (chunks)
+    df = read_csv(BytesIO(CSV), attributes=ATTRIBUTES, compact=False,
+                  chunk_size_mb=0.0001)
+    assert len(df) == 3
+    assert str(df['id'].dtype) == 'Int64'
+    assert df['value'].dtype == 'float64'
+
+
+def test_arrow_reader_projection_success():
+    df = read_csv(BytesIO(CSV), attributes=ATTRIBUTES, columns=['value'])
+    assert list(df.columns) == ['value']
+
+    df = read_csv(BytesIO(CSV.split(b'\n', 1)[1]), header=False,
+                  columns=['col_1'])
+    assert list(df.columns) == ['col_1']
+    assert list(df['col_1']) == ['Ana', 'Bia', 'Ana']
+
+    f = BytesIO()
+    pq.write_table(pa.Table.from_pandas(
+        pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']})), f,
+        row_group_size=2)
+    f.seek(0)
+    df = read_parquet(f, columns=['b'], chunked=True)
+    assert list(df.columns) == ['b']
+    assert list(df['b']) == ['x', 'y', 'z']
+
+
+@pytest.fixture
+def old_pyarrow(monkeypatch):
+    """ Features not available in pyarrow 0.17 (requirements.txt) """
+    monkeypatch.setattr(arrow_reader, 'HAS_ENCODING', False)
+    monkeypatch.setattr(arrow_reader, 'HAS_INVALID_ROW_HANDLER', False)
+    monkeypatch.setattr(arrow_reader, 'HAS_STREAMING', False)
+
+
+def test_arrow_reader_pandas_fallback_success(old_pyarrow):
+    invalid = CSV + b'4,Caio,1.0,2020-01-04 10:00:00,extra\n'
+    df = read_csv(BytesIO(invalid), attributes=ATTRIBUTES, fail_fast=False,
+                  categorical=True)
+    assert len(df) == 3
+    assert str(df['id'].dtype) == 'Int32'
+    assert df['id'].isna().sum() == 1
+    assert df['value'].dtype == 'float32'
+    assert df['name'].dtype == 'category'
+    assert df['created'].dtype.kind == 'M'
+
+    latin1 = CSV.decode('utf8').replace('Bia', 'Bião').encode('latin1')
+    df = read_csv(BytesIO(latin1), attributes=ATTRIBUTES, encoding='latin1',
+                  columns=['name'])
+    assert list(df.columns) == ['name']
+    assert list(df['name']) == ['Ana', 'Bião', 'Ana']
+
+    # Batches are read by pandas
+    frames = list(iter_csv(BytesIO(CSV.split(b'\n', 1)[1]), header=False,
+                           columns=['col_1'], chunk_size_mb=0.0002))
+    assert len(frames) == 2
+    assert [list(f.columns) for f in frames] == [['col_1'], ['col_1']]
+    assert list(pd.concat(frames)['col_1']) == ['Ana', 'Bia', 'Ana']
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import scipy.sparse
+from juicer.scikit_learn.library.vector_array import (VectorArray,
+                                                      VectorDtype,
+                                                      arrow_types_mapper)
+
+
+def test_vector_array_dense_success():
+    matrix = np.arange(8, dtype=np.float64).reshape(4, 2)
+    df = pd.DataFrame({'id': [1, 2, 3, 4]}, index=[10, 11, 12, 13])
+    df['features'] = VectorArray(matrix)
+
+    assert str(df['features'].dtype) == 'vector'
+    assert np.array_equal(df['features'].array.to_matrix(), matrix)
+    assert list(df['features'].iloc[1]) == [2.0, 3.0]
+    assert df.equals(df.copy())
+
+    # Filtering and concatenation keep the 2-D representation
+    selected = pd.concat([df[df['id'] > 2], df.head(1)])
+    assert np.array_equal(selected['features'].array.to_matrix(),
+                          [[4, 5], [6, 7], [0, 1]])
+
+    # Missing rows (e.g. outer joins)
+    joined = df.merge(pd.DataFrame({'id': [1, 5]}), how='right')
+    assert joined['features'].isna().tolist() == [False, True]
+    assert len(joined.dropna()) == 1
+
+
+def test_vector_array_sparse_success():
+    matrix = scipy.sparse.random(5, 20, density=0.1, format='csr',
+                                 random_state=1)
+    df = pd.DataFrame({'id': range(5)})
+    df['features'] = VectorArray(matrix)
+
+    vectors = df['features'].array
+    assert vectors.is_sparse
+    assert vectors.nbytes < 5 * 20 * 8
+    assert np.array_equal(df['features'].iloc[2], matrix[2].toarray()[0])
+    assert (df.iloc[[4, 0]]['features'].array.to_matrix() !=
+            matrix[[4, 0]]).nnz == 0
+
+
+def test_vector_array_arrow_success():
+    df = pd.DataFrame({'id': [1, 2, 3]})
+    df['features'] = VectorArray._from_sequence(
+        [[1.0, 2.0], None, np.array([3.0, 4.0])])
+
+    table = pa.Table.from_pandas(df)
+    assert pa.types.is_fixed_size_list(table.schema.field('features').type)
+
+    result = table.to_pandas(types_mapper=arrow_types_mapper)
+    assert str(result['features'].dtype) == 'vector'
+    assert result['features'].isna().tolist() == [False, True, False]
+    assert list(result['features'].iloc[2]) == [3.0, 4.0]
+
+    # Slices of Arrow arrays (offset and validity bitmap)
+    vectors = VectorArray(np.arange(20, dtype=np.float64).reshape(10, 2),
+                          mask=[i % 3 == 0 for i in range(10)])
+    sliced = VectorDtype().__from_arrow__(
+        vectors.__arrow_array__().slice(4, 5))
+    assert sliced.isna().tolist() == [False, False, True, False, False]
+    assert np.array_equal(sliced.to_matrix()[0], [8.0, 9.0])
+    assert np.array_equal(sliced.to_matrix()[4], [16.0, 17.0])
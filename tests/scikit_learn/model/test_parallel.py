@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pytest
+from juicer.scikit_learn.library import parallel
+from juicer.scikit_learn.model_operation import CrossValidationOperation
+from sklearn.model_selection import KFold, cross_validate
+from sklearn.tree import DecisionTreeClassifier
+from tests.scikit_learn import util
+
+
+@pytest.fixture
+def max_jobs():
+    yield parallel.configure
+    parallel.configure(None)
+
+
+def test_parallel_n_jobs_success(max_jobs):
+    cores = os.cpu_count()
+    max_jobs(None)
+    assert parallel.get_n_jobs() == cores
+    assert parallel.get_n_jobs(-1) == cores
+
+    max_jobs(1)
+    assert parallel.get_n_jobs() == 1
+    assert parallel.get_n_jobs(4) == 1
+    with parallel.parallel_context():
+        from joblib.parallel import get_active_backend
+        assert get_active_backend()[1] == 1
+
+
+def test_cross_validation_fold_models_success(max_jobs):
+    max_jobs(2)
+    df = util.iris(['sepallength', 'sepalwidth', 'petalwidth',
+                    'petallength', 'class'])
+    instance = CrossValidationOperation(
+        parameters={'evaluator': 'accuracy', 'folds': 3, 'seed': 7,
+                    'features': ['sepallength', 'sepalwidth', 'petalwidth',
+                                 'petallength'],
+                    'label_attribute': ['class']},
+        named_inputs={'algorithm': 'algo', 'input data': 'df'},
+        named_outputs={'scored data': 'out', 'models': 'models_out',
+                       'best model': 'best'})
+    code = instance.generate_code()
+    assert 'cross_validate(' in code
+    assert '.fit(' not in code
+
+    namespace = {
+        'np': np, 'KFold': KFold, 'cross_validate': cross_validate,
+        'get_n_jobs': parallel.get_n_jobs,
+        'get_X_train_data': lambda data, cols: data[cols].to_numpy(),
+        'get_label_data': lambda data, cols: data[cols[0]].to_numpy(),
+        'algo': DecisionTreeClassifier(random_state=1), 'df': df}
+    exec(code, namespace)
+
+    # One (distinct) model for each fold, the best one is kept
+    models = namespace['models_out']
+    assert len(models) == 3
+    assert len(set(id(m) for m in models)) == 3
+    assert namespace['best'] is models[int(np.argmax(namespace['scores']))]
+    assert len(namespace['out']['prediction']) == len(df)
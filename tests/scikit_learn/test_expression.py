@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import string
+
+import numpy as np
+import pandas as pd
+from juicer.scikit_learn.expression import Expression
+
+
+def _identifier(name):
+    return {'type': 'Identifier', 'name': name}
+
+
+def _literal(value):
+    return {'type': 'Literal', 'value': value, 'raw': repr(value)}
+
+
+def _call(name, *arguments):
+    return {'type': 'CallExpression', 'callee': {'type': 'Identifier',
+                                                 'name': name},
+            'arguments': list(arguments)}
+
+
+def _eval(code, df):
+    return eval(code, {'df': df, 'np': np, 'pd': pd, 'string': string})
+
+
+def test_vectorized_expression_success():
+    df = pd.DataFrame({'x': [1.0, 2.0, 3.0], 'name': [' a', 'b ', 'c']})
+    json_code = {
+        'type': 'BinaryExpression', 'operator': '*',
+        'left': _call('sqrt', _identifier('x')),
+        'right': {'type': 'BinaryExpression', 'operator': '+',
+                  'left': _identifier('x'), 'right': _literal(1)}}
+    expr = Expression(json_code, {'input': 'df'})
+    assert expr.vectorized_expression == \
+        "(np.sqrt(df['x']) * (df['x'] + 1))"
+    assert 'apply' not in expr.vectorized_expression
+    np.testing.assert_allclose(_eval(expr.vectorized_expression, df),
+                               np.sqrt(df['x']) * (df['x'] + 1))
+
+    expr = Expression(_call('upper', _call('strip', _identifier('name'))),
+                      {'input': 'df'})
+    assert expr.vectorized_expression == \
+        "df['name'].str.strip().str.upper()"
+    assert list(_eval(expr.vectorized_expression, df)) == ['A', 'B', 'C']
+
+    json_code = {'type': 'ConditionalExpression',
+                 'test': {'type': 'BinaryExpression', 'operator': '>',
+                          'left': _identifier('x'), 'right': _literal(1)},
+                 'consequent': _literal('big'),
+                 'alternate': _literal('small')}
+    expr = Expression(json_code, {'input': 'df'})
+    assert list(_eval(expr.vectorized_expression, df)) == [
+        'small', 'big', 'big']
+
+
+def test_vectorized_expression_fallback_success():
+    df = pd.DataFrame({'x': [1.0, 4.0], 'd': [1, 2]})
+    json_code = {'type': 'BinaryExpression', 'operator': '+',
+                 'left': _call('sqrt', _identifier('x')),
+                 'right': _call('timedelta', _identifier('d'))}
+    expr = Expression(json_code, {'input': 'df'})
+    # Only the function without column-wise version is evaluated by row
+    assert expr.vectorized_expression == (
+        "(np.sqrt(df['x']) + "
+        "df.apply(lambda row: datetime.timedelta(row['d']), axis=1))")
+
+    # Expressions without columns are not vectorized
+    expr = Expression(_call('sqrt', _literal(4)), {'input': 'df'})
+    assert expr.vectorized_expression is None
+    assert expr.parsed_expression == 'lambda row:  np.sqrt(4)'
+
+
+def test_vectorized_expression_numpy_non_ufunc_success():
+    df = pd.DataFrame({'a': [1, 2, 3], 'b': [1, 0, 3]})
+    # array_equiv returns one value for whole arrays, so it is evaluated by
+    # row (element-wise functions, such as clip, are applied to columns)
+    expr = Expression(_call('array_equiv', _identifier('a'), _identifier('b')),
+                      {'input': 'df'})
+    assert 'apply' in expr.vectorized_expression
+    assert list(_eval(expr.vectorized_expression, df)) == [True, False, True]
+
+    expr = Expression(_call('clip', _identifier('a'), _literal(1),
+                            _literal(2)), {'input': 'df'})
+    assert expr.vectorized_expression == "np.clip(df['a'], 1, 2)"
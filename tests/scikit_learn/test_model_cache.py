@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import io
+import os
+import pickle
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from juicer.scikit_learn import model_cache
+from juicer.scikit_learn.model_cache import SklearnModelCache
+from sklearn.linear_model import LinearRegression
+
+
+class LocalFs(object):
+    """ Local file system with the interface of pyarrow HDFS connection """
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def info(self, path):
+        stat = os.stat(path)
+        return {'size': stat.st_size, 'last_modified': stat.st_mtime_ns}
+
+    def open(self, path, mode):
+        return ArrowFile(pa.OSFile(path, mode))
+
+
+class ArrowFile(object):
+    """
+    Arrow file as in the pinned pyarrow (0.17), where readline() of
+    NativeFile (e.g. HDFS files) is not implemented
+    """
+
+    def __init__(self, native_file):
+        self.native_file = native_file
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.native_file.close()
+
+    def read(self, size=None):
+        return self.native_file.read(size)
+
+    def read_buffer(self, size=None):
+        return self.native_file.read_buffer(size)
+
+    def readline(self, size=None):
+        raise io.UnsupportedOperation()
+
+
+@pytest.fixture
+def cache():
+    yield model_cache.configure
+    model_cache.configure(None)
+
+
+def _save(path, coef, mtime):
+    model = LinearRegression().fit(np.arange(10).reshape(-1, 1),
+                                   np.arange(10) * coef)
+    with open(path, 'wb') as f:
+        # Default protocol in Python 3.6 (SaveModel)
+        pickle.dump(model, f, protocol=3)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_model_cache_lru_success():
+    cache = SklearnModelCache(max_entries=2, max_memory_mb=1)
+    loads = []
+
+    def loader(name):
+        return lambda: loads.append(name) or name
+
+    assert cache.get(1, 'v1', loader('m1')) == 'm1'
+    assert cache.get(1, 'v1', loader('m1')) == 'm1'
+    assert cache.get(2, 'v1', loader('m2')) == 'm2'
+    assert loads == ['m1', 'm2']
+
+    # A new version replaces the previous one
+    assert cache.get(1, 'v2', loader('m1.2')) == 'm1.2'
+    assert (1, 'v1') not in cache and len(cache) == 2
+
+    # Least recently used is evicted (number of entries and memory)
+    cache.get(3, 'v1', loader('m3'))
+    assert (2, 'v1') not in cache
+    cache.get(4, 'v1', loader('m4'), size=1024 * 1024 + 1)
+    assert len(cache) == 1
+    assert cache.stats()['evictions'] == 3
+    assert cache.stats()['hits'] == 1
+
+    cache.clear()
+    assert len(cache) == 0 and cache.memory == 0
+
+
+def test_model_cache_load_model_success(tmpdir, cache):
+    path = str(tmpdir.join('model.pkl'))
+    _save(path, 2, 10 ** 18)
+    disk_dir = tmpdir.join('disk')
+    cache({'disk_dir': str(disk_dir)})
+
+    fs = LocalFs()
+    model = model_cache.load_model(7, path, fs)
+    assert model.predict([[3]])[0] == pytest.approx(6)
+    # Cached: a copy sharing fitted data
+    other = model_cache.load_model(7, path, fs)
+    assert other is not model and other.coef_ is model.coef_
+    other.set_params(fit_intercept=False)
+    assert model.fit_intercept
+    assert len(disk_dir.listdir()) == 1
+
+    # Model saved again (same id)
+    _save(path, 3, 2 * 10 ** 18)
+    model = model_cache.load_model(7, path, fs)
+    assert model.predict([[3]])[0] == pytest.approx(9)
+    assert len(disk_dir.listdir()) == 1
+
+    # Another minion reads the local copy (memory mapped)
+    other = cache({'disk_dir': str(disk_dir)})
+    os.remove(path)
+    _save(path, 4, 2 * 10 ** 18)
+    model = model_cache.load_model(7, path, fs)
+    assert model.predict([[3]])[0] == pytest.approx(9)
+    assert other.stats()['misses'] == 1
+
+    with pytest.raises(ValueError):
+        model_cache.load_model(8, str(tmpdir.join('missing.pkl')), fs)
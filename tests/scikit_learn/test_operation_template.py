@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse
+from juicer.scikit_learn.library.vector_array import VectorArray
+from juicer.scikit_learn.model_operation import ApplyModelOperation
+from juicer.scikit_learn.regression_operation import \
+    IsotonicRegressionOperation
+from sklearn.isotonic import IsotonicRegression
+from tests.scikit_learn import util
+
+TEMPLATE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)))),
+    'juicer', 'scikit_learn', 'templates', 'operation.tmpl')
+
+
+@pytest.fixture(scope='module')
+def helpers():
+    """ Functions defined by the template of generated code """
+    with open(TEMPLATE) as f:
+        template = f.read()
+    source = re.search(r'^def get_X_train_data.*?(?=^executor = )',
+                       template, re.M | re.S).group(0)
+    namespace = {'np': np, 'VectorArray': VectorArray}
+    exec(source, namespace)
+    return namespace
+
+
+def test_get_x_train_data_single_column_success(helpers):
+    df = util.iris(['sepallength', 'sepalwidth'], size=10)
+    for features in (['sepallength'], 'sepallength'):
+        X = helpers['get_X_train_data'](df, features)
+        assert X.shape == (10, 1) and X.dtype == np.float64
+        assert X.flags['C_CONTIGUOUS']
+        assert np.array_equal(X[:, 0], df['sepallength'].to_numpy())
+
+    X = helpers['get_X_train_data'](df, ['sepallength', 'sepalwidth'])
+    assert np.array_equal(X, df.to_numpy())
+
+
+def test_get_x_train_data_vector_column_success(helpers):
+    df = pd.DataFrame({'x': [1., 2., 3.],
+                       'v': [[1., 0.], [0., 1.], [1., 1.]]})
+    X = helpers['get_X_train_data'](df, ['x', 'v'])
+    assert np.array_equal(X, [[1, 1, 0], [2, 0, 1], [3, 1, 1]])
+
+    # Scalar columns come first (as in previous versions)
+    df['v'] = VectorArray(np.array([[1., 0.], [0., 1.], [1., 1.]]))
+    X = helpers['get_X_train_data'](df, ['v', 'x'])
+    assert np.array_equal(X, [[1, 1, 0], [2, 0, 1], [3, 1, 1]])
+
+
+def test_get_x_train_data_sparse_column_success(helpers):
+    rows = [scipy.sparse.csr_matrix([[1., 0., 2.]]),
+            scipy.sparse.csr_matrix([[0., 3., 0.]])]
+    df = pd.DataFrame({'x': [5., 6.], 'v': rows})
+    X = helpers['get_X_train_data'](df, ['x', 'v'])
+    assert scipy.sparse.isspmatrix_csr(X)
+    assert np.array_equal(X.toarray(), [[5, 1, 0, 2], [6, 0, 3, 0]])
+
+
+def test_get_label_data_success(helpers):
+    df = pd.DataFrame({'label': [0, 1, 1], 'v': [[1], [2], [3]]})
+    y = helpers['get_label_data'](df, ['label'])
+    assert y.ndim == 1 and np.array_equal(y, [0, 1, 1])
+
+    with pytest.raises(ValueError):
+        helpers['get_label_data'](df, ['label', 'v'])
+    with pytest.raises(ValueError):
+        helpers['get_label_data'](df, ['v'])
+
+
+def test_isotonic_regression_single_feature_success(helpers):
+    df = util.iris(['sepallength', 'petallength'], size=20)
+    instance = IsotonicRegressionOperation(
+        parameters={'features': ['sepallength'], 'label': ['petallength']},
+        named_inputs={'train input data': 'df'},
+        named_outputs={'output data': 'out', 'model': 'model'})
+    namespace = dict(helpers, IsotonicRegression=IsotonicRegression, df=df)
+    exec(instance.generate_code(), namespace)
+    # scikit-learn < 0.24 only accepts 1-D input
+    assert namespace['X_train'].ndim == 1
+    assert len(namespace['out']['prediction']) == 20
+
+    # Saved model applied to new data
+    instance = ApplyModelOperation(
+        parameters={'features': ['sepallength']},
+        named_inputs={'input data': 'df', 'model': 'model'},
+        named_outputs={'output data': 'applied'})
+    exec(instance.generate_code(), namespace)
+    assert namespace['X_train'].ndim == 1
+    assert np.allclose(namespace['applied']['prediction'],
+                       namespace['out']['prediction'])
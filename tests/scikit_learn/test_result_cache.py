@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import datetime
+
+import mock
+import pandas as pd
+from juicer.scikit_learn.result_cache import TaskResultCache
+from juicer.scikit_learn.scikit_learn_minion import ScikitLearnMinion
+from mockredis import mock_strict_redis_client
+
+
+def _df(rows):
+    return pd.DataFrame({'id': list(range(rows)),
+                         'name': ['row {}'.format(i) for i in range(rows)]})
+
+
+def test_result_cache_memory_spill_success(tmpdir):
+    cache = TaskResultCache(max_memory_mb=1, spill_dir=str(tmpdir))
+    cache.attach(1)
+
+    df1 = _df(30000)
+    now = datetime.datetime(2020, 1, 1, 10, 30)
+    cache['task1'] = [{'output data': df1, 'time': 1, 'task_name': 'T1',
+                       'execution_date': now}, 'hash1']
+    cache['task2'] = [{'output data': _df(30000), 'time': 1}, 'hash2']
+
+    # task1 was evicted (memory limit) and spilled
+    assert cache.stats()['evictions'] == 1
+    assert tmpdir.join('workflow_1', 'hash1').check(dir=True)
+
+    # A new minion reads results spilled by the previous one
+    other = TaskResultCache(spill_dir=str(tmpdir))
+    other.attach(1)
+    assert 'task1' in other
+    results, task_hash = other['task1']
+    assert task_hash == 'hash1'
+    assert results['task_name'] == 'T1'
+    assert results['execution_date'] == now
+    pd.testing.assert_frame_equal(results['output data'], df1)
+
+
+def test_result_cache_non_frame_not_spilled_success(tmpdir):
+    cache = TaskResultCache(max_entries=1, spill_dir=str(tmpdir))
+    cache.attach(2)
+    cache['task1'] = [{'model': object(), 'time': 1}, 'hash1']
+    cache['task2'] = [{'output data': _df(10), 'time': 1}, 'hash2']
+    cache.flush()
+
+    assert 'task1' not in cache
+    assert cache.stats()['spilled'] == 1
+
+
+def test_result_cache_replace_value_twice_success():
+    # Results of a task read from the cache in two runs of the next task
+    # (partial executions) must not be changed by it
+    from juicer.scikit_learn.etl_operation import ReplaceValuesOperation
+    cache = TaskResultCache()
+    df = _df(5)
+    cache['task1'] = [{'output data': df, 'time': 1}, 'hash1']
+    instance = ReplaceValuesOperation(
+        parameters={'value': 'row 1', 'replacement': 'replaced',
+                    'attributes': ['name']},
+        named_inputs={'input data': 'df'},
+        named_outputs={'output data': 'out'})
+    code = instance.generate_code()
+
+    for _ in range(2):
+        namespace = {'df': cache['task1'][0]['output data']}
+        exec(code, namespace)
+        assert namespace['out']['name'].tolist()[1] == 'replaced'
+    pd.testing.assert_frame_equal(cache['task1'][0]['output data'], _df(5))
+
+
+def test_result_cache_flushed_by_execute_process_success(tmpdir):
+    config = {'juicer': {
+        'servers': {'redis_url': 'redis://invalid:2923'},
+        'scikit_learn': {'result_cache': {'spill_dir': str(tmpdir)}}}}
+    minion = ScikitLearnMinion(mock_strict_redis_client(), 1, 2, config)
+    minion._state['task1'] = [{'output data': _df(10), 'time': 1}, 'hash1']
+
+    # SIGTERM handler runs in the main process, where results are not kept
+    with mock.patch.object(minion, '_generate_output'):
+        minion.terminate()
+    assert not tmpdir.join('workflow_1', 'hash1').check()
+
+    # Execute process reads the terminate message and flushes its results
+    queue = mock.Mock()
+    queue.empty.return_value = False
+    minion.execute(queue)
+    assert tmpdir.join('workflow_1', 'hash1').check(dir=True)
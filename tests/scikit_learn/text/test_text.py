@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+from juicer.scikit_learn.library.text import (generate_ngrams,
+                                              remove_stop_words, tokenize)
+
+TEXTS = pd.Series(['The quick, brown fox!', None, "I don't like #python",
+                   ''], index=[10, 11, 12, 13])
+
+
+def test_text_tokenize_success():
+    tokens = tokenize(TEXTS)
+    assert tokens.dtype == object
+    assert tokens.index.tolist() == [10, 11, 12, 13]
+    assert tokens.isna().tolist() == [False, True, False, False]
+    assert tokens[10] == ['The', 'quick', 'brown', 'fox']
+    assert tokens[12] == ['I', "don't", 'like', '#python']
+    assert tokens[13] == []
+
+    # Regex is used as separator of tokens
+    tokens = tokenize(TEXTS, pattern=r'\s+', min_token_length=4)
+    assert tokens[10] == ['quick,', 'brown', 'fox!']
+    # Look-around
+    tokens = tokenize(TEXTS, pattern=r'(?<=e)\s')
+    assert tokens[12] == ["I don't like", '#python']
+
+
+def test_text_stop_words_ngrams_success():
+    tokens = tokenize(TEXTS)
+    result = remove_stop_words(tokens, ['the', 'I', ''])
+    assert result.tolist()[0] == ['quick', 'brown', 'fox']
+    assert result[12] == ["don't", 'like', '#python']
+    result = remove_stop_words(tokens, ['the', 'I'], case_sensitive=True)
+    assert result[10] == ['The', 'quick', 'brown', 'fox']
+
+    grams = generate_ngrams(tokens, 3)
+    assert grams[10] == ['The quick brown', 'quick brown fox']
+    assert grams.isna().tolist() == [False, True, False, False]
+    assert grams[13] == []
+
+    # Tokens of adjacent rows are not joined
+    tokens = pd.Series([['a', 'b', 'c'], ['d'], ['e', 'f']] * 5)
+    grams = generate_ngrams(tokens, 2)
+    assert grams.tolist()[:3] == [['a b', 'b c'], [], ['e f']]
+    assert grams.tolist()[-3:] == [['a b', 'b c'], [], ['e f']]
+
+    empty = pd.Series([], dtype=object)
+    assert tokenize(empty).tolist() == []
+    assert generate_ngrams(remove_stop_words(empty, ['a']), 2).tolist() == []
@@ -2,17 +2,18 @@
 
 
 class FakeResponse(object):
-    def __init__(self, status, text, args, kwargs):
+    def __init__(self, status, text, args, kwargs, headers=None):
         self.status_code = status
         self.text = text
         self.args = args
         self.kwargs = kwargs
+        self.headers = headers or {}
 
 
-def fake_req(status, text):
+def fake_req(status, text, headers=None):
     def g():
         def f(*args, **kwargs):
-            return FakeResponse(status, text, args, kwargs)
+            return FakeResponse(status, text, args, kwargs, headers)
 
         return f
 
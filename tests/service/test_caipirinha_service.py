@@ -16,7 +16,7 @@ def test_update_caipirinha_success():
         'id': 1,
         'name': 'Visualization'
     }
-    with patch.object(requests, 'post',
+    with patch.object(requests.Session, 'post',
                       new_callable=fake_req(200, json.dumps(text))):
         resp = caipirinha_service._update_caipirinha(
             "http://caipirinha", "/visualizations", "OK", 1,
@@ -27,7 +27,7 @@ def test_update_caipirinha_success():
     text = {
         'name': 'Visualization'
     }
-    with patch.object(requests, 'post',
+    with patch.object(requests.Session, 'post',
                       new_callable=fake_req(200, json.dumps(text))):
         resp = caipirinha_service._update_caipirinha(
             "http://caipirinha", "/visualizations", "OK", '',
@@ -39,7 +39,7 @@ def test_update_caipirinha_success():
 # noinspection PyProtectedMember, PyUnresolvedReferences
 def test_update_caipirinha_fail():
     text = "Not found"
-    with patch.object(requests, 'post',
+    with patch.object(requests.Session, 'post',
                       new_callable=fake_req(404, json.dumps(text))):
         with pytest.raises(RuntimeError):
             resp = caipirinha_service._update_caipirinha(
@@ -62,7 +62,7 @@ class VisualizationModel(object):
 
 # noinspection PyProtectedMember, PyUnresolvedReferences
 @patch('tests.service.test_caipirinha_service.emit')
-@patch('requests.post')
+@patch('requests.Session.post')
 def test_new_dashboard(mocked_post, mocked_emit):
     text = {
         'id': 1,
@@ -145,7 +145,7 @@ def test_new_dashboard(mocked_post, mocked_emit):
 
 # noinspection PyProtectedMember, PyUnresolvedReferences
 @patch('tests.service.test_caipirinha_service.emit')
-@patch('requests.post')
+@patch('requests.Session.post')
 def test_new_visualization(mocked_post, mocked_emit):
     text = {
         'id': 1,
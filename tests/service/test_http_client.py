@@ -0,0 +1,76 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import json
+
+from juicer.runner import configuration
+from juicer.service import http_client, tahiti_service
+from mock import patch
+from . import fake_req
+
+
+@patch('requests.Session.get')
+def test_get_cached_success(mocked_get):
+    text = [{'id': 1, 'slug': 'data-reader'}]
+    mocked_get.side_effect = fake_req(200, json.dumps(text))()
+
+    for _ in range(3):
+        resp = tahiti_service.query_tahiti('http://tahiti', 'operations',
+                                           '00000', '')
+        assert resp == text
+    assert mocked_get.call_count == 1
+    stats = http_client.response_cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 1
+
+
+@patch('requests.Session.get')
+def test_get_not_cached_without_ttl_success(mocked_get):
+    mocked_get.side_effect = fake_req(200, json.dumps({'id': 1}))()
+    configuration.set_config(
+        {'juicer': {'service_client': {'cache_ttl': {'tahiti': 0}}}})
+    try:
+        for _ in range(2):
+            tahiti_service.query_tahiti('http://tahiti', 'operations',
+                                        '00000', 1)
+    finally:
+        configuration.set_config(None)
+    assert mocked_get.call_count == 2
+
+
+@patch('requests.Session.get')
+def test_get_failure_not_cached(mocked_get):
+    mocked_get.side_effect = fake_req(500, 'Error')()
+    for _ in range(2):
+        http_client.get('http://limonero/datasources/1',
+                        {'X-Auth-Token': '0'}, 'limonero')
+    assert mocked_get.call_count == 2
+
+
+@patch('requests.Session.get')
+def test_get_revalidated_with_etag_success(mocked_get):
+    mocked_get.side_effect = fake_req(200, '{"id": 1}', {'ETag': '"v1"'})()
+    url = 'http://limonero/datasources/1'
+    headers = {'X-Auth-Token': '0'}
+    configuration.set_config(
+        {'juicer': {'service_client': {'cache_ttl': {'limonero': -1}}}})
+    try:
+        http_client.get(url, headers, 'limonero')
+
+        # Expired, but it has an ETag
+        mocked_get.side_effect = fake_req(304, '')()
+        resp = http_client.get(url, headers, 'limonero')
+    finally:
+        configuration.set_config(None)
+
+    assert resp.text == '{"id": 1}'
+    mocked_get.assert_called_with(
+        url, headers={'X-Auth-Token': '0', 'If-None-Match': '"v1"'})
+    assert http_client.response_cache.stats()['revalidations'] == 1
+
+
+def test_session_retry_returns_last_response_success():
+    # After retries, callers get the 5xx response (not a RetryError)
+    adapter = http_client.get_session().get_adapter('http://limonero')
+    retry = adapter.max_retries
+    assert 503 in retry.status_forcelist
+    assert retry.raise_on_status is False
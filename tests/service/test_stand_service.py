@@ -9,7 +9,7 @@ from mock import patch
 from . import fake_req
 
 
-@patch('requests.patch')
+@patch('requests.Session.patch')
 def test_job_source_code_success(mocked_patch):
     text = {
         'id': 1,
@@ -33,7 +33,7 @@ def test_job_source_code_success(mocked_patch):
         headers={'Content-Type': 'application/json', 'X-Auth-Token': '00000'})
 
 
-@patch('requests.patch')
+@patch('requests.Session.patch')
 def test_job_source_code_failure(mocked_patch):
     text = {
         'id': 1,
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import ast
+import datetime
 from textwrap import dedent
 
 import mock
@@ -105,9 +106,71 @@ def test_data_reader_minimal_parameters_success():
                             quote=None, encoding='UTF-8',
                             header=False, sep=',',
                             inferSchema=False, mode='FAILFAST')
-        {output}.cache()
         """.format(url=url, output='output_1'))
     expected_tree = ast.parse(expected_code)
     result, msg = compare_ast(generated_tree, expected_tree)
     assert result, msg + format_code_comparison(code, expected_code)
     # assert code == "output_1 = spark.read.csv('file', header=True, sep=',')"
+
+
+def test_data_reader_cache_policy_success():
+    def get_parameters(policy=None, execution_date=None):
+        parameters = {
+            'data_source': 1,
+            'configuration': {
+                'juicer': {
+                    'services': {
+                        'limonero': {
+                            'url': 'http://limonero:12345',
+                            'auth_token': 'zzzz'
+                        }
+                    },
+                    'transpiler': {
+                        'data_reader_cache': {'policy': policy,
+                                              'max_memory_mb': 100}
+                    }
+                }
+            },
+            'execution_date': execution_date,
+            'workflow': {'data_source_cache': {}}
+        }
+        if policy is None:
+            del parameters['configuration']['juicer']['transpiler']
+        return parameters
+
+    n_out = {'output data': 'output_1'}
+    with mock.patch('juicer.service.limonero_service.query_limonero',
+                    mock_query_limonero):
+        # Data used by a single task is not cached
+        instance = DataReaderOperation(get_parameters(), named_inputs={},
+                                       named_outputs=n_out)
+        instance.out_degree = 1
+        assert instance.get_cache_storage_level() is None
+        assert 'persist' not in instance.generate_code()
+
+        instance.out_degree = 2
+        assert instance.get_cache_storage_level() == \
+            DataReaderOperation.STORAGE_MEMORY_AND_DISK_SER
+        assert instance.generate_code().endswith(
+            'output_1.persist(StorageLevel(True, True, False, False))')
+
+        # Large data sources are cached in disk
+        instance.metadata['estimated_size_in_mega_bytes'] = 2000
+        assert instance.get_cache_storage_level() == \
+            DataReaderOperation.STORAGE_DISK_ONLY
+
+        # Reused by a new job
+        instance = DataReaderOperation(
+            get_parameters(execution_date=datetime.datetime.now()),
+            named_inputs={}, named_outputs=n_out)
+        instance.out_degree = 1
+        assert instance.get_cache_storage_level() is not None
+
+        instance = DataReaderOperation(get_parameters('never'),
+                                       named_inputs={}, named_outputs=n_out)
+        instance.out_degree = 2
+        assert instance.get_cache_storage_level() is None
+
+        instance = DataReaderOperation(get_parameters('always'),
+                                       named_inputs={}, named_outputs=n_out)
+        assert instance.get_cache_storage_level() is not None
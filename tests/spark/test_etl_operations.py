@@ -166,11 +166,11 @@ def test_clean_missing_minimal_params_success():
                                      named_outputs=n_out)
     code = instance.generate_code()
     expected_code = dedent("""
-    ratio_{input_1} = {input_1}.select(
+    stats_{input_1} = {input_1}.select(
         (functions.avg(functions.col('{attribute}').isNull().cast(
-        'int'))).alias('{attribute}')).collect()
-    attributes_{input_1} = [c for c in ["{attribute}"]
-                 if 0.0 <= ratio_{input_1}[0][c] <= 1.0]
+        'int'))).alias('ratio_0')).collect()[0]
+    attributes_{input_1} = [c for i, c in enumerate(["{attribute}"])
+                 if 0.0 <= stats_{input_1}['ratio_{{}}'.format(i)] <= 1.0]
     if len(attributes_input_1) > 0:
         {output_1} = {input_1}.na.drop(how='any', subset=attributes_{input_1})
     else:
@@ -216,11 +216,11 @@ def test_clean_missing_minimal_params_type_value_success():
                                      named_outputs=n_out)
     code = instance.generate_code()
     expected_code = dedent("""
-    ratio_{input_1} = {input_1}.select(
+    stats_{input_1} = {input_1}.select(
         (functions.avg(functions.col('{attribute}').isNull().cast(
-        'int'))).alias('{attribute}')).collect()
-    attributes_{input_1} = [c for c in ["{attribute}"]
-                 if 0.0 <= ratio_{input_1}[0][c] <= 1.0]
+        'int'))).alias('ratio_0')).collect()[0]
+    attributes_{input_1} = [c for i, c in enumerate(["{attribute}"])
+                 if 0.0 <= stats_{input_1}['ratio_{{}}'.format(i)] <= 1.0]
     if len(attributes_input_1) > 0:
         {output_1} = {input_1}.na.fill(value={value},
                 subset=attributes_{input_1})
@@ -242,6 +242,60 @@ def test_clean_missing_minimal_params_type_value_success():
     assert result, msg + format_code_comparison(code, expected_code)
 
 
+def test_clean_missing_statistics_single_pass_success():
+    params = {
+        CleanMissingOperation.ATTRIBUTES_PARAM: ['name', 'age'],
+        CleanMissingOperation.CLEANING_MODE_PARAM:
+            CleanMissingOperation.MEDIAN
+    }
+    n_in = {'input data': 'input_1'}
+    n_out = {'output result': 'output_1'}
+    instance = CleanMissingOperation(params, named_inputs=n_in,
+                                     named_outputs=n_out)
+    code = instance.generate_code()
+    # Medians ignore nulls of each attribute (not rows with any null)
+    expected_code = dedent("""\
+    # Computes statistics for all attributes in a single pass
+    stats_input_1 = input_1.select(
+        functions.expr('percentile_approx(`name`, 0.5, 10)').alias('median_0'),
+        functions.expr('percentile_approx(`age`, 0.5, 10)').alias('median_1')).collect()[0]
+    attributes_input_1 = ['name', 'age']
+    if len(attributes_input_1) > 0:
+        # Medians are computed by the aggregation of statistics
+        mdn_replace_input_1 = dict([
+            (c, float(stats_input_1['median_{}'.format(i)]))
+            for i, c in enumerate(['name', 'age'])
+            if c in attributes_input_1 and
+            stats_input_1['median_{}'.format(i)] is not None])
+        output_1 = input_1.na.fill(value=mdn_replace_input_1)
+    else:
+        output_1 = input_1
+    """)
+    result, msg = compare_ast(ast.parse(code), ast.parse(expected_code))
+    assert result, msg + format_code_comparison(code, expected_code)
+    assert code.count('.collect()') == 1
+
+    # Mean is computed by the same aggregation used for missing ratios
+    params[CleanMissingOperation.CLEANING_MODE_PARAM] = \
+        CleanMissingOperation.MEAN
+    params[CleanMissingOperation.MIN_MISSING_RATIO_PARAM] = "0.0"
+    params[CleanMissingOperation.MAX_MISSING_RATIO_PARAM] = "1.0"
+    instance = CleanMissingOperation(params, named_inputs=n_in,
+                                     named_outputs=n_out)
+    code = instance.generate_code()
+    assert code.count('.collect()') == 1
+    assert "functions.avg(functions.col('age')).alias('mean_1')" in code
+
+    # Modes of all attributes are computed by a single query
+    params[CleanMissingOperation.CLEANING_MODE_PARAM] = \
+        CleanMissingOperation.MODE
+    instance = CleanMissingOperation(params, named_inputs=n_in,
+                                     named_outputs=n_out)
+    code = instance.generate_code()
+    assert code.count('.collect()') == 2
+    assert 'groupBy' in code and 'for md_attr' not in code
+
+
 def test_clean_missing_missing_attribute_param_failure():
     params = {}
     with pytest.raises(ValueError):
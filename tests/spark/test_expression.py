@@ -306,3 +306,26 @@ def test_get_windows_function_success():
         expected_code))
     assert result, msg + format_code_comparison(expr.parsed_expression,
                                                 expected_code)
+
+
+def test_native_functions_instead_of_udf_success():
+    def call(name, *arguments):
+        return {"type": "CallExpression", "arguments": list(arguments),
+                "callee": {"type": "Identifier", "name": name}}
+
+    column = {"type": "Identifier", "name": "text"}
+    index = {"type": "Literal", "value": 2, "raw": "2"}
+
+    cases = [
+        (call('strip_accents', column),
+         "juicer_ext.strip_accents(functions.col('text'))"),
+        (call('strip_punctuation', column),
+         "juicer_ext.remove_punctuation(functions.col('text'))"),
+        (call('ith', column, index),
+         "juicer_ext.ith_function(functions.col('text'), 2)"),
+    ]
+    for json_code, expected_code in cases:
+        code = Expression(json_code, {}).parsed_expression
+        result, msg = compare_ast(ast.parse(code), ast.parse(expected_code))
+        assert result, msg + format_code_comparison(code, expected_code)
+        assert '_udf' not in code
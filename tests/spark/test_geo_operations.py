@@ -5,6 +5,8 @@ import ast
 import json
 from textwrap import dedent
 
+import pandas as pd
+import pytest
 from juicer.spark.data_operation import DataReaderOperation
 from juicer.spark.geo_operation import ReadShapefile, GeoWithin
 from mock import patch
@@ -75,91 +77,40 @@ def test_geo_within_success():
     instance = GeoWithin(params, named_inputs=n_in, named_outputs=n_out)
     code = instance.generate_code()
     expected_code = dedent("""
-        from matplotlib.path import Path
-        import pyqtree
-        attributes_to_add = {attributes}
-
-        schema = [s.name for s in {geo}.schema]
-        shp_object = {geo}.select(attributes_to_add +
-                ['{points}']).collect()
-        bcast_shapefile = spark_session.sparkContext.broadcast(shp_object)
-
-        f_min = functions.udf(
-               lambda v, index: min([item[index] for item in v]),
-                   types.DoubleType())
-        f_max = functions.udf(
-            lambda v, index: max([item[index] for item in v]),
-                types.DoubleType())
-
-        boundaries = {geo}.select(
-            (f_min('{points}', functions.lit(1))).alias('x_min'),
-            (f_min('{points}', functions.lit(0))).alias('y_min'),
-            (f_max('{points}', functions.lit(1))).alias('x_max'),
-            (f_max('{points}', functions.lit(0))).alias('y_max'),
-        ).collect()
-
-        global_min_x = float('+inf')
-        global_min_y = float('+inf')
-        global_max_x = float('-inf')
-        global_max_y = float('-inf')
-
-        to_update = []
-        for inx, row in enumerate(boundaries):
-            x_min = row['x_min']
-            y_min = row['y_min']
-            x_max = row['x_max']
-            y_max = row['y_max']
-            to_update.append({{
-                'item': inx,
-                'bbox': [x_min, y_min, x_max, y_max]
-            }})
-            global_min_x = min(global_min_x, x_min)
-            global_min_y = min(global_min_y, y_min)
-            global_max_x = max(global_max_x, x_max)
-            global_max_y = max(global_max_y, y_max)
-
-        sp_index = pyqtree.Index(
-                bbox=[global_min_x, global_min_y, global_max_x, global_max_y])
-
-        for item in to_update:
-            sp_index.insert(**item)
-
-        broad_casted_sp_index = spark_session.sparkContext.broadcast(
-            sp_index)
-
-        def get_first_polygon(lat, lng):
-            x = float(lat)
-            y = float(lng)
-            bcast_index = broad_casted_sp_index.value
-            matches = bcast_index.intersect([x, y, x, y])
-            for shp_inx in matches:
-                row = bcast_shapefile.value[shp_inx]
-                p_polygon = Path(row['{points}'])
-                # Here it uses longitude, latitude
-                if p_polygon.contains_point([y, x]):
-                    return [c for c in row]
-            return [None] * len(bcast_shapefile.value[0])
-
-        udf_get_first_polygon = functions.udf(
-            get_first_polygon, types.ArrayType(types.StringType()))
-        within = input_1.withColumn(
-            "tmp_polygon_data", udf_get_first_polygon(functions.col('l'),
-                                                    functions.col('l')))
-        aliases = {aliases}
-        {output} = within.select(within.columns +
-            [within.tmp_polygon_data[i].alias(aliases.pop())
-                for i, col in enumerate(schema)
-                if col in attributes_to_add])
-        {output} = {output}.drop('tmp_polygon_data')
-
-           """.format(
-        aliases=json.dumps(
-            params[GeoWithin.POLYGON_ALIAS_COLUMN_PARAM].split(',')),
-        output=n_out['output data'], geo=n_in['geo data'],
-        points=params[GeoWithin.POLYGON_POINTS_COLUMN_PARAM][0],
-        attributes=params[
-            GeoWithin.POLYGON_ATTRIBUTES_COLUMN_PARAM]))
-
+        output_1 = juicer_ext.geo_within(
+            input_1, geo_data, 'l', 'l', 'polygon',
+            attributes=["attribute"],
+            aliases=["alias"],
+            grid_size=None)
+        """)
     result, msg = compare_ast(ast.parse(code), ast.parse(expected_code))
-
     assert result, msg + format_code_comparison(code, expected_code)
+
+    params[GeoWithin.GRID_SIZE_PARAM] = '0.5'
+    instance = GeoWithin(params, named_inputs=n_in, named_outputs=n_out)
+    assert 'grid_size=0.5)' in instance.generate_code()
+
+
+@pytest.fixture
+def point_in_polygon(spark_ext):
+    """ Function of the pandas UDF used by juicer_ext.geo_within """
+    pytest.importorskip('matplotlib')
+    spark_ext.functions.pandas_udf = lambda func, return_type: func
+    return spark_ext._get_point_in_polygon_udf()
+
+
+def test_geo_within_point_in_polygon_success(point_in_polygon):
+    # Points of polygons are (longitude, latitude)
+    rectangle = [[0., 0.], [10., 0.], [10., 5.], [0., 5.]]
+    triangle = [[20., 20.], [30., 20.], [20., 30.]]
+    lat = pd.Series([2., 8., 21., 29., 1., 2.])
+    lng = pd.Series([8., 2., 21., 29., 1., 8.])
+    polygon_id = pd.Series([1, 1, 2, 2, None, 2])
+    polygon = pd.Series([rectangle, rectangle, triangle, triangle, None,
+                         triangle])
+
+    result = point_in_polygon(lat, lng, polygon_id, polygon)
+    # Inside, outside (latitude and longitude swapped), inside, outside
+    # (bounding box only), no candidate polygon and first point tested
+    # against another polygon
+    assert result.tolist() == [True, False, True, False, False, False]
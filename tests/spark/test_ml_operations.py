@@ -25,7 +25,8 @@ from juicer.spark.ml_operation import VectorIndexOperation, \
     ClusteringOperation, ClusteringModelOperation, \
     LdaClusteringOperation, KMeansClusteringOperation, \
     GaussianMixtureClusteringOperation, TopicReportOperation, \
-    CollaborativeOperation, AlternatingLeastSquaresOperation
+    CollaborativeOperation, AlternatingLeastSquaresOperation, \
+    LoadModelOperation
 
 from tests import compare_ast, format_code_comparison
 
@@ -678,6 +679,7 @@ def test_cross_validation_partial_operation_success():
     expected_code = dedent("""
             grid_builder = tuning.ParamGridBuilder()
             estimator, param_grid, metric = {algorithm}
+            label_col = '{label}'
 
             for param_name, values in param_grid.items():
                 param = getattr(estimator, param_name)
@@ -688,31 +690,32 @@ def test_cross_validation_partial_operation_success():
                 labelCol=label_col,
                 metricName='{metric}')
 
+            features = 'features'
             estimator.setLabelCol(label_col)
+            estimator.setFeaturesCol(features)
             estimator.setPredictionCol('prediction')
 
-            cross_validator = tuning.CrossValidator(
-                 estimator=estimator,
-                 estimatorParamMaps=grid_builder.build(),
-                 evaluator=evaluator, numFolds=3)
-
-
-            cv_model = cross_validator.fit({input_data})
+            # Folds are materialized once and grid points are evaluated
+            # concurrently
+            cv_result = juicer_tuning.cross_validation(
+                {input_data}, None, estimator, grid_builder.build(),
+                evaluator, parallelism={parallelism}, num_folds={folds},
+                seed={seed}, strategy='{strategy}',
+                halving_factor=3, checkpoint=False)
+            cv_model, metrics, best_index, folds = cv_result
             fit_data = cv_model.transform({input_data})
-            best_model_1  = cv_model.bestModel
+            best_model_1 = cv_model.bestModel
             metric_result = evaluator.evaluate(fit_data)
-            # {evaluation} = metric_result
             {output} = fit_data
             models_task_1 = None
-
             """.format(
         algorithm=n_in['algorithm'],
         input_data=n_in['input data'],
-        evaluation='eval_1',
         output=outputs[0],
         metric=params[CrossValidationOperation.EVALUATOR_PARAM],
         label=params[CrossValidationOperation.LABEL_ATTRIBUTE_PARAM][0],
-        folds=params[CrossValidationOperation.NUM_FOLDS_PARAM]))
+        folds=params[CrossValidationOperation.NUM_FOLDS_PARAM],
+        parallelism=4, seed=None, strategy='grid'))
 
     result, msg = compare_ast(ast.parse(code), ast.parse(expected_code))
 
@@ -726,7 +729,10 @@ def test_cross_validation_complete_operation_success():
         'task_id': '2323-afffa-343bdaff',
         'operation_id': 2793,
         CrossValidationOperation.EVALUATOR_PARAM: 'weightedRecall',
-        CrossValidationOperation.LABEL_ATTRIBUTE_PARAM: ['label']
+        CrossValidationOperation.LABEL_ATTRIBUTE_PARAM: ['label'],
+        CrossValidationOperation.SEED_PARAM: '7',
+        CrossValidationOperation.PARALLELISM_PARAM: 2,
+        CrossValidationOperation.STRATEGY_PARAM: 'halving',
 
     }
     n_in = {'algorithm': 'algo1', 'input data': 'df_1', 'evaluator': 'ev_1'}
@@ -741,6 +747,7 @@ def test_cross_validation_complete_operation_success():
     expected_code = dedent("""
             grid_builder = tuning.ParamGridBuilder()
             estimator, param_grid, metric = {algorithm}
+            label_col = '{label}'
 
             for param_name, values in param_grid.items():
                 param = getattr(estimator, param_name)
@@ -751,27 +758,32 @@ def test_cross_validation_complete_operation_success():
                 labelCol=label_col,
                 metricName='{metric}')
 
+            features = 'features'
             estimator.setLabelCol(label_col)
+            estimator.setFeaturesCol(features)
             estimator.setPredictionCol('prediction')
 
-            cross_validator = tuning.CrossValidator(
-                estimator=estimator, estimatorParamMaps=grid_builder.build(),
-                evaluator=evaluator, numFolds={folds})
-            cv_model = cross_validator.fit({input_data})
+            # Folds are materialized once and grid points are evaluated
+            # concurrently
+            cv_result = juicer_tuning.cross_validation(
+                {input_data}, None, estimator, grid_builder.build(),
+                evaluator, parallelism={parallelism}, num_folds={folds},
+                seed={seed}, strategy='{strategy}',
+                halving_factor=3, checkpoint=False)
+            cv_model, metrics, best_index, folds = cv_result
             fit_data = cv_model.transform({input_data})
-            best_model_1  = cv_model.bestModel
+            best_model_1 = cv_model.bestModel
             metric_result = evaluator.evaluate(fit_data)
-            # {output} = metric_result
             {output} = fit_data
             models_task_1 = None
-
             """.format(
         algorithm=n_in['algorithm'],
         input_data=n_in['input data'],
         output=outputs[0],
         label=params[CrossValidationOperation.LABEL_ATTRIBUTE_PARAM][0],
         metric=params[CrossValidationOperation.EVALUATOR_PARAM],
-        folds=params[CrossValidationOperation.NUM_FOLDS_PARAM]))
+        folds=params[CrossValidationOperation.NUM_FOLDS_PARAM],
+        parallelism=2, seed=7, strategy='halving'))
 
     result, msg = compare_ast(ast.parse(code), ast.parse(expected_code))
 
@@ -1819,3 +1831,141 @@ def test_als_operation_success():
     result, msg = compare_ast(ast.parse(code), ast.parse(expected_code))
 
     assert result, msg + format_code_comparison(code, expected_code)
+
+
+def test_load_model_invalid_model_failure():
+    with pytest.raises(ValueError) as err:
+        LoadModelOperation({'model': 'abc'}, {}, {'model': 'model_1'})
+    assert 'Model not found' in str(err.value)
+
+
+'''
+ Tuning (juicer.spark.ext.tuning) tests, without Spark (stubs for data,
+ estimators and evaluators)
+'''
+
+
+class StubSplit(object):
+    def __init__(self, kind, fold):
+        self.kind = kind
+        self.fold = fold
+
+    def drop(self, col):
+        return self
+
+
+class StubColumn(object):
+    def __eq__(self, fold):
+        return 'validation', fold
+
+    def __ne__(self, fold):
+        return 'train', fold
+
+
+class StubData(object):
+    unpersisted = False
+
+    def __getitem__(self, name):
+        return StubColumn()
+
+    def filter(self, condition):
+        return StubSplit(*condition)
+
+    def unpersist(self):
+        self.unpersisted = True
+
+
+class StubModel(object):
+    def transform(self, validation, params):
+        return validation.fold, params['id']
+
+
+class StubEstimator(object):
+    def __init__(self):
+        self.fits = []
+
+    def fit(self, data, params):
+        self.fits.append((getattr(data, 'fold', 'all'), params['id']))
+        return StubModel()
+
+
+class StubEvaluator(object):
+    def __init__(self, metrics, larger_is_better):
+        # metrics[j][i]: metric of grid point j in fold i
+        self.metrics = metrics
+        self.larger_is_better = larger_is_better
+
+    # noinspection PyPep8Naming
+    def isLargerBetter(self):
+        return self.larger_is_better
+
+    def evaluate(self, transformed):
+        fold, j = transformed
+        return self.metrics[j][fold]
+
+
+@pytest.fixture
+def tuning(spark_ext, monkeypatch):
+    from juicer.spark.ext import tuning
+    data = StubData()
+    monkeypatch.setattr(tuning, 'materialize_folds',
+                        lambda df, num_folds, *args: (data, '_fold',
+                                                      num_folds))
+    monkeypatch.setattr(tuning, 'CrossValidatorModel',
+                        lambda model, avg_metrics, sub_models: avg_metrics)
+    monkeypatch.setattr(tuning, 'stub_data', data, raising=False)
+    return tuning
+
+
+def test_tuning_halving_rounds_success(tuning):
+    assert tuning._halving_rounds(1, 3) == [1]
+    assert tuning._halving_rounds(3, 3) == [1, 3]
+    assert tuning._halving_rounds(9, 3) == [1, 3, 9]
+    assert tuning._halving_rounds(10, 3) == [1, 2, 4, 10]
+    assert tuning._halving_rounds(4, 2) == [1, 2, 4]
+
+
+def test_tuning_grid_smaller_is_better_success(tuning):
+    estimator = StubEstimator()
+    params = [{'id': j} for j in range(3)]
+    # Smaller is better (e.g. rmse): grid point 1
+    evaluator = StubEvaluator([[.5, .5, .5], [.1, .3, .2], [.9, .1, .1]],
+                              larger_is_better=False)
+    avg_metrics, by_fold, best_index, folds = tuning.cross_validation(
+        'df', None, estimator, params, evaluator, parallelism=2, num_folds=3)
+
+    assert best_index == 1 and folds == 3
+    assert avg_metrics == pytest.approx([.5, .2, 1.1 / 3])
+    assert by_fold == [[.5, .1, .9], [.5, .3, .1], [.5, .2, .1]]
+    # All pairs (fold, grid point) and the best model with all data
+    assert sorted(estimator.fits[:-1]) == [
+        (i, j) for i in range(3) for j in range(3)]
+    assert estimator.fits[-1] == ('all', 1)
+    assert tuning.stub_data.unpersisted
+
+    # Larger is better (e.g. accuracy): grid point 0
+    evaluator.larger_is_better = True
+    result = tuning.cross_validation('df', None, StubEstimator(), params,
+                                     evaluator, num_folds=3)
+    assert result[2] == 0
+
+
+def test_tuning_halving_pruning_success(tuning):
+    estimator = StubEstimator()
+    params = [{'id': j} for j in range(4)]
+    # Rounds of 1 and 3 folds. After first fold, only the best
+    # ceil(4 / 3) = 2 grid points (smaller is better: 0 and 2) are kept,
+    # even if grid point 1 is the best one in other folds.
+    evaluator = StubEvaluator(
+        [[.1, .4, .4], [.5, 0., 0.], [.2, .2, .2], [.9, .9, .9]],
+        larger_is_better=False)
+    avg_metrics, by_fold, best_index, folds = tuning.cross_validation(
+        'df', None, estimator, params, evaluator, num_folds=3,
+        strategy=tuning.STRATEGY_HALVING, halving_factor=3)
+
+    assert best_index == 2
+    assert by_fold == [[.1, .5, .2, .9], [.4, .2], [.4, .2]]
+    # Pruned grid points are evaluated only in the first fold
+    assert avg_metrics == pytest.approx([.3, .5, .2, .9])
+    assert len(estimator.fits) == 4 + 2 * 2 + 1
+    assert estimator.fits[-1] == ('all', 2)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import mock
+from juicer.spark.result_cache import TaskResultCache, POLICY_COST
+
+
+def _fake_df(size=0, cached=True):
+    df = mock.MagicMock()
+    df.is_cached = cached
+    df.storageLevel.useMemory = True
+    df._jdf.queryExecution().optimizedPlan().stats().sizeInBytes() \
+        .toString.return_value = str(size)
+    return df
+
+
+def test_result_cache_lru_eviction_success():
+    cache = TaskResultCache(max_entries=2)
+    dfs = [_fake_df() for _ in range(3)]
+    for i, df in enumerate(dfs):
+        cache['task{}'.format(i)] = [{'output data': df, 'time': 1}, 'h']
+        if i == 1:
+            # Recently used entries are kept
+            assert cache['task0'][1] == 'h'
+
+    assert sorted(cache.keys()) == ['task0', 'task2']
+    assert 'task1' not in cache
+    assert cache.get('task1') is None
+    dfs[1].unpersist.assert_called_once_with()
+    assert not dfs[0].unpersist.called
+    assert cache.evictions == 1
+
+
+def test_result_cache_memory_cost_eviction_success():
+    cache = TaskResultCache(max_memory_mb=1, eviction_policy=POLICY_COST)
+    kb = 1024
+    # Cheap to recompute and large
+    cheap = _fake_df(600 * kb)
+    expensive = _fake_df(300 * kb)
+    shared = _fake_df(300 * kb)
+    cache.update({
+        'cheap': [{'out': cheap, 'time': 1}, 'h1'],
+        'expensive': [{'out': expensive, 'time': 100}, 'h2'],
+    })
+    assert cache.memory == 900 * kb
+    cache['new'] = [{'out': shared, 'time': 10}, 'h3']
+
+    assert sorted(cache.keys()) == ['expensive', 'new']
+    assert cache.memory == 600 * kb
+    cheap.unpersist.assert_called_once_with()
+
+    # DataFrame still used by other task is not unpersisted
+    cache['other'] = [{'out': shared, 'time': 10}, 'h4']
+    del cache['new']
+    assert not shared.unpersist.called
+
+    cache.clear(release=False)
+    assert len(cache) == 0
+    assert cache.memory == 0
+    assert not expensive.unpersist.called
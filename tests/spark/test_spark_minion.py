@@ -4,6 +4,7 @@ from __future__ import print_function
 
 import json
 import os
+import threading
 from textwrap import dedent
 
 import mock
@@ -818,6 +819,46 @@ def test_minion_terminate():
             assert not minion.is_spark_session_available()
 
 
+def test_minion_cancel_pending_job_success():
+    workflow_id = '6666'
+    app_id = '897447'
+    concurrent_config = {
+        'juicer': {
+            'servers': {
+                'redis_url': 'redis://invalid:2923'
+            },
+            'minion': {'max_concurrent_jobs': 2}
+        }
+    }
+
+    with mock.patch('redis.StrictRedis',
+                    mock_strict_redis_client) as mocked_redis:
+        redis_conn = mocked_redis()
+        minion = SparkMinion(redis_conn=redis_conn,
+                             workflow_id=workflow_id, app_id=app_id,
+                             config=concurrent_config)
+        assert minion.max_concurrent_jobs == 2
+
+        # Two long jobs occupy the executor, so the third one waits
+        release = threading.Event()
+        running = [minion._track_job_future(
+            job_id, minion.executor.submit(release.wait)) for job_id in [1, 2]]
+        pending = minion._track_job_future(
+            3, minion.executor.submit(lambda: True))
+
+        minion.cancel_job(3)
+        assert pending.cancelled()
+        assert not any(f.done() for f in running)
+
+        release.set()
+        assert all(f.result() for f in running)
+
+        state_control = StateControlRedis(redis_conn)
+        msg = json.loads(state_control.pop_app_output_queue(app_id, False))
+        assert msg['code'] == minion.MNN007[0], 'Invalid code'
+        assert msg['message'] == minion.MNN007[1].format(3)
+
+
 def test_minion_global_configuration():
     workflow_id = '6666'
     app_id = '897447'
@@ -1,5 +1,6 @@
 # coding=utf-8
 import ast
+import json
 import uuid
 from textwrap import dedent
 
@@ -12,7 +13,8 @@ from juicer.spark.vis_operation import AreaChartModel, BarChartModel, \
     LineChartModel, MapModel, PieChartModel, ScatterPlotModel, \
     SummaryStatisticsModel, TableVisualizationModel, \
     VisualizationMethodOperation as Visu, \
-    AreaChartOperation
+    AreaChartOperation, BarChartOperation, SummaryStatisticsOperation, \
+    VisualizationData
 from tests import compare_ast, format_code_comparison
 
 
@@ -45,6 +47,9 @@ class FakeDataframe(object):
     def collect(self):
         return self.data
 
+    def limit(self, n):
+        return FakeDataframe(self.data[:n])
+
     @property
     def columns(self):
         return ','.join(self.data[0].keys())
@@ -227,3 +232,78 @@ def atest_area_chart_success(time_series_data):
     ast.parse(expected_code)
     result, msg = compare_ast(ast.parse(code), ast.parse(expected_code))
     assert result, msg + format_code_comparison(code, expected_code)
+
+
+# noinspection PyShadowingNames
+def test_visualization_data_within_budget_success(time_series_data):
+    # Data fits the budget: rows are retrieved as they are, without reduction
+    vis_data = VisualizationData(time_series_data, max_points=10)
+    assert vis_data.sample(order_attr='id') == time_series_data.collect()
+    assert vis_data.top_n('id', ['value']) == time_series_data.collect()
+
+
+def test_visualization_max_points_config_success():
+    params = {
+        Visu.TITLE_PARAM: 'Bar',
+        'configuration': {'juicer': {'transpiler': {'visualization': {
+            'max_points': {'bar': 30}}}}},
+    }
+    chart = BarChartOperation(params, {'input data': 'input'}, {})
+    assert chart.get_model_parameters()['max_points'] == 30
+
+    chart = AreaChartOperation({}, {'input data': 'input'}, {})
+    assert chart.get_model_parameters()['max_points'] == 5000
+
+
+def test_summary_statistics_model_parameters_success():
+    params = {
+        SummaryStatisticsOperation.ATTRIBUTES_PARAM: ['age'],
+        'hash': 'a1b2c3',
+        'configuration': {'juicer': {'transpiler': {'visualization': {
+            'summary_statistics': {'max_correlation_attributes': 10}}}}},
+    }
+    summary = SummaryStatisticsOperation(params, {'input data': 'input'}, {})
+    assert summary.get_model_parameters() == {
+        'attributes': ['age'], 'input_hash': 'a1b2c3', 'data_version': [],
+        'max_correlation_attributes': 10, 'quantile_error': 0.01}
+
+
+def test_summary_statistics_cache_key_data_version_success():
+    # Data source overwritten: same task hash, new update time
+    keys = []
+    for updated in ('2020-01-01T10:00:00', '2020-02-01T10:00:00'):
+        params = {'hash': 'a1b2c3', 'workflow': {'data_source_cache': {
+            7: {'id': 7, 'updated': updated}}}}
+        summary = SummaryStatisticsOperation(params,
+                                             {'input data': 'input'}, {})
+        model_params = summary.get_model_parameters()
+        assert model_params['data_version'] == [['7', updated]]
+
+        model = SummaryStatisticsModel.__new__(SummaryStatisticsModel)
+        model.params = json.loads(json.dumps(model_params))
+        model.attrs = ['age']
+        model.max_correlation_attributes = 10
+        model.quantile_error = 0.01
+        keys.append(model._get_cache_key())
+    assert keys[0] != keys[1]
+    hash(keys[0])
+
+
+def test_summary_statistics_correlation_single_row_success():
+    # Rows with missing values are skipped: with less than 2 complete rows,
+    # correlation is not computed (reported as '-')
+    model = SummaryStatisticsModel.__new__(SummaryStatisticsModel)
+    model.max_correlation_attributes = 10
+    model.data = mock.MagicMock()
+    feature = mock.MagicMock()
+    stat = mock.MagicMock()
+    vectors = feature.VectorAssembler.return_value.transform.return_value \
+        .select.return_value
+    vectors.limit.return_value.count.return_value = 1
+    with mock.patch.dict('sys.modules', {'pyspark': mock.MagicMock(),
+                                         'pyspark.ml': mock.MagicMock(),
+                                         'pyspark.ml.feature': feature,
+                                         'pyspark.ml.stat': stat}):
+        assert model._compute_correlation(['age', 'height']) is None
+    vectors.limit.assert_called_once_with(2)
+    assert not stat.Correlation.corr.called
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import os
+import time
+
+from juicer.transpiler import GeneratedCodeCache, TemplateRegistry
+
+
+def test_template_registry_reuses_environment_success(tmpdir):
+    TemplateRegistry.clear()
+    template_dir = str(tmpdir)
+    env1 = TemplateRegistry.get_environment(template_dir)
+    env2 = TemplateRegistry.get_environment(template_dir)
+    assert env1 is env2
+
+    TemplateRegistry.clear()
+    assert TemplateRegistry.get_environment(template_dir) is not env1
+
+
+def test_template_registry_reloads_changed_template_success(tmpdir):
+    TemplateRegistry.clear()
+    template = tmpdir.join('operation.tmpl')
+    template.write('first {{ value }}')
+
+    env = TemplateRegistry.get_environment(str(tmpdir))
+    compiled = env.get_template('operation.tmpl')
+    assert compiled.render(value=1) == 'first 1'
+    # Unchanged templates are not compiled again
+    assert env.get_template('operation.tmpl') is compiled
+
+    template.write('second {{ value }}')
+    mtime = time.time() + 10
+    os.utime(str(template), (mtime, mtime))
+    assert env.get_template('operation.tmpl').render(value=1) == 'second 1'
+
+
+def test_template_registry_bytecode_cache_success(tmpdir):
+    TemplateRegistry.clear()
+    template_dir = tmpdir.mkdir('templates')
+    template_dir.join('operation.tmpl').write('{{ value }}')
+    cache_dir = os.path.join(str(tmpdir), 'bytecode')
+
+    env = TemplateRegistry.get_environment(str(template_dir), cache_dir)
+    assert env.get_template('operation.tmpl').render(value=2) == '2'
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_generated_code_cache_key_success():
+    workflow = {'id': 1, 'tasks': [{'id': 't1', 'forms': {'a': 1}}],
+                'flows': [], 'platform': {'slug': 'spark'}}
+    key = GeneratedCodeCache.compute_key(workflow, 10)
+    same = {'platform': {'slug': 'spark'}, 'flows': [], 'id': 1,
+            'tasks': [{'forms': {'a': 1}, 'id': 't1'}]}
+    assert GeneratedCodeCache.compute_key(same, 10) == key
+    # Templates, parameters and state change generated code
+    assert GeneratedCodeCache.compute_key(workflow, 11) != key
+    assert GeneratedCodeCache.compute_key(
+        workflow, 10, {'t1': [{}, 'hash']}) != key
+    workflow['tasks'][0]['forms']['a'] = 2
+    assert GeneratedCodeCache.compute_key(workflow, 10) != key
+
+
+def test_generated_code_cache_get_put_success():
+    cache = GeneratedCodeCache(max_size=1)
+    module = object()
+    assert cache.get('k1') is None
+    assert cache.put('k1', module, 'def main(): pass', 1234)
+    assert cache.get('k1') == (module, 'def main(): pass')
+    assert cache.hits == 1 and cache.misses == 1
+
+    # Code depending on job id can not be reused
+    assert not cache.put('k2', module, "job_id = 1234", 1234)
+    assert cache.get('k1') is not None
+
+    # Size limit
+    assert cache.put('k3', module, '', 1234)
+    assert cache.get('k1') is None
+
+
+def test_generated_code_cache_ttl_success():
+    cache = GeneratedCodeCache(max_size=10, ttl=-1)
+    cache.put('k1', object(), '', 1)
+    assert cache.get('k1') is None
+    assert not GeneratedCodeCache(max_size=0).put('k1', object(), '', 1)
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
+import sys
+
+import mock
+
 from juicer.util import get_tasks_sorted_topologically, group
 
 
@@ -110,3 +114,62 @@ def test_group_success():
         [(0, 3), (4, 10), (2, 3)])
     assert sorted(group(list(range(10)), 3)) == sorted(
         [(0, 1, 2), (3, 4, 5), (6, 7, 8)])
+
+
+def test_autopep8_extension_code_format_success(tmpdir):
+    from juicer.transpiler import TemplateRegistry
+    from juicer.util import jinja2_custom
+
+    tmpdir.join('module.tmpl').write(
+        '{% autopep8 code_format %}x=1\n'
+        '{{ code | autopep8(code_format) }}\n{% endautopep8 %}')
+    TemplateRegistry.clear()
+    template = TemplateRegistry.get_environment(str(tmpdir)).get_template(
+        'module.tmpl')
+
+    code = 'y=2'
+    assert template.render(code=code, code_format='full') == 'x = 1\ny = 2\n'
+    assert template.render(code=code, code_format='fragment') == \
+        'x=1\ny = 2\n\n'
+    assert template.render(code=code, code_format='none') == 'x=1\ny=2\n'
+
+    # Formatted fragments are cached by their source hash
+    assert jinja2_custom.format_code(code) is jinja2_custom.format_code(code)
+
+
+def test_emit_sample_sklearn_truncate_success():
+    import pandas as pd
+    from juicer.util import dataframe_util
+
+    df = pd.DataFrame({'name': ['a' * 100 + 'b' * 200, 'short'],
+                       'value': [1, 2]})
+    events = []
+    # Report (HTML) generation is not tested here
+    reports = mock.MagicMock()
+    with mock.patch.dict(sys.modules, {'juicer.spark.reports': reports}):
+        dataframe_util.emit_sample_sklearn(
+            'task', df, lambda *args, **kwargs: events.append(kwargs), 'out')
+    assert len(events) == 1
+    headers, rows = reports.SimpleTableReport.call_args[0][1:3]
+    assert headers == ['name', 'value']
+    assert rows == [['a' * 100 + 'b' * 50 + ' ... ' + 'b' * 50, '1'],
+                    ['short', '2']]
+
+
+def test_get_csv_sample_pandas_success():
+    import pandas as pd
+    from juicer.util import dataframe_util
+
+    df = pd.DataFrame({'name': ['a' * 300, 'short'], 'value': [1, 2]})
+    # Values are not truncated in CSV
+    assert dataframe_util.get_csv_sample(df, 1) == [
+        '"{}",1'.format('a' * 300)]
+
+
+def test_requires_legacy_arrow_format_success():
+    from juicer.util.dataframe_util import requires_legacy_arrow_format
+    # Spark 2.4 (Dockerfile) with pyarrow 0.17 (requirements.txt)
+    assert requires_legacy_arrow_format('2.4.5', '0.17.0')
+    assert not requires_legacy_arrow_format('2.4.5', '0.14.1')
+    assert not requires_legacy_arrow_format('3.0.1', '0.17.0')
+    assert not requires_legacy_arrow_format('2.4.5', None)
@@ -127,3 +127,42 @@ def test_workflow_parcial_execution_success():
     Workflow._get_operations = lambda s, conf: {}
     instance_wf = Workflow(workflow_test, fake_conf)
     assert instance_wf
+
+
+def test_workflow_resolve_limonero_resources_success():
+    from mock import patch
+    operations = [
+        {'id': 18, 'slug': 'data-reader', 'name': 'Data reader',
+         'forms': [], 'ports': []},
+        {'id': 35, 'slug': 'load-model', 'name': 'Load model',
+         'forms': [], 'ports': []},
+    ]
+    tasks = [{'id': str(i), 'name': 'Reader {}'.format(i),
+              'operation': {'id': 18},
+              'forms': {'data_source': {'value': str(i % 3 + 1)}}}
+             for i in range(6)]
+    tasks.append({'id': 'm', 'name': 'Model', 'operation': {'id': 35},
+                  'forms': {'model': {'value': '10'}}})
+    workflow = {'id': 1, 'tasks': tasks, 'flows': [],
+                'platform': {'slug': 'scikit-learn'}}
+
+    def get_data_source_info(url, token, ds_id):
+        if ds_id == 3:
+            raise ValueError('Data source not found')
+        return {'id': ds_id, 'attributes': []}
+
+    with patch('juicer.service.tahiti_service.query_tahiti',
+               return_value=operations), \
+            patch('juicer.service.limonero_service.get_data_source_info',
+                  side_effect=get_data_source_info) as mocked_ds, \
+            patch('juicer.service.limonero_service.get_model_info',
+                  return_value={'id': 10}) as mocked_model:
+        loader = Workflow(workflow, fake_conf)
+
+    # Each data source is retrieved only once
+    assert mocked_ds.call_count == 3
+    assert mocked_model.call_count == 1
+    # Missing data sources are reported later, by the operations
+    assert loader.workflow['data_source_cache'] == {
+        1: {'id': 1, 'attributes': []}, 2: {'id': 2, 'attributes': []}}
+    assert loader.workflow['model_cache'] == {10: {'id': 10}}